@@ -0,0 +1,2 @@
+from .benchmark import Benchmark, BenchmarkSuite, load_baseline, save_baseline, compare
+from .benchmarks import build_suite
\ No newline at end of file
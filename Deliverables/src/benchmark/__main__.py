@@ -0,0 +1,44 @@
+import argparse
+import sys
+from . import build_suite, load_baseline, save_baseline, compare
+from .benchmark import ROUNDS, MIN_ROUND_TIME, REGRESSION_THRESHOLD
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmark", description="Times the engine's hot paths.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    parser.add_argument("--save", metavar="PATH", help="write the results to PATH as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="fail if any benchmark is slower than in PATH")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+        help="slowdown that counts as a regression (default: %(default)s)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--min-round-time", type=float, default=MIN_ROUND_TIME)
+    args = parser.parse_args()
+
+    suite = build_suite()
+    if args.list:
+        print("\n".join(suite.names))
+        return
+    baseline = load_baseline(args.baseline) if args.baseline else {}
+
+    def report(name, result):
+        line = f"{ name:<40} { result['min'] * 1e6:>12.1f} us  (mean { result['mean'] * 1e6:.1f} us, { result['calls'] } calls x { result['rounds'] })"
+        if name in baseline:
+            line += f"  { result['min'] / baseline[name]['min'] - 1:+.1%} vs baseline"
+        print(line, flush=True)
+
+    try:
+        results = suite.run(args.names or None, args.rounds, args.min_round_time, report)
+    except KeyError as err:
+        parser.error(err.args[0])
+
+    if args.save:
+        save_baseline(results, args.save)
+    regressions = compare(results, baseline, args.threshold)
+    for name, slowdown in regressions:
+        print(f"REGRESSION: { name } is { slowdown:.1%} slower than the baseline", file=sys.stderr)
+    if regressions:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import json
+import time
+from typing import *
+
+# each round of a benchmark runs for at least this many seconds
+MIN_ROUND_TIME = 0.05
+ROUNDS = 5
+# rounds of the quickest benchmarks stop here, before their untimed setup
+# takes far longer than the calls themselves
+MAX_CALLS = 2000
+# a benchmark regresses once it is this much slower than its baseline
+REGRESSION_THRESHOLD = 0.25
+
+class Benchmark():
+    '''
+    One timed piece of code. setup(number), if given, is called before each
+    round, outside the timing, and returns the arguments for each of the
+    number calls of func in that round, so a call never runs on state, or
+    caches, left over from the last one.
+    '''
+    def __init__(self, name: str, func: Callable, setup: Optional[Callable[[int], List[Tuple]]]=None) -> None:
+        self.name = name
+        self._func = func
+        self._setup = setup
+
+    def _time_round(self, number: int) -> float:
+        args_lst = self._setup(number) if self._setup else [()] * number
+        func = self._func
+        start = time.perf_counter()
+        for args in args_lst:
+            func(*args)
+        return time.perf_counter() - start
+
+    def run(self, rounds: int=ROUNDS, min_round_time: float=MIN_ROUND_TIME, max_calls: int=MAX_CALLS) -> Dict[str, float]:
+        '''
+        Returns the fastest and mean seconds per call, over rounds rounds of
+        as many calls as take min_round_time seconds, up to max_calls.
+        '''
+        number = 1
+        while True:
+            elapsed = self._time_round(number)
+            if elapsed >= min_round_time or number == max_calls:
+                break
+            # aim a little past min_round_time, growing at most tenfold a step
+            number = max(number + 1, min(10 * number, int(1.2 * number * min_round_time / max(elapsed, 1e-9))))
+            number = min(number, max_calls)
+
+        times = [elapsed / number] + [self._time_round(number) / number for _ in range(rounds - 1)]
+        return { "min": min(times), "mean": sum(times) / len(times), "calls": number, "rounds": rounds }
+
+
+class BenchmarkSuite():
+    '''
+    Benchmarks by name, run in the order they were added.
+    '''
+    def __init__(self) -> None:
+        self._benchmarks = {}
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._benchmarks)
+
+    def add(self, name: str, func: Callable, setup: Optional[Callable[[int], List[Tuple]]]=None) -> None:
+        self._benchmarks[name] = Benchmark(name, func, setup)
+
+    def run(self, names: Optional[List[str]]=None, rounds: int=ROUNDS, min_round_time: float=MIN_ROUND_TIME,
+            report: Optional[Callable[[str, Dict[str, float]], None]]=None) -> Dict[str, Dict[str, float]]:
+        '''
+        Runs the named benchmarks, or all of them, and returns their results
+        by name. report is called with each result as it is ready.
+        '''
+        results = {}
+        for name in names if names is not None else self._benchmarks:
+            if name not in self._benchmarks:
+                raise KeyError(f"No benchmark named {name}.")
+            results[name] = self._benchmarks[name].run(rounds, min_round_time)
+            if report:
+                report(name, results[name])
+        return results
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+def save_baseline(results: Dict[str, Dict[str, float]], path: str) -> None:
+    with open(path, "w") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+        threshold: float=REGRESSION_THRESHOLD) -> List[Tuple[str, float]]:
+    '''
+    Returns (name, slowdown) for each benchmark whose fastest time is more
+    than threshold slower than in the baseline, e.g. 0.25 for 25%. The
+    fastest round is compared as it is the one least disturbed by the rest
+    of the machine. Benchmarks missing from the baseline are skipped.
+    '''
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        slowdown = result["min"] / baseline[name]["min"] - 1
+        if slowdown > threshold:
+            regressions.append((name, slowdown))
+    return regressions
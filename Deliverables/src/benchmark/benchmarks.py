@@ -0,0 +1,124 @@
+import contextlib
+import functools
+import glob
+import io
+import itertools
+import json
+import os
+import random
+from typing import *
+from . import BenchmarkSuite
+from game_server import Game, GameServer
+from game_state import GameState
+from moves import *
+from player_state import PlayerState
+from exception import WelcomeToException
+from constants import CONSTRUCTION_CARDS, CITY_PLAN_CARDS
+
+# the move validation fixtures: each a GameState and the PlayerStates before and after a move
+FIXTURE_GLOB = os.path.join(os.path.dirname(__file__), "..", "..", "4", "4.1", "input*.json")
+SEED = 2020
+MOVE_GENERATORS = [SimpleMoveGenerator, SmartMoveGenerator, CheatingMoveGenerator, SearchMoveGenerator]
+
+def game_snapshots(seed: int=SEED) -> List[Tuple[Dict, Dict]]:
+    '''
+    Returns a (GameState, PlayerState) dict pair for each player's turn in a
+    seeded game, so every run benchmarks the same states, from empty streets
+    to the end of the game.
+    '''
+    game = Game(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=seed)
+    game._add_local_players([("p1", SimpleMoveGenerator), ("p2", SmartMoveGenerator)])
+    snapshots = []
+    while not game._is_game_over():
+        game._all_players_play_move()
+        gs_dict = game.game_state.to_dict()
+        for curr_player in game.players:
+            # a player who is out of the game has no next move to generate
+            if curr_player.player_state and not curr_player.player_state.is_game_over():
+                snapshots.append((gs_dict, curr_player.player_state.to_dict()))
+    return snapshots
+
+def load_fixtures(pattern: str=FIXTURE_GLOB) -> List[List[Dict]]:
+    fixtures = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path) as fixture_file:
+            fixtures.append(json.load(fixture_file))
+    return fixtures
+
+def _cycle(items: List, number: int) -> List:
+    return list(itertools.islice(itertools.cycle(items), number))
+
+def _validate(validator: MoveValidator) -> None:
+    try:
+        validator.validate_move()
+    except WelcomeToException:
+        pass
+
+def _possible_home_locations(player_state: PlayerState) -> None:
+    for street in player_state.streets:
+        for new_num in range(18):
+            street.get_possible_home_locations(new_num)
+
+def _fresh_generator(Generator: Type[MoveGenerator]) -> Callable[..., MoveGenerator]:
+    '''
+    Searches share their scores across turns, which would turn every call
+    after the first into lookups, so each call gets an empty table.
+    '''
+    if Generator is SearchMoveGenerator:
+        return functools.partial(SearchMoveGenerator, scores=TranspositionTable())
+    return Generator
+
+def _play_server_game(seed: int) -> None:
+    # the server prints that it started and the final scores
+    with contextlib.redirect_stdout(io.StringIO()):
+        server = GameServer({ "players": 0, "port": 0 }, [("p1", SimpleMoveGenerator), ("p2", SmartMoveGenerator)],
+            CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=seed)
+        server.play_game()
+
+def build_suite() -> BenchmarkSuite:
+    '''
+    The engine's hot paths. Every call gets freshly built states, since
+    PlayerStates cache their scores and placement masks.
+    '''
+    snapshots = game_snapshots()
+    ps_dicts = [ps_dict for _, ps_dict in snapshots]
+    temps_lst = [ps_dict["temps"] for ps_dict in ps_dicts[:2]]
+    fixtures = load_fixtures()
+
+    # decoding a state is much quicker than copying its dict, which keeps
+    # the untimed setup of the fastest benchmarks short
+    ps_texts = [json.dumps(ps_dict) for ps_dict in ps_dicts]
+
+    def fresh_player_states(number: int) -> List[Tuple]:
+        return [(PlayerState.from_trusted(json.loads(ps_text)),) for ps_text in _cycle(ps_texts, number)]
+
+    # move generators don't change the GameState, so theirs can be shared
+    positions = [(GameState(gs_dict), json.dumps(ps_dict)) for gs_dict, ps_dict in snapshots]
+
+    def fresh_positions(number: int) -> List[Tuple]:
+        return [(game_state, PlayerState.from_trusted(json.loads(ps_text)))
+            for game_state, ps_text in _cycle(positions, number)]
+
+    def fresh_validators(number: int) -> List[Tuple]:
+        return [(MoveValidator(GameState(gs), PlayerState(ps1), PlayerState(ps2)),)
+            for gs, ps1, ps2 in _cycle(fixtures, number)]
+
+    suite = BenchmarkSuite()
+    suite.add("player_state_from_dict", PlayerState, lambda number: [(ps_dict,) for ps_dict in _cycle(ps_dicts, number)])
+    suite.add("player_state_to_dict_round_trip", lambda player_state: PlayerState(player_state.to_dict()),
+        fresh_player_states)
+    suite.add("street_possible_home_locations", _possible_home_locations, fresh_player_states)
+    suite.add("move_validator_fixtures", _validate, fresh_validators)
+    suite.add("calculate_score", lambda player_state: player_state.calculate_score(temps_lst), fresh_player_states)
+
+    for Generator in MOVE_GENERATORS:
+        def setup(number: int, Generator=Generator) -> List[Tuple]:
+            # seeded, so random moves are the same every run
+            return [args + (random.Random(SEED), _fresh_generator(Generator)) for args in fresh_positions(number)]
+        suite.add(f"move_generator_{ Generator.__name__ }",
+            lambda game_state, player_state, rng, Generator:
+                Generator(game_state, player_state, rng=rng).generate_move(),
+            setup)
+
+    suite.add("game_server_game", _play_server_game, lambda number: [(SEED,)] * number)
+    return suite
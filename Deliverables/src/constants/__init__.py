@@ -1,2 +1,3 @@
 from .player_state_constants import *
 from .game_state_constants import *
+from .network_constants import *
\ No newline at end of file
@@ -0,0 +1,21 @@
+# wire protocols a client can negotiate, in the server's order of preference.
+# "full" sends the whole GameState and PlayerState each turn, "delta" only
+# sends what changed and expects a Move back
+FULL_PROTOCOL = "full"
+DELTA_PROTOCOL = "delta"
+SUPPORTED_PROTOCOLS = [DELTA_PROTOCOL, FULL_PROTOCOL]
+# the largest message, in bytes, a player or server may send in one message
+MAX_FRAME_SIZE = 1 << 20
+
+# message encodings a client can negotiate, in the server's order of
+# preference. "json" sends newline-delimited JSON, "binary" sends
+# length-prefixed BinaryCodec frames
+JSON_ENCODING = "json"
+BINARY_ENCODING = "binary"
+SUPPORTED_ENCODINGS = [BINARY_ENCODING, JSON_ENCODING]
+
+
+# seconds a network player has to answer each message, and to make all their
+# moves in a game. A player out of time is treated as a cheater
+TURN_TIMEOUT = 30.0
+GAME_TIMEOUT = 300.0
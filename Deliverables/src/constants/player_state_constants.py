@@ -5,6 +5,20 @@ AGENT_MAXES = [1, 2, 3, 4, 4, 4]
 MAX_REFUSALS = 3
 MAX_TEMPS = 11
 TEMP_SCORES = [7, 4, 1]
+MAX_ROUNDABOUTS = 2
+# estate size -> score, indexed by the number of agents used on that size
+ESTATE_SCORES = {
+    1: [1, 3],
+    2: [2, 3, 4],
+    3: [3, 4, 5, 6],
+    4: [4, 5, 6, 7, 8],
+    5: [5, 6, 7, 8, 10],
+    6: [6, 7, 8, 10, 12]
+}
+POOL_SCORES = [0, 3, 6, 9, 13, 17, 21, 26, 31, 36]
+BIS_SCORES = [0, 1, 3, 6, 9, 12, 16, 20, 24, 28]
+REFUSAL_SCORES = [0, 0, 3, 5]
+ROUNDABOUT_SCORES = [0, 3, 8]
 
 EMPTY_PS = {
     "agents":[0,0,0,0,0,0],
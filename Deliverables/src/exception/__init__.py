@@ -1 +1,2 @@
-from .exception import *
\ No newline at end of file
+from .exception import *
+from .validation import *
\ No newline at end of file
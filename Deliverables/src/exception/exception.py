@@ -67,6 +67,10 @@ class PlayerConnectionException(WelcomeToException):
     def __init__(self, message="Network connection dropped by player."):
         super().__init__(message)
 
+class PlayerTimeoutException(PlayerConnectionException):
+    def __init__(self, message="Player took too long to respond."):
+        super().__init__(message)
+
 class CardDeckException(WelcomeToException):
     def __init__(self, message="Invalid card deck."):
         super().__init__(message)
\ No newline at end of file
@@ -0,0 +1,74 @@
+from enum import Enum
+from .exception import *
+
+class Violation(Enum):
+    '''
+    Result codes returned by the non-raising validation API. Each code knows
+    which exception the raising API throws for it.
+    '''
+    OK = None
+    HOME_FORMAT = HomeException
+    FENCE = HomeException
+    HOUSE = HomeException
+    IN_PLAN = HomeException
+    STREET_FORMAT = StreetException
+    STREET_HOMES = StreetException
+    POOLS = StreetException
+    PARKS = StreetException
+    NOT_INCREASING = StreetException
+    BIS_NO_MATCH = StreetException
+    BIS_OBLIGATION = StreetException
+    POOL_ON_INVALID_HOUSE = StreetException
+    HOME_OCCUPIED = StreetException
+    PLAYER_STATE_FORMAT = PlayerStateException
+    STREETS = PlayerStateException
+    AGENTS = PlayerStateException
+    CITY_PLAN_SCORES = PlayerStateException
+    REFUSALS = PlayerStateException
+    TEMPS = PlayerStateException
+    TOO_MANY_ROUNDABOUTS = PlayerStateException
+
+    def __new__(cls, exception):
+        # members share exception types, so give each its own value
+        obj = object.__new__(cls)
+        obj._value_ = len(cls.__members__)
+        obj.exception = exception
+        return obj
+
+
+class ValidationResult():
+    '''
+    The outcome of a rule check: a Violation code and a message. The code is
+    Violation.OK when nothing was violated.
+    '''
+    def __init__(self, code: Violation=Violation.OK, message: str="") -> None:
+        self.code = code
+        self.message = message
+
+    @property
+    def ok(self) -> bool:
+        return self.code == Violation.OK
+
+    def raise_if_invalid(self) -> None:
+        '''
+        Raises the exception matching this result's code, if it isn't OK.
+        '''
+        if not self.ok:
+            raise self.code.exception(self.message)
+
+    def __repr__(self) -> str:
+        return f"{self.code.name}: {self.message}" if not self.ok else "OK"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ValidationResult) and self.code == other.code
+
+
+VALID = ValidationResult()
+
+
+def my_check(to_check: bool, code: Violation, message: str) -> ValidationResult:
+    '''
+    Returns VALID if to_check is True, a ValidationResult with code otherwise.
+    The non-raising counterpart of my_assert.
+    '''
+    return VALID if to_check else ValidationResult(code, message)
\ No newline at end of file
@@ -1,3 +1,9 @@
 from .cc_deck import ConstructionCardDeck
 from .cp_deck import CityPlanDeck
-from .game_server import GameServer
\ No newline at end of file
+from .game_log import GameLog
+from .game import Game
+from .game_server import GameServer
+from .async_game_server import AsyncGame, AsyncGameServer
+from .tournament import Leaderboard, TournamentServer
+from .simulator import simulate_game, SimulationResults, Simulator
+from .game_replay import GameReplay
\ No newline at end of file
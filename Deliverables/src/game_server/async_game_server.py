@@ -0,0 +1,135 @@
+import asyncio
+from typing import *
+from . import Game
+from players import *
+from exception import PlayerConnectionException, my_assert
+from constants import SUPPORTED_PROTOCOLS, SUPPORTED_ENCODINGS, MAX_FRAME_SIZE, TURN_TIMEOUT, GAME_TIMEOUT
+
+class AsyncGame(Game):
+    '''
+    A Game whose network players are AsyncNetworkPlayers, played out on an
+    event loop so that many games can run at once.
+    '''
+    async def play_game(self) -> List[List]:
+        '''
+        Play until the game is over, send every player the final scores and
+        return them.
+        '''
+        while not self._is_game_over():
+            await self._async_all_players_play_move()
+
+        scores = self.calculate_player_scores()
+        scores_dict = { "game-over": scores }
+        await asyncio.gather(*[curr_player.async_send_final_scores(scores_dict)
+            for curr_player in self._players if isinstance(curr_player, AsyncNetworkPlayer)])
+        return scores
+
+    async def _async_all_players_play_move(self) -> None:
+        active_players = self._active_players()
+        requests = [asyncio.ensure_future(curr_player.async_request_next_move(self._game_state))
+            if isinstance(curr_player, AsyncNetworkPlayer) else None for curr_player in active_players]
+        # let the requests go out before generating the local players' moves
+        await asyncio.sleep(0)
+        loop = asyncio.get_running_loop()
+        moves = []
+        for curr_player, request in zip(active_players, requests):
+            # a local player's move is generated in a worker thread, so a slow
+            # generator doesn't hold up the other games on the loop
+            moves.append(await request if request else
+                await loop.run_in_executor(None, curr_player.request_next_move, self._game_state))
+        self._resolve_moves(active_players, moves)
+
+
+class AsyncGameServer():
+    '''
+    Hosts any number of games at once in one event loop. Network players
+    wait in a lobby as they connect, and every game_config["players"] of
+    them start a new game together with the local players. Each connection
+    gets a name no other player has had, so its results can be told apart:
+    the one it signed up with, or that name with a number after it.
+    '''
+    def __init__(self, game_config: Dict[str, int], local_players: List, cc_lst: List[List], cp_lst: List[Dict],
+            protocols: List[str]=SUPPORTED_PROTOCOLS, encodings: List[str]=SUPPORTED_ENCODINGS,
+            turn_timeout: Optional[float]=TURN_TIMEOUT, game_timeout: Optional[float]=GAME_TIMEOUT) -> None:
+        self._players_per_game = game_config["players"]
+        self._port = game_config["port"]
+        self._local_players = local_players
+        self._cc_lst = cc_lst
+        self._cp_lst = cp_lst
+        self._protocols = protocols
+        self._encodings = encodings
+        # seconds each network player has per turn and per game
+        self._turn_timeout = turn_timeout
+        self._game_timeout = game_timeout
+        self._lobby = []
+        # every name given out so far, local players' included
+        self._names = set(name for name, _ in local_players)
+        my_assert(len(self._names) == len(local_players), ValueError, "Local players need different names.")
+        # final scores of each finished game, in the order they finished
+        self._results = []
+        # games that have ended, including any that failed
+        self._games_over = 0
+        self._num_games = None
+        self._all_games_over = None
+
+    @property
+    def results(self) -> List[List[List]]:
+        return self._results
+
+    async def serve(self, num_games: Optional[int]=None) -> None:
+        '''
+        Accept players and host games until num_games games have finished,
+        or forever if num_games is None.
+        '''
+        self._num_games = num_games
+        self._all_games_over = asyncio.Event()
+        server = await asyncio.start_server(self._accept_player, port=self._port, reuse_address=True,
+            limit=MAX_FRAME_SIZE)
+        async with server:
+            if num_games is None:
+                await server.serve_forever()
+            else:
+                await self._all_games_over.wait()
+
+    async def _accept_player(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            player = await AsyncNetworkPlayer.connect(reader, writer, self._protocols, self._encodings,
+                self._turn_timeout, self._game_timeout)
+        except PlayerConnectionException:
+            writer.close()
+            return
+        player.name = self._unique_name(player.name)
+
+        # players who hung up while waiting don't get matched
+        self._lobby = [waiting for waiting in self._lobby if waiting.connected]
+        self._lobby.append(player)
+        if len(self._lobby) < self._players_per_game:
+            return
+
+        players = self._lobby[:self._players_per_game]
+        self._lobby = self._lobby[self._players_per_game:]
+        await self._host_game(players)
+
+    async def _host_game(self, network_players: List[AsyncNetworkPlayer]) -> None:
+        try:
+            game = AsyncGame(self._cc_lst, self._cp_lst, network_players)
+            game._add_local_players(self._local_players)
+            self._record_result(await game.play_game())
+        finally:
+            # a game that fails still ends, or serve() would wait on it forever
+            await asyncio.gather(*[curr_player.async_close() for curr_player in network_players],
+                return_exceptions=True)
+            self._games_over += 1
+            if self._num_games is not None and self._games_over >= self._num_games:
+                self._all_games_over.set()
+
+    def _unique_name(self, name: str) -> str:
+        unique_name, count = name, 1
+        while unique_name in self._names:
+            count += 1
+            unique_name = f"{name}-{count}"
+        self._names.add(unique_name)
+        return unique_name
+
+    def _record_result(self, scores: List[List]) -> None:
+        self._results.append(scores)
\ No newline at end of file
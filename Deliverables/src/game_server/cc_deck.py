@@ -1,40 +1,90 @@
 import random
-from copy import deepcopy
+from typing import *
 from constants import NUM_CCS, CONSTRUCTION_CARDS
 
 class ConstructionCardDeck():
-    def __init__(self, card_lst: list) -> None:
-        self._deck = deepcopy(card_lst)
-        self._used_deck = []
-        self._prev_cards = []
-        self._curr_cards = []
+    '''
+    The deck is a shuffled permutation of indices into the card list, drawn
+    from by advancing an index, and reshuffled once every card was drawn.
+
+    With three_piles, the cards are dealt into one pile per construction card,
+    as in the official rules: each draw flips the top card of every pile, and
+    the cards still showing when the piles run out stay out of the reshuffle,
+    so the next draw's effects and numbers come from different cards.
+    '''
+    def __init__(self, card_lst: list, rng: random.Random=None, three_piles: bool=False) -> None:
+        # each deck draws from its own RNG, so seeded games can be replayed
+        self._rng = rng if rng is not None else random.Random()
+        # never changed, so the card data can be shared between decks
+        self._cards = card_lst
+        self._three_piles = three_piles
+        # indices of the cards drawn last and the ones drawn before them
+        self._prev_idxs = []
+        self._curr_idxs = []
+        self._shuffle()
         self.draw_new_cards()
 
     @property
     def curr_cards(self) -> list:
-        return self._curr_cards
+        return [list(self._cards[i]) for i in self._curr_idxs]
+
+    def _shuffle(self) -> None:
+        '''
+        Shuffle the permutation and start drawing from its top again.
+        '''
+        showing = set(self._curr_idxs) if self._three_piles else set()
+        self._order = [i for i in range(len(self._cards)) if i not in showing]
+        self._rng.shuffle(self._order)
+        self._next = 0
+        # piles are consecutive slices of the permutation, any leftover cards
+        # wait for the next shuffle
+        self._pile_size = len(self._order) // NUM_CCS if self._three_piles else None
 
     def draw_new_cards(self) -> list:
         '''
         Draw three new ConstructionCards and return them in a list.
         '''
-        new_cards = random.sample(self._deck, min(len(self._deck), NUM_CCS))
-        for card in new_cards:
-            self._deck.remove(card)
-            self._used_deck.append(card)
+        if self._three_piles:
+            new_idxs = [self._order[pile * self._pile_size + self._next] for pile in range(NUM_CCS)]
+            self._next += 1
+            out_of_cards = self._next == self._pile_size
+        else:
+            new_idxs = self._order[self._next:self._next + NUM_CCS]
+            self._next += len(new_idxs)
+            out_of_cards = self._next == len(self._order)
 
-        if not self._deck:
-            self._deck, self._used_deck = self._used_deck, []
+        self._prev_idxs = self._curr_idxs
+        self._curr_idxs = new_idxs
+        if out_of_cards:
+            self._shuffle()
+        return self.curr_cards
 
-        self._prev_cards = self._curr_cards
-        self._curr_cards = new_cards
-        return new_cards
+    def remaining_cards(self) -> list:
+        '''
+        Returns the cards still to be drawn before the next reshuffle.
+        '''
+        if self._three_piles:
+            return [list(self._cards[self._order[pile * self._pile_size + k]])
+                for pile in range(NUM_CCS) for k in range(self._next, self._pile_size)]
+        return [list(self._cards[i]) for i in self._order[self._next:]]
 
     def get_prev_card_effects(self) -> list:
         '''
         Return the effects from the cards that were just flipped.
         '''
-        return [card[1] for card in self._prev_cards]
+        return [self._cards[i][1] for i in self._prev_idxs]
+
+    def snapshot(self) -> Tuple:
+        '''
+        Returns the deck's state, to give to restore() later.
+        '''
+        return (list(self._order), self._next, self._pile_size, self._prev_idxs,
+            self._curr_idxs, self._rng.getstate())
+
+    def restore(self, snapshot: Tuple) -> None:
+        order, self._next, self._pile_size, self._prev_idxs, self._curr_idxs, rng_state = snapshot
+        self._order = list(order)
+        self._rng.setstate(rng_state)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,8 @@ from exception import CardDeckException, my_assert
 from helpers import check_valid_lst
 
 class CityPlanDeck():
-    def __init__(self, card_lst: List[Dict]) -> None:
+    def __init__(self, card_lst: List[Dict], rng: random.Random=None) -> None:
+        self._rng = rng if rng is not None else random.Random()
         self._decks = self._separate_cards_by_position(card_lst)
 
     @property
@@ -25,7 +26,7 @@ class CityPlanDeck():
     def draw_new_cards(self) -> List[Dict]:
         new_cards = []
         for deck in self._decks.values():
-            card = random.choice(deck)
+            card = self._rng.choice(deck)
             new_cards.append(card)
             deck.remove(card)
 
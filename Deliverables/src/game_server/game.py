@@ -0,0 +1,146 @@
+import random
+from typing import *
+from . import ConstructionCardDeck, CityPlanDeck, GameLog
+from players import *
+from moves import MoveGenerator
+from game_state import GameState
+
+class Game():
+    '''
+    A single game of Welcome To without any networking: the decks, the
+    GameState and the players. Servers decide how the players' moves are
+    collected.
+    '''
+    def __init__(self, cc_lst: List[List], cp_lst: List[Dict], players: List[Player]=[],
+            seed: Optional[int]=None, log_stream=None) -> None:
+        # every card drawn follows from the seed, so the game can be replayed from its log
+        self._seed = seed if seed is not None else random.randrange(2 ** 32)
+        rng = random.Random(self._seed)
+        self._cc_deck = ConstructionCardDeck(cc_lst, random.Random(rng.getrandbits(64)))
+        self._cp_deck = CityPlanDeck(cp_lst, random.Random(rng.getrandbits(64)))
+        # drawn from after the decks', so their cards don't change with it
+        self._players_rng = random.Random(rng.getrandbits(64))
+        # list of Player objects
+        self._players = list(players)
+        self._game_state = self._initialize_game_state()
+        # started once the first round is played, when every player has joined
+        self._game_log = None
+        self._log_stream = log_stream
+
+    @property
+    def players(self) -> List[Player]:
+        return self._players
+
+    @property
+    def game_state(self) -> GameState:
+        return self._game_state
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def game_log(self) -> Optional[GameLog]:
+        return self._game_log
+
+    def play_game(self) -> List[List]:
+        '''
+        Play until the game is over and return the final scores.
+        '''
+        while not self._is_game_over():
+            self._all_players_play_move()
+
+        return self.calculate_player_scores()
+
+    def _add_local_players(self, local_players: List[Tuple[str, MoveGenerator]]) -> None:
+        for player_name, move_generator in local_players:
+            self._players.append(LocalPlayer(player_name, move_generator,
+                random.Random(self._players_rng.getrandbits(64)), self._cc_deck.remaining_cards))
+
+    def _initialize_game_state(self) -> GameState:
+        curr_ccs = self._cc_deck.draw_new_cards()
+        prev_cc_effects = self._cc_deck.get_prev_card_effects()
+        city_plan_cards = self._cp_deck.draw_new_cards()
+        gs_dict = {
+            "city-plans": city_plan_cards,
+            "city-plans-won": [False, False, False],
+            "construction-cards": curr_ccs,
+            "effects": prev_cc_effects
+        }
+        return GameState(gs_dict)
+
+    def _draw_new_construction_cards(self) -> None:
+        curr_ccs = self._cc_deck.draw_new_cards()
+        prev_cc_effects = self._cc_deck.get_prev_card_effects()
+        self._game_state.ccards = curr_ccs
+        self._game_state.effects = prev_cc_effects
+
+    def _active_players(self) -> List[Player]:
+        return [curr_player for curr_player in self._players if not curr_player.cheated]
+
+    def _all_players_play_move(self):
+        active_players = self._active_players()
+        # a generator, so each player is asked for their move just before it's validated
+        moves = (curr_player.request_next_move(self._game_state) for curr_player in active_players)
+        self._resolve_moves(active_players, moves)
+
+    def _resolve_moves(self, active_players: List[Player], moves: Iterable) -> None:
+        '''
+        Validate each active player's move in player order, then update the
+        city plans claimed and draw the next cards. Every player sees the same
+        GameState this round, so the result doesn't depend on how or in what
+        order the moves were collected.
+        '''
+        claimed_cps = set()
+        for curr_player, move in zip(active_players, moves):
+            curr_player.resolve_next_move(self._game_state, move)
+            claimed_cps.update(curr_player.get_new_city_plan_scores())
+            
+        self._log_round(active_players)
+        self._update_city_plans_claimed(claimed_cps)
+        self._draw_new_construction_cards()
+
+    def _log_round(self, active_players: List[Player]) -> None:
+        if self._game_log is None:
+            self._game_log = GameLog(self._seed, [curr_player.name for curr_player in self._players], self._log_stream)
+
+        active_ids = set(id(curr_player) for curr_player in active_players)
+        moves = []
+        for curr_player in self._players:
+            if id(curr_player) not in active_ids:
+                moves.append(None)
+            elif curr_player.last_move is None:
+                moves.append(False)
+            else:
+                moves.append(curr_player.last_move.to_dict())
+        self._game_log.append_round(moves)
+
+    def _update_city_plans_claimed(self, claimed_cps):
+        for i in claimed_cps:
+            self._game_state.city_plans_won[i] = True
+
+    def _is_game_over(self) -> bool:
+        for curr_player in self._players:
+            if not curr_player.player_state:
+                continue
+            if curr_player.player_state.is_game_over():
+                return True
+
+        return False
+
+    def _get_player_temps(self) -> List[int]:
+        temps_lst = []
+        for curr_player in self._players:
+            if not curr_player.player_state:
+                continue
+            temps_lst.append(curr_player.player_state.temps)
+
+        return temps_lst
+
+    def calculate_player_scores(self) -> List[List]:
+        temps_lst = self._get_player_temps()
+        scores = []
+        for curr_player in self._players:
+            scores.append([curr_player.name, curr_player.get_score(temps_lst)])
+
+        return scores
\ No newline at end of file
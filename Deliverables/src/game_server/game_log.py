@@ -0,0 +1,54 @@
+import json
+from typing import *
+
+class GameLog():
+    '''
+    An append-only record of a game: its seed and player names, then one
+    entry per round holding each player's move. A move is a Move dictionary,
+    False if the player cheated that round, or None once they're out of the
+    game. Written out, the header and every round are one line of JSON each.
+    '''
+    def __init__(self, seed: int, player_names: List[str], stream=None) -> None:
+        self._seed = seed
+        self._player_names = player_names
+        self._rounds = []
+        # if given, every line is written to the stream as soon as it's added
+        self._stream = stream
+        self._write_line(self._header())
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    @property
+    def player_names(self) -> List[str]:
+        return self._player_names
+
+    @property
+    def rounds(self) -> List[List]:
+        return self._rounds
+
+    def _header(self) -> Dict:
+        return { "seed": self._seed, "players": self._player_names }
+
+    def _write_line(self, line) -> None:
+        if self._stream:
+            self._stream.write(json.dumps(line) + "\n")
+            self._stream.flush()
+
+    def append_round(self, moves: List[Union[Dict, bool, None]]) -> None:
+        self._rounds.append(moves)
+        self._write_line(moves)
+
+    def to_lines(self) -> List[str]:
+        return [json.dumps(line) for line in [self._header()] + self._rounds]
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "GameLog":
+        lines = iter(lines)
+        header = json.loads(next(lines))
+        game_log = cls(header["seed"], header["players"])
+        for line in lines:
+            if line.strip():
+                game_log.append_round(json.loads(line))
+        return game_log
\ No newline at end of file
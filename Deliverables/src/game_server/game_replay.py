@@ -0,0 +1,45 @@
+from typing import *
+from . import Game, GameLog
+from players import ReplayPlayer
+from game_state import GameState
+from player_state import PlayerState
+from constants import CONSTRUCTION_CARDS, CITY_PLAN_CARDS
+
+class GameReplay():
+    '''
+    Rebuilds the states of a logged game by dealing the same cards from its
+    seed and validating the logged moves again, without running any players.
+    The card lists must be the ones the game was played with.
+    '''
+    def __init__(self, game_log: GameLog, cc_lst: List[List]=CONSTRUCTION_CARDS,
+            cp_lst: List[Dict]=CITY_PLAN_CARDS) -> None:
+        self._game_log = game_log
+        self._cc_lst = cc_lst
+        self._cp_lst = cp_lst
+
+    @property
+    def num_rounds(self) -> int:
+        return len(self._game_log.rounds)
+
+    def _replay(self, num_rounds: int) -> Game:
+        player_moves = [[curr_round[i] for curr_round in self._game_log.rounds]
+            for i in range(len(self._game_log.player_names))]
+        players = [ReplayPlayer(name, moves) for name, moves in zip(self._game_log.player_names, player_moves)]
+        game = Game(self._cc_lst, self._cp_lst, players, self._game_log.seed)
+        for _ in range(num_rounds):
+            game._all_players_play_move()
+        return game
+
+    def state_at(self, round_num: int) -> Tuple[GameState, List[Union[PlayerState, bool]]]:
+        '''
+        Returns the GameState and every player's PlayerState (False if they
+        cheated) at the start of round round_num, counting from 0. Passing
+        num_rounds gives the states the game ended with.
+        '''
+        game = self._replay(round_num)
+        return (GameState(game.game_state.to_dict()),
+            [curr_player.player_state.clone() if curr_player.player_state else False
+                for curr_player in game.players])
+
+    def final_scores(self) -> List[List]:
+        return self._replay(self.num_rounds).calculate_player_scores()
\ No newline at end of file
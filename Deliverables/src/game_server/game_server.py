@@ -1,32 +1,38 @@
 import socket
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import *
-from . import ConstructionCardDeck, CityPlanDeck
+from . import Game
 from network import *
 from players import *
-from moves import MoveGenerator
-from game_state import GameState
-
-class GameServer():
-    def __init__(self, game_config: Dict[str, int], local_players: List, cc_lst: List[List], cp_lst: List[Dict]) -> None:
+from constants import SUPPORTED_PROTOCOLS, SUPPORTED_ENCODINGS, TURN_TIMEOUT, GAME_TIMEOUT
+from exception import PlayerConnectionException
+
+class GameServer(Game):
+    def __init__(self, game_config: Dict[str, int], local_players: List, cc_lst: List[List], cp_lst: List[Dict],
+            protocols: List[str]=SUPPORTED_PROTOCOLS, concurrent: bool=False, seed: Optional[int]=None,
+            encodings: List[str]=SUPPORTED_ENCODINGS, turn_timeout: Optional[float]=TURN_TIMEOUT,
+            game_timeout: Optional[float]=GAME_TIMEOUT) -> None:
         self._num_network_players = game_config["players"]
         self._port = game_config["port"]
-        self._cc_deck = ConstructionCardDeck(cc_lst)
-        self._cp_deck = CityPlanDeck(cp_lst)
-        # list of Player objects
-        self._players = []
-        self._game_state = self._initialize_game_state()
+        # wire protocols network players may negotiate, in order of preference
+        self._protocols = protocols
+        self._encodings = encodings
+        # seconds each network player has per turn and per game
+        self._turn_timeout = turn_timeout
+        self._game_timeout = game_timeout
+        # with concurrent rounds, network players are asked for their moves
+        # in parallel, so a round takes as long as the slowest player
+        self._executor = ThreadPoolExecutor(max(1, self._num_network_players)) if concurrent else None
+        super().__init__(cc_lst, cp_lst, seed=seed)
         self._start_tcp_listener()
         self._connect_to_network_players()
         self._add_local_players(local_players)
 
-    @property
-    def players(self) -> List[Player]:
-        return self._players
-
     def _start_tcp_listener(self):
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._sock.bind(('', self._port))
         self._sock.listen()
         self._network = NetworkAdapter(self._sock)
@@ -36,29 +42,12 @@ class GameServer():
     def _connect_to_network_players(self):
         while len(self._players) < self._num_network_players:
             player_sock, addr = self._sock.accept()
-            self._players.append(NetworkPlayer(player_sock, addr))
-
-    def _add_local_players(self, local_players: List[Tuple[str, MoveGenerator]]) -> None:
-        for player_name, move_generator in local_players:
-            self._players.append(LocalPlayer(player_name, move_generator))
-
-    def _initialize_game_state(self) -> GameState:
-        curr_ccs = self._cc_deck.draw_new_cards()
-        prev_cc_effects = self._cc_deck.get_prev_card_effects()
-        city_plan_cards = self._cp_deck.draw_new_cards()
-        gs_dict = {
-            "city-plans": city_plan_cards,
-            "city-plans-won": [False, False, False],
-            "construction-cards": curr_ccs,
-            "effects": prev_cc_effects
-        }
-        return GameState(gs_dict)
-
-    def _draw_new_construction_cards(self) -> None:
-        curr_ccs = self._cc_deck.draw_new_cards()
-        prev_cc_effects = self._cc_deck.get_prev_card_effects()
-        self._game_state.ccards = curr_ccs
-        self._game_state.effects = prev_cc_effects
+            try:
+                self._players.append(NetworkPlayer(player_sock, addr, self._protocols, self._encodings,
+                    self._turn_timeout, self._game_timeout))
+            # players who hang up or go quiet before signing up don't get a seat
+            except PlayerConnectionException:
+                player_sock.close()
 
     def play_game(self):
         while not self._is_game_over():
@@ -66,48 +55,21 @@ class GameServer():
 
         self._send_final_scores()
         self._network.close()
+        if self._executor:
+            self._executor.shutdown()
         
     def _all_players_play_move(self):
-        claimed_cps = set()
-        for curr_player in self._players:
-            if curr_player.cheated:
-                continue
-
-            curr_player.play_next_move(self._game_state)
-            claimed_cps.update(curr_player.get_new_city_plan_scores())
-            
-        self._update_city_plans_claimed(claimed_cps)
-        self._draw_new_construction_cards()
-
-    def _update_city_plans_claimed(self, claimed_cps):
-        for i in claimed_cps:
-            self._game_state.city_plans_won[i] = True
-
-    def _is_game_over(self) -> bool:
-        for curr_player in self._players:
-            if not curr_player.player_state:
-                continue
-            if curr_player.player_state.is_game_over():
-                return True
-
-        return False
-
-    def _get_player_temps(self) -> List[int]:
-        temps_lst = []
-        for curr_player in self._players:
-            if not curr_player.player_state:
-                continue
-            temps_lst.append(curr_player.player_state.temps)
-
-        return temps_lst
-
-    def calculate_player_scores(self) -> List[List]:
-        temps_lst = self._get_player_temps()
-        scores = []
-        for curr_player in self._players:
-            scores.append([curr_player.name, curr_player.get_score(temps_lst)])
-
-        return scores
+        if not self._executor:
+            return super()._all_players_play_move()
+
+        # ask every network player at once, and generate local players' moves
+        # while waiting on the network
+        active_players = self._active_players()
+        pending_moves = [self._executor.submit(curr_player.request_next_move, self._game_state)
+            if isinstance(curr_player, NetworkPlayer) else None for curr_player in active_players]
+        moves = (pending_move.result() if pending_move else curr_player.request_next_move(self._game_state)
+            for curr_player, pending_move in zip(active_players, pending_moves))
+        self._resolve_moves(active_players, moves)
 
     def _send_final_scores(self) -> None:
         scores = self.calculate_player_scores()
@@ -0,0 +1,78 @@
+import os
+from multiprocessing import Pool
+from typing import *
+from . import Game, Leaderboard
+from moves import MoveGenerator
+from constants import CONSTRUCTION_CARDS, CITY_PLAN_CARDS
+
+def simulate_game(local_players: List[Tuple[str, MoveGenerator]], seed: int,
+        cc_lst: List[List]=CONSTRUCTION_CARDS, cp_lst: List[Dict]=CITY_PLAN_CARDS) -> List[List]:
+    '''
+    Play one game between local players, without any sockets, and return
+    the final scores. The same seed always plays the same game.
+    '''
+    game = Game(cc_lst, cp_lst, seed=seed)
+    game._add_local_players(local_players)
+    return game.play_game()
+
+def _simulate_game_from_args(args: Tuple) -> Tuple[int, List[List]]:
+    # Pool.imap passes a single argument
+    return args[1], simulate_game(*args)
+
+
+class SimulationResults():
+    '''
+    The scores of every simulated game, by seed, and the players' aggregate
+    stats.
+    '''
+    def __init__(self) -> None:
+        self._game_scores = []
+        self._leaderboard = Leaderboard()
+
+    @property
+    def game_scores(self) -> List[Tuple[int, List[List]]]:
+        '''
+        A (seed, final scores) pair per game, in seed order.
+        '''
+        return self._game_scores
+
+    @property
+    def leaderboard(self) -> Leaderboard:
+        return self._leaderboard
+
+    def record(self, seed: int, scores: List[List]) -> None:
+        self._game_scores.append((seed, scores))
+        self._leaderboard.record(scores)
+
+    def win_rates(self) -> Dict[str, float]:
+        return {stats["name"]: stats["wins"] / stats["games"] for stats in self._leaderboard.standings()}
+
+
+class Simulator():
+    '''
+    Runs many complete games between MoveGenerators, spread over a process
+    pool. Game i is played with seed + i, so any game can be played again
+    with simulate_game().
+    '''
+    def __init__(self, local_players: List[Tuple[str, MoveGenerator]], cc_lst: List[List]=CONSTRUCTION_CARDS,
+            cp_lst: List[Dict]=CITY_PLAN_CARDS, processes: Optional[int]=None) -> None:
+        self._local_players = local_players
+        self._cc_lst = cc_lst
+        self._cp_lst = cp_lst
+        # None uses every CPU, 1 plays the games in this process
+        self._processes = processes
+
+    def run(self, num_games: int, seed: int=0) -> SimulationResults:
+        game_args = [(self._local_players, seed + i, self._cc_lst, self._cp_lst) for i in range(num_games)]
+        results = SimulationResults()
+        if self._processes == 1:
+            for args in game_args:
+                results.record(*_simulate_game_from_args(args))
+            return results
+
+        with Pool(self._processes) as pool:
+            # big chunks keep the pool's messaging cost small next to the games
+            chunksize = max(1, num_games // (4 * (self._processes or os.cpu_count())))
+            for game_seed, scores in pool.imap(_simulate_game_from_args, game_args, chunksize):
+                results.record(game_seed, scores)
+        return results
\ No newline at end of file
@@ -0,0 +1,74 @@
+import json
+from typing import *
+from . import AsyncGameServer
+from exception import my_assert
+from constants import CONSTRUCTION_CARDS, CITY_PLAN_CARDS, SUPPORTED_PROTOCOLS, SUPPORTED_ENCODINGS
+from constants import TURN_TIMEOUT, GAME_TIMEOUT
+
+class Leaderboard():
+    '''
+    Aggregates the final scores of many games by player name, so the players
+    in a game must have different names. Every player with the best score in
+    a game gets a win, and players who cheated get no score for that game.
+    '''
+    def __init__(self) -> None:
+        # name -> [games, wins, cheated, total score]
+        self._stats = {}
+
+    def record(self, scores: List[List]) -> None:
+        names = [name for name, _ in scores]
+        my_assert(len(set(names)) == len(names), ValueError,
+            f"Players in a game need different names to be ranked separately, but got {names}.")
+        valid_scores = [score for _, score in scores if score is not False]
+        best_score = max(valid_scores) if valid_scores else None
+        for name, score in scores:
+            stats = self._stats.setdefault(name, [0, 0, 0, 0])
+            stats[0] += 1
+            if score is False:
+                stats[2] += 1
+                continue
+            stats[1] += score == best_score
+            stats[3] += score
+
+    def standings(self) -> List[Dict]:
+        '''
+        Returns every player's stats, most wins first, then by average score.
+        '''
+        standings = []
+        for name, (games, wins, cheated, total_score) in self._stats.items():
+            scored_games = games - cheated
+            standings.append({
+                "name": name,
+                "games": games,
+                "wins": wins,
+                "cheated": cheated,
+                "average-score": total_score / scored_games if scored_games else None
+            })
+        return sorted(standings, key=lambda stats: (-stats["wins"], -(stats["average-score"] or 0)))
+
+
+class TournamentServer(AsyncGameServer):
+    '''
+    A long-running AsyncGameServer for tournaments: one port, one lobby, and a
+    new game as soon as enough players are waiting. Every game shares the same
+    card data, and each result is added to the leaderboard and written to
+    results_stream as one line of JSON.
+    '''
+    def __init__(self, game_config: Dict[str, int], local_players: List=[], cc_lst: List[List]=CONSTRUCTION_CARDS,
+            cp_lst: List[Dict]=CITY_PLAN_CARDS, protocols: List[str]=SUPPORTED_PROTOCOLS, results_stream=None,
+            encodings: List[str]=SUPPORTED_ENCODINGS, turn_timeout: Optional[float]=TURN_TIMEOUT,
+            game_timeout: Optional[float]=GAME_TIMEOUT) -> None:
+        super().__init__(game_config, local_players, cc_lst, cp_lst, protocols, encodings, turn_timeout, game_timeout)
+        self._leaderboard = Leaderboard()
+        self._results_stream = results_stream
+
+    @property
+    def leaderboard(self) -> Leaderboard:
+        return self._leaderboard
+
+    def _record_result(self, scores: List[List]) -> None:
+        super()._record_result(scores)
+        self._leaderboard.record(scores)
+        if self._results_stream:
+            self._results_stream.write(json.dumps({ "game": len(self._results), "scores": scores }) + "\n")
+            self._results_stream.flush()
\ No newline at end of file
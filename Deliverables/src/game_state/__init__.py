@@ -2,4 +2,6 @@ from .effect import *
 from .criteria import *
 from .city_plan import *
 from .construction_card import *
-from .game_state import *
\ No newline at end of file
+from .game_state import *
+from .city_plan_index import *
+from .estate_plan_solver import *
\ No newline at end of file
@@ -0,0 +1,131 @@
+from collections import Counter
+from typing import *
+from player_state import PlayerState
+from . import GameState
+from constants import STREET_LENS, CriteriaCard
+
+class CityPlanIndex():
+    '''
+    Answers which of a player's open city plans can be claimed, and with
+    which houses, and checks the claims a move made. The estates open to a
+    plan come from each street's cached plan_estates(), so an index is cheap
+    to build for each PlayerState, and follows later changes to it.
+
+    new_marks are the homes a move just marked used-in-plan, as [street,
+    home] pairs. They are read as unmarked, so the claims can be checked
+    on the PlayerState after the move.
+    '''
+    def __init__(self, game_state: GameState, player_state: PlayerState,
+            new_marks: Iterable[Sequence[int]]=()) -> None:
+        self._game_st = game_state
+        self._ps = player_state
+        self._new_marks = set(tuple(posn) for posn in new_marks)
+        # the columns of new_marks in each street
+        self._unmarked = [frozenset(k for st_idx, k in self._new_marks if st_idx == i)
+            for i in range(len(STREET_LENS))]
+        # the streets' estates the index was last built from, and the estates
+        # by size, as lists of (street, first home)
+        self._street_estates = None
+        self._by_size = {}
+
+    def _estates(self) -> List[Tuple[Tuple[int, int], ...]]:
+        return [street.plan_estates(unmarked) for street, unmarked in zip(self._ps.streets, self._unmarked)]
+
+    def _estates_by_size(self) -> Dict[int, List[Tuple[int, int]]]:
+        '''
+        Returns the open estates by size, rebuilt only if a street's changed.
+        '''
+        street_estates = self._estates()
+        if self._street_estates is None or any(old is not new
+                for old, new in zip(self._street_estates, street_estates)):
+            by_size = {}
+            for st_idx, estates in enumerate(street_estates):
+                for start, size in estates:
+                    by_size.setdefault(size, []).append((st_idx, start))
+            self._street_estates, self._by_size = street_estates, by_size
+        return self._by_size
+
+    def claimable(self, cp_idx: int) -> Optional[List[List[int]]]:
+        '''
+        Returns the homes to mark used-in-plan to claim city plan cp_idx now,
+        as [street, home] pairs, or None if it can't be claimed.
+        '''
+        if self._ps.city_plan_score[cp_idx] != "blank":
+            return None
+        return self._claim_homes(cp_idx)
+
+    def _claim_homes(self, cp_idx: int) -> Optional[List[List[int]]]:
+        '''
+        claimable(), whether or not the city plan was already claimed.
+        '''
+        criteria = self._game_st.city_plans[cp_idx].criteria
+        card = criteria.valid_criteria
+
+        if type(card) == list:
+            by_size = self._estates_by_size()
+            homes = []
+            for size, ct in sorted(criteria.needed_estates.items()):
+                estates = by_size.get(size, [])
+                if len(estates) < ct:
+                    return None
+                homes.extend([st_idx, start + k] for st_idx, start in estates[:ct] for k in range(size))
+            return sorted(homes)
+
+        if card in [CriteriaCard.ALL_HOUSES_0, CriteriaCard.ALL_HOUSES_2]:
+            posns = [(card.value[1], k) for k in range(STREET_LENS[card.value[1]])]
+        elif card == CriteriaCard.END_HOUSES:
+            posns = [(st_idx, k) for st_idx, st_len in enumerate(STREET_LENS) for k in [0, st_len - 1]]
+        else:
+            return [] if criteria.is_satisfied(self._ps, {}) else None
+
+        # the houses all have to be built, and are marked unless they already are
+        homes = [self._ps.streets[st_idx].homes_view[k] for st_idx, k in posns]
+        if not all(type(home.num) == int for home in homes):
+            return None
+        return [list(posn) for posn, home in zip(posns, homes) if not home.in_plan or posn in self._new_marks]
+
+    def claimable_plans(self) -> List[int]:
+        '''
+        Returns the indices of the city plans that can be claimed now.
+        '''
+        return [i for i in range(len(self._game_st.city_plans)) if self.claimable(i) is not None]
+
+    def matches_claims(self, cp_idxs: List[int]) -> bool:
+        '''
+        Returns True if the new marks are exactly the homes claiming city
+        plans cp_idxs needs: every home a special plan needs, and open
+        estates of the sizes the numeric plans need, split between them.
+        The homes of special plans can't also count for numeric ones.
+        '''
+        marks = set(self._new_marks)
+        needed = Counter()
+        for i in cp_idxs:
+            criteria = self._game_st.city_plans[i].criteria
+            if type(criteria.valid_criteria) == list:
+                needed += criteria.needed_estates
+                continue
+            homes = self._claim_homes(i)
+            if homes is None or not all(tuple(home) in self._new_marks for home in homes):
+                return False
+            marks.difference_update(tuple(home) for home in homes)
+
+        # the rest of the marks have to be whole open estates
+        starts = {(st_idx, start): size for st_idx, estates in enumerate(self._estates()) for start, size in estates}
+        found = Counter()
+        for posn in sorted(marks):
+            if posn not in marks:
+                continue
+            size = starts.get(posn)
+            estate = [(posn[0], posn[1] + k) for k in range(size)] if size is not None else []
+            if not estate or not all(home in marks for home in estate):
+                return False
+            marks.difference_update(estate)
+            found[size] += 1
+        return found == needed
+
+    def score(self, cp_idx: int) -> int:
+        '''
+        Returns the points claiming city plan cp_idx would give now.
+        '''
+        city_plan = self._game_st.city_plans[cp_idx]
+        return city_plan.score2 if self._game_st.city_plans_won[cp_idx] else city_plan.score1
@@ -0,0 +1,133 @@
+import itertools
+from typing import *
+from player_state import PlayerState
+from . import GameState, CityPlanIndex
+from constants import STREET_LENS, CriteriaCard
+
+# estates bigger than this can't be used by any city plan
+MAX_PLAN_ESTATE = 6
+# the memo is cleared once it holds this many estate counts
+MAX_MEMO_SIZE = 1 << 14
+
+class EstatePlanSolver():
+    '''
+    Picks which city plans to claim this turn, and which estates to mark
+    used-in-plan for them, to score the most city plan points. Between
+    choices scoring the same, it keeps the estates the plans still open can
+    use, so they can be claimed later.
+
+    Estates of the same size are interchangeable, so the numeric plans are
+    searched over counts of estates by size, and the best claim for each
+    count is memoized: many candidate moves leave the same estates open. The
+    memo is cleared whenever the city plans or which were won change.
+    '''
+    def __init__(self, game_state: GameState) -> None:
+        self._game_st = game_state
+        # (plans, estate counts) -> best (value, claimed)
+        self._memo = {}
+        # the city plans and plans won the memo was filled for
+        self._memo_plans = None
+
+    def solve(self, player_state: PlayerState) -> Tuple[List[List[int]], List[List[int]]]:
+        '''
+        Returns the city plans to claim, as [city plan index, score] pairs, and
+        the homes to mark used-in-plan for them, as [street, home] pairs.
+        Both are empty if no city plan can be claimed.
+        '''
+        self._check_memo()
+        index = CityPlanIndex(self._game_st, player_state)
+        open_plans = [i for i, score in enumerate(player_state.city_plan_score) if score == "blank"]
+        numeric = tuple(i for i in open_plans if type(self._criteria(i).valid_criteria) == list)
+        specials = [i for i in open_plans if i not in numeric and index.claimable(i) is not None]
+        estates = [(st_idx, start, size) for st_idx, street in enumerate(player_state.streets)
+            for start, size in street.plan_estates() if size <= MAX_PLAN_ESTATE]
+
+        best_value, best_claim = (0, 0), ((), ())
+        for num_specials in range(len(specials) + 1):
+            for claimed_specials in itertools.combinations(specials, num_specials):
+                usable = self._usable_estates(estates, claimed_specials)
+                counts = [0] * (MAX_PLAN_ESTATE + 1)
+                for _, _, size in usable:
+                    counts[size] += 1
+                (points, progress), claimed_numeric = self._best_numeric(numeric, tuple(counts))
+                points += sum(self._score(i) for i in claimed_specials)
+                if (points, progress) > best_value:
+                    best_value, best_claim = (points, progress), (claimed_specials, claimed_numeric)
+
+        claimed_specials, claimed_numeric = best_claim
+        homes = set()
+        for i in claimed_specials:
+            homes.update(tuple(posn) for posn in index.claimable(i))
+        usable = self._usable_estates(estates, claimed_specials)
+        for i in claimed_numeric:
+            for size, ct in self._criteria(i).needed_estates.items():
+                chosen = [estate for estate in usable if estate[2] == size][:ct]
+                for estate in chosen:
+                    usable.remove(estate)
+                    homes.update((estate[0], estate[1] + k) for k in range(size))
+
+        city_plans = [[i, self._score(i)] for i in sorted(claimed_specials + claimed_numeric)]
+        return city_plans, [list(home) for home in sorted(homes)]
+
+    def _criteria(self, cp_idx: int):
+        return self._game_st.city_plans[cp_idx].criteria
+
+    def _score(self, cp_idx: int) -> int:
+        city_plan = self._game_st.city_plans[cp_idx]
+        return city_plan.score2 if self._game_st.city_plans_won[cp_idx] else city_plan.score1
+
+    def _usable_estates(self, estates: List[Tuple[int, int, int]], claimed_specials: Tuple[int, ...]) -> List[Tuple[int, int, int]]:
+        '''
+        Returns the estates numeric plans can use alongside the special plans
+        claimed: a street claimed whole, or the end houses, can't be counted again.
+        '''
+        cards = [self._criteria(i).valid_criteria for i in claimed_specials]
+        whole_streets = [card.value[1] for card in cards if card in [CriteriaCard.ALL_HOUSES_0, CriteriaCard.ALL_HOUSES_2]]
+        end_houses = CriteriaCard.END_HOUSES in cards
+        return [(st_idx, start, size) for st_idx, start, size in estates
+            if st_idx not in whole_streets and
+                not (end_houses and (start == 0 or start + size == STREET_LENS[st_idx]))]
+
+    def _check_memo(self) -> None:
+        city_plans, won = self._game_st.city_plans, tuple(self._game_st.city_plans_won)
+        if (self._memo_plans is None or self._memo_plans[0] is not city_plans or self._memo_plans[1] != won
+                or len(self._memo) >= MAX_MEMO_SIZE):
+            self._memo.clear()
+            self._memo_plans = (city_plans, won)
+
+    def _best_numeric(self, plans: Tuple[int, ...], counts: Tuple[int, ...]) -> Tuple[Tuple[int, int], Tuple[int, ...]]:
+        '''
+        Returns the best (points, progress) from claiming some of plans, with
+        counts estates of each size, and the plans claimed.
+        '''
+        key = (plans, counts)
+        if key not in self._memo:
+            self._memo[key] = self._search(plans, 0, counts, ())
+        return self._memo[key]
+
+    def _search(self, plans: Tuple[int, ...], k: int, counts: Tuple[int, ...],
+            claimed: Tuple[int, ...]) -> Tuple[Tuple[int, int], Tuple[int, ...]]:
+        '''
+        Returns the best (points, progress) from deciding whether to claim
+        plans[k:], with counts estates of each size left, and the plans claimed.
+        progress counts the estates left that the unclaimed plans could use,
+        which depends on every plan's choice, so partial searches aren't
+        memoized: there are only a few plans.
+        '''
+        if k == len(plans):
+            progress = sum(min(counts[size], ct) for i in plans if i not in claimed
+                for size, ct in self._criteria(i).needed_estates.items() if size <= MAX_PLAN_ESTATE)
+            return (0, progress), claimed
+
+        # skip plan k, or claim it if there are enough estates left
+        result = self._search(plans, k + 1, counts, claimed)
+        needed = self._criteria(plans[k]).needed_estates
+        if all(size <= MAX_PLAN_ESTATE and counts[size] >= ct for size, ct in needed.items()):
+            left = list(counts)
+            for size, ct in needed.items():
+                left[size] -= ct
+            (points, progress), with_plan = self._search(plans, k + 1, tuple(left), claimed + (plans[k],))
+            score = self._score(plans[k])
+            if (points + score, progress) > result[0]:
+                result = (points + score, progress), with_plan
+        return result
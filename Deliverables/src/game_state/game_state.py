@@ -75,7 +75,7 @@ class GameState():
         '''
         dict_repr = {
             "city-plans": [cp.to_dict() for cp in self._city_plans],
-            "city-plans-won": self._city_plans_won,
+            "city-plans-won": list(self._city_plans_won),
             "construction-cards": [cc.to_list() for cc in self._ccards],
             "effects": [str(effect) for effect in self._effects]
         }
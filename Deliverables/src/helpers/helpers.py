@@ -35,4 +35,17 @@ def is_eq_or_mono_incr(f1: int, f2: int):
     '''
     Returns a boolean indicating if f1 = f2 or f1 + 1 = f2.
     '''
-    return f1 == f2 or f1 + 1 == f2
\ No newline at end of file
+    return f1 == f2 or f1 + 1 == f2
+
+
+def mask_to_indices(mask: int) -> list:
+    '''
+    Returns the indices of the set bits of mask, in increasing order.
+    '''
+    indices = []
+    while mask:
+        low_bit = mask & -mask
+        indices.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+
+    return indices
\ No newline at end of file
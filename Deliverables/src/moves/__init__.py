@@ -1,5 +1,10 @@
+from .move import *
 from .move_generator import *
 from .move_validator import *
+from .delta_move_validator import *
 from .simple_move import *
+from .transposition_table import *
 from .smart_move import *
-from .cheating_move import *
\ No newline at end of file
+from .cheating_move import *
+from .search_move import *
+from .legal_move_enumerator import *
\ No newline at end of file
@@ -1,3 +1,5 @@
+import random
+from typing import *
 from game_state import *
 from player_state import *
 from . import MoveGenerator
@@ -6,8 +8,9 @@ class CheatingMoveGenerator(MoveGenerator):
     '''
     A cheating player. Returns the same player state it was given.
     '''
-    def __init__(self, game_state: GameState, player_state: PlayerState) -> None:
-        super().__init__(game_state, player_state)
+    def __init__(self, game_state: GameState, player_state: PlayerState, rng: Optional[random.Random]=None,
+            remaining_cards: Optional[List[List]]=None) -> None:
+        super().__init__(game_state, player_state, rng, remaining_cards)
 
     def generate_move(self) -> PlayerState:
         '''
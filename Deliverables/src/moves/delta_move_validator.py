@@ -0,0 +1,258 @@
+from player_state import *
+from game_state import *
+from typing import *
+from exception import MoveException, PlayerStateException, my_assert
+from constants import AGENT_MAXES, MAX_REFUSALS, MAX_ROUNDABOUTS, MAX_TEMPS, POOL_LOCS
+from . import Move
+
+class DeltaMoveValidator():
+    '''
+    Validates a Move against a PlayerState and GameState, and applies it to the
+    PlayerState in place. Only the homes and fields the move touches are checked.
+    '''
+    def __init__(self, game_state: GameState, player_state: PlayerState, move: Move) -> None:
+        my_assert(type(game_state) == GameState and type(player_state) == PlayerState and type(move) == Move,
+            MoveException,
+            "DeltaMoveValidator constructor requires a GameState, a PlayerState and a Move.")
+        self._game_st = game_state
+        self._ps = player_state
+        self._move = move
+        # holds (object, attribute, old value) for every change applied, so the
+        # move can be undone
+        self._undo_log = []
+
+    def validate_move(self) -> None:
+        '''
+        Validates the move and applies it to the PlayerState.
+        Raises a MoveException otherwise, leaving the PlayerState unchanged.
+        '''
+        my_assert(not self._undo_log,
+            MoveException,
+            "This move has already been applied.")
+        if self._move.refusal:
+            self._validate_refusal()
+        else:
+            my_assert(self._move.house is not None,
+                MoveException,
+                f"Must either place a house or use a refusal.")
+            poss_cards = self._validate_card_num()
+            self._validate_effect(poss_cards)
+
+        try:
+            self._apply_roundabout()
+            if self._move.refusal:
+                self._set(self._ps, "refusals", self._ps.refusals + 1)
+                return
+            self._apply_street_changes()
+            self._apply_rest_of_changes()
+            self._validate_used_in_plan()
+        except (MoveException, PlayerStateException) as e:
+            self.undo_move()
+            raise MoveException(str(e))
+
+    def undo_move(self) -> None:
+        '''
+        Reverts every change validate_move() applied to the PlayerState.
+        '''
+        while self._undo_log:
+            obj, attr, old_val = self._undo_log.pop()
+            setattr(obj, attr, old_val)
+
+    def score_delta(self, temps_lst: List[int]) -> int:
+        '''
+        Returns how much the move would change the player's score, leaving the
+        PlayerState unchanged. The streets update their score counts for each
+        field the move changes, so only the homes around it are rescanned.
+        Raises a MoveException if the move is invalid.
+        '''
+        before = self._ps.calculate_score(list(temps_lst))
+        self.validate_move()
+        after = self._ps.calculate_score(list(temps_lst))
+        self.undo_move()
+        return after - before
+
+    def _set(self, obj: object, attr: str, new_val) -> None:
+        '''
+        Set obj.attr through its property setter and record the old value.
+        '''
+        self._undo_log.append((obj, attr, getattr(obj, attr)))
+        setattr(obj, attr, new_val)
+
+    def _home(self, posn: List[int]) -> Home:
+        return self._ps.streets[posn[0]].homes[posn[1]]
+
+    def _validate_refusal(self) -> None:
+        '''
+        A refusal can only be combined with a roundabout, and is only allowed
+        if none of the cards can be built.
+        '''
+        move = self._move
+        my_assert(move.house is None and move.bis is None and
+                move.effect is None and not move.in_plan and not move.city_plans,
+            MoveException,
+            f"Cannot use a refusal and an (effect or a city plan).")
+        my_assert(self._ps.refusals < MAX_REFUSALS,
+            MoveException,
+            f"Cannot use more than {MAX_REFUSALS} refusals.")
+        for street in self._ps.streets:
+            for ccard in self._game_st.ccards:
+                my_assert(not street.placement_mask(ccard.num),
+                    MoveException,
+                    f"Invalid refusal use, you can place a house.")
+
+    def _validate_card_num(self) -> List[int]:
+        '''
+        Return the indices of the cards that could have been played.
+        '''
+        house_num = self._move.house[2]
+        poss_cards = [i for i, ccard in enumerate(self._game_st.ccards) if ccard.num == house_num]
+        # if a temp was used, any temp card within 2 of the house number counts
+        if self._move.temp:
+            for i, ccard in enumerate(self._game_st.ccards):
+                possible_nums = set([max(ccard.num + x, 0) for x in range(-2, 3)])
+                if house_num in possible_nums and self._game_st.effects[i] == "temp":
+                    poss_cards.append(i)
+
+        my_assert(poss_cards,
+            MoveException,
+            f"You must play a card.")
+        return poss_cards
+
+    def _validate_effect(self, poss_cards: List[int]) -> None:
+        '''
+        Validates that the effect used corresponds to one of the possible cards played.
+        '''
+        effect_used = self._move.effect
+        poss_effects = [self._game_st.effects[i].effect for i in poss_cards]
+        my_assert(effect_used is None or effect_used in poss_effects,
+            MoveException,
+            f"Invalid use of {effect_used} effect.")
+
+    def _apply_roundabout(self) -> None:
+        '''
+        Builds the roundabout, with fences on both sides of it.
+        '''
+        if self._move.roundabout is None:
+            return
+        st_idx, j = self._move.roundabout
+        street = self._ps.streets[st_idx]
+        my_assert(street.homes[j].num == "blank" and self._ps.roundabouts < MAX_ROUNDABOUTS,
+            MoveException,
+            f"A roundabout must be built on a blank home, and only two may be built.")
+        self._build_fence(street, j)
+        self._build_fence(street, j + 1)
+        self._set(street.homes[j], "num", "roundabout")
+        street._check_homes_rule_violations()
+
+    def _apply_street_changes(self) -> None:
+        '''
+        Builds the houses, fence, park and pool, then checks the street rules
+        on the streets that changed.
+        '''
+        move = self._move
+        changed_streets = set([move.house[0]])
+        if move.roundabout is not None:
+            changed_streets.add(move.roundabout[0])
+
+        for posn in [move.house, move.bis]:
+            if posn is None:
+                continue
+            home = self._home(posn)
+            my_assert(home.num == "blank",
+                MoveException,
+                f"Cannot change the number on a house after it's built.")
+            self._set(home, "house", posn[2] if posn is move.house else [posn[2], "bis"])
+            changed_streets.add(posn[0])
+
+        if move.fence is not None:
+            st_idx, j = move.fence
+            street = self._ps.streets[st_idx]
+            my_assert(not street.homes[j].fence_left,
+                MoveException,
+                f"There is already a fence there.")
+            my_assert(not (street.homes[j-1].in_plan and street.homes[j].in_plan),
+                MoveException,
+                f"Cannot build a fence between houses marked used-in-plan.")
+            self._build_fence(street, j)
+            changed_streets.add(st_idx)
+
+        for st_idx in changed_streets:
+            self._ps.streets[st_idx]._check_homes_rule_violations()
+
+        if move.park is not None:
+            my_assert(move.park == move.house[0],
+                MoveException,
+                f'Can only build one park per turn, and it must be in the same row as the new house.')
+            street = self._ps.streets[move.park]
+            self._set(street, "parks", street.parks + 1)
+
+        if move.pool is not None:
+            st_idx, pool_idx = move.pool
+            street = self._ps.streets[st_idx]
+            my_assert(not street.pools[pool_idx] and [st_idx, POOL_LOCS[st_idx][pool_idx]] == move.house[:2],
+                MoveException,
+                f'Cannot remove a pool, and can only build one pool in the new house you placed.')
+            new_pools = list(street.pools)
+            new_pools[pool_idx] = True
+            self._set(street, "pools", new_pools)
+
+    def _build_fence(self, street: Street, j: int) -> None:
+        '''
+        Build the fence to the left of home j, if there isn't one already.
+        '''
+        if j == 0 or j == len(street.homes) or street.homes[j].fence_left:
+            return
+        self._set(street.homes[j], "fence_left", True)
+        self._set(street.homes[j-1], "fence_right", True)
+
+    def _apply_rest_of_changes(self) -> None:
+        '''
+        Applies the agent, temp, in-plan and city plan score changes.
+        '''
+        move = self._move
+        if move.agent is not None:
+            my_assert(self._ps.agents[move.agent] < AGENT_MAXES[move.agent],
+                MoveException,
+                f"Agent column {move.agent} is already full.")
+            new_agents = list(self._ps.agents)
+            new_agents[move.agent] += 1
+            self._set(self._ps, "agents", new_agents)
+
+        if move.temp:
+            my_assert(self._ps.temps < MAX_TEMPS,
+                MoveException,
+                f"Cannot use more than {MAX_TEMPS} temps.")
+            self._set(self._ps, "temps", self._ps.temps + 1)
+
+        for posn in move.in_plan:
+            home = self._home(posn)
+            my_assert(not home.in_plan,
+                MoveException,
+                f"This house is already used in a city plan.")
+            self._set(home, "in_plan", True)
+
+        new_cp_scores = list(self._ps.city_plan_score)
+        for i, score in move.city_plans:
+            my_assert(new_cp_scores[i] == "blank",
+                MoveException,
+                f"You can only claim a city plan once.")
+            new_cp_scores[i] = score
+        if move.city_plans:
+            self._set(self._ps, "city_plan_score", new_cp_scores)
+
+    def _validate_used_in_plan(self) -> None:
+        '''
+        Validates the city plans claimed, and that the homes marked used-in-plan
+        this turn are exactly the ones they need.
+        '''
+        for i, cp_score in self._move.city_plans:
+            cp_claimed = self._game_st.city_plans[i]
+            expected = cp_claimed.score2 if self._game_st.city_plans_won[i] else cp_claimed.score1
+            my_assert(cp_score == expected,
+                MoveException,
+                f"City plan score invalid.")
+
+        index = CityPlanIndex(self._game_st, self._ps, self._move.in_plan)
+        my_assert(index.matches_claims([i for i, _ in self._move.city_plans]),
+            MoveException,
+            f"Houses marked used-in-plan must be exactly the estates of the city plans claimed this turn.")
@@ -0,0 +1,359 @@
+import itertools
+from collections import Counter
+from typing import *
+from game_state import *
+from player_state import *
+from helpers import mask_to_indices
+from constants import (AGENT_MAXES, MAX_REFUSALS, MAX_ROUNDABOUTS, MAX_TEMPS, PARK_MAXES,
+    POOL_LOCS, STREET_LENS, CriteriaCard)
+from . import Move, DeltaMoveValidator
+
+class LegalMoveEnumerator():
+    '''
+    Lists every legal move from a PlayerState: each card built on each home it
+    fits, alone or with one of the effects it allows, with or without a
+    roundabout, and with each set of city plans the result lets the player
+    claim. Refusals are included when no card fits.
+
+    Moves are generated lazily from the street placement masks rather than by
+    trying and validating candidates, and the loops run over distinct house
+    numbers and effects rather than over cards, so no move is generated twice.
+    Every move yielded is accepted by MoveValidator, and every move it accepts
+    is yielded.
+    '''
+    def __init__(self, game_state: GameState, player_state: PlayerState, roundabouts: bool=True) -> None:
+        '''
+        - roundabouts: if False, moves building a roundabout are left out
+        '''
+        self._game_st = game_state
+        self._ps = player_state
+        self._roundabouts = roundabouts
+        self._effects = [str(effect) for effect in game_state.effects]
+        # the city plans still open to this player, as (index, score, criteria)
+        self._unclaimed = [(i, cp.score2 if game_state.city_plans_won[i] else cp.score1, cp.criteria)
+            for i, cp in enumerate(game_state.city_plans) if player_state.city_plan_score[i] == "blank"]
+        # the estate sizes each open city plan with an estates criteria needs
+        self._needed = [(i, score, criteria.needed_estates) for i, score, criteria in self._unclaimed
+            if type(criteria.valid_criteria) == list]
+        # special city plans that one move could satisfy. the others are never
+        # checked, which saves building the new PlayerState for every move
+        self._specials = [(i, score, criteria) for i, score, criteria in self._unclaimed
+            if type(criteria.valid_criteria) == CriteriaCard and self._within_one_move(criteria.valid_criteria)]
+        # estates are found from bitmasks of each street's homes, and most
+        # moves leave all but one street's masks the same
+        self._estates_cache = {}
+
+    def __iter__(self) -> Iterator[Move]:
+        return self.moves()
+
+    def moves(self) -> Iterator[Move]:
+        '''
+        Yields every legal Move.
+        '''
+        can_refuse = self._can_refuse()
+        yield from self._card_moves(self._ps, None)
+        if can_refuse:
+            yield Move.refusal_move()
+        if self._roundabouts and self._ps.roundabouts < MAX_ROUNDABOUTS:
+            for roundabout, base in self._roundabout_states():
+                yield from self._card_moves(base, roundabout)
+                if can_refuse:
+                    yield Move._unchecked({ "refusal": True, "roundabout": roundabout })
+
+    def successors(self) -> Iterator[Tuple[Move, PlayerState]]:
+        '''
+        Yields every legal Move with the PlayerState it leads to.
+        '''
+        for move in self.moves():
+            new_ps = self._ps.clone()
+            DeltaMoveValidator(self._game_st, new_ps, move).validate_move()
+            yield move, new_ps
+
+    def _can_refuse(self) -> bool:
+        '''
+        A refusal is only legal if none of the cards can be built.
+        '''
+        if self._ps.refusals >= MAX_REFUSALS:
+            return False
+        return not any(street.placement_mask(ccard.num)
+            for street in self._ps.streets for ccard in self._game_st.ccards)
+
+    def _roundabout_states(self) -> Iterator[Tuple[List[int], PlayerState]]:
+        '''
+        Yields each legal roundabout position, with a copy of the PlayerState
+        that has the roundabout built.
+        '''
+        for st_idx, street in enumerate(self._ps.streets):
+            for k, home in enumerate(street.homes_view):
+                if home.num != "blank":
+                    continue
+                base = self._ps.clone()
+                base_street = base.streets[st_idx]
+                homes = base_street.homes
+                for j in [k, k + 1]:
+                    if 0 < j < len(homes) and not homes[j].fence_left:
+                        homes[j].fence_left = True
+                        homes[j - 1].fence_right = True
+                homes[k].num = "roundabout"
+                if base_street.find_rule_violation().ok:
+                    yield [st_idx, k], base
+
+    def _card_moves(self, base: PlayerState, roundabout: Optional[List[int]]) -> Iterator[Move]:
+        '''
+        Yields every move building a house on base, which may already have
+        this move's roundabout built.
+        '''
+        ccards = self._game_st.ccards
+        masks = [self._street_masks(street) for street in base.streets]
+        can_temp = self._ps.temps < MAX_TEMPS
+        for num in range(18):
+            # the effects of the cards with this number. temp is handled below,
+            # since it can also change the number
+            card_effects = set(self._effects[i] for i, ccard in enumerate(ccards) if ccard.num == num)
+            temp = can_temp and any(self._effects[i] == "temp" and
+                    num in [max(ccard.num + offset, 0) for offset in range(-TEMP_OFFSET, TEMP_OFFSET + 1)]
+                for i, ccard in enumerate(ccards))
+            if not card_effects and not temp:
+                continue
+            for st_idx, street in enumerate(base.streets):
+                for j in mask_to_indices(street.placement_mask(num)):
+                    house = [st_idx, j, num]
+                    built = [(st_idx, j)]
+                    if card_effects:
+                        yield from self._claim_moves({ "house": house }, roundabout, masks, built)
+                        for effect in sorted(card_effects - set(["temp"])):
+                            yield from self._effect_moves(effect, base, masks, house, roundabout)
+                    if temp:
+                        yield from self._claim_moves({ "house": house, "temp": True }, roundabout, masks, built)
+
+    def _effect_moves(self, effect: str, base: PlayerState, masks: List[Tuple[int, int, int]],
+            house: List[int], roundabout: Optional[List[int]]) -> Iterator[Move]:
+        '''
+        Yields every way to use effect along with house.
+        '''
+        st_idx, j, num = house
+        street = base.streets[st_idx]
+        built = [(st_idx, j)]
+        if effect == "surveyor":
+            for fence_st, fence_street in enumerate(base.streets):
+                for k in range(1, len(fence_street.homes_view)):
+                    if self._can_build_fence(fence_st, fence_street, k, house):
+                        yield from self._claim_moves({ "house": house, "fence": [fence_st, k] },
+                            roundabout, masks, built, (fence_st, k))
+        elif effect == "bis":
+            for bis_st, bis_street in enumerate(base.streets):
+                # the bis is checked on a copy of the street with the new house
+                # built, so that the bis can copy it
+                check_street = None
+                for k, home in enumerate(bis_street.homes_view):
+                    if home.num != "blank" or (bis_st, k) == (st_idx, j):
+                        continue
+                    if check_street is None:
+                        check_street = bis_street.clone()
+                        if bis_st == st_idx:
+                            check_street.homes[j].num = num
+                    for bis_num in self._bis_numbers(check_street, k):
+                        if check_street.check_place_new_home(k, [bis_num, "bis"]).ok:
+                            yield from self._claim_moves({ "house": house, "bis": [bis_st, k, bis_num] },
+                                roundabout, masks, built + [(bis_st, k)])
+        elif effect == "landscaper":
+            if street.parks < PARK_MAXES[st_idx]:
+                yield from self._claim_moves({ "house": house, "park": st_idx }, roundabout, masks, built)
+        elif effect == "pool":
+            if j in POOL_LOCS[st_idx] and not street.pools[POOL_LOCS[st_idx].index(j)]:
+                yield from self._claim_moves({ "house": house, "pool": [st_idx, POOL_LOCS[st_idx].index(j)] },
+                    roundabout, masks, built)
+        elif effect == "agent":
+            for col, max_agents in enumerate(AGENT_MAXES):
+                if self._ps.agents[col] < max_agents:
+                    yield from self._claim_moves({ "house": house, "agent": col }, roundabout, masks, built)
+
+    def _can_build_fence(self, st_idx: int, street: Street, k: int, house: List[int]) -> bool:
+        '''
+        Returns True if a fence can be built left of home k once house is built.
+        A fence can only break the rules by cutting a bis off from the house it
+        copies.
+        '''
+        homes = street.homes_view
+        if homes[k].fence_left or (homes[k-1].in_plan and homes[k].in_plan):
+            return False
+
+        def num(idx: int):
+            return house[2] if [st_idx, idx] == house[:2] else homes[idx].num
+
+        if homes[k-1].is_bis and not (k >= 2 and num(k-2) == num(k-1) and not homes[k-1].fence_left):
+            return False
+        if homes[k].is_bis and not (k + 1 < len(homes) and num(k+1) == num(k) and not homes[k].fence_right):
+            return False
+        return True
+
+    def _bis_numbers(self, street: Street, k: int) -> Set[int]:
+        '''
+        Returns the numbers a bis on home k could copy from its neighbors.
+        '''
+        homes = street.homes_view
+        nums = set()
+        if k > 0 and not homes[k].fence_left and type(homes[k-1].num) == int:
+            nums.add(homes[k-1].num)
+        if k < len(homes) - 1 and not homes[k].fence_right and type(homes[k+1].num) == int:
+            nums.add(homes[k+1].num)
+        return nums
+
+    def _street_masks(self, street: Street) -> Tuple[int, int, int]:
+        '''
+        Returns bitmasks of the street's built houses, left fences, and homes
+        used in a plan.
+        '''
+        built = fences = in_plan = 0
+        for k, home in enumerate(street.homes_view):
+            if type(home.num) == int:
+                built |= 1 << k
+            if home.fence_left:
+                fences |= 1 << k
+            if home.in_plan:
+                in_plan |= 1 << k
+        return built, fences, in_plan
+
+    def _estates(self, st_idx: int, built: int, fences: int, in_plan: int) -> List[Tuple[int, int, int]]:
+        '''
+        Returns the estates on a street that can be used in a plan, as
+        (street, first home, size): the runs of homes between two fences that
+        are all built and none used in a plan yet.
+        '''
+        key = (st_idx, built, fences, in_plan)
+        if key not in self._estates_cache:
+            estates = []
+            start = 0
+            for k in range(1, STREET_LENS[st_idx] + 1):
+                if k == STREET_LENS[st_idx] or fences >> k & 1:
+                    run = ((1 << (k - start)) - 1) << start
+                    if built & run == run and not in_plan & run:
+                        estates.append((st_idx, start, k - start))
+                    start = k
+            self._estates_cache[key] = estates
+        return self._estates_cache[key]
+
+    def _claim_moves(self, move_dict: Dict, roundabout: Optional[List[int]], masks: List[Tuple[int, int, int]],
+            built: List[Tuple[int, int]], fence: Optional[Tuple[int, int]]=None) -> Iterator[Move]:
+        '''
+        Yields the move, then the move with every set of city plans it lets the
+        player claim.
+        - built: the homes the move builds houses on, as (street, home)
+        - fence: the fence the move builds, as (street, home), or None
+        '''
+        if roundabout is not None:
+            move_dict["roundabout"] = roundabout
+        yield Move._unchecked(move_dict)
+        if not self._unclaimed:
+            return
+
+        estates = []
+        for st_idx, (st_built, st_fences, st_in_plan) in enumerate(masks):
+            for home_st, home_idx in built:
+                if home_st == st_idx:
+                    st_built |= 1 << home_idx
+            if fence is not None and fence[0] == st_idx:
+                st_fences |= 1 << fence[1]
+            estates.extend(self._estates(st_idx, st_built, st_fences, st_in_plan))
+
+        for city_plans, in_plan in self._claims(move_dict, estates):
+            yield Move._unchecked(dict(move_dict, **{ "in-plan": in_plan, "city-plans": city_plans }))
+
+    def _claims(self, move_dict: Dict, estates: List[Tuple[int, int, int]]) -> Iterator[Tuple[List, List]]:
+        '''
+        Yields each set of city plans that can be claimed after move_dict, as
+        the city plans claimed and the homes newly used in them.
+        '''
+        # (index, score, estate sizes needed or None, homes to mark or None)
+        claimable = []
+        if estates:
+            sizes = Counter(size for _, _, size in estates)
+            claimable = [(i, score, needed, None) for i, score, needed in self._needed if not needed - sizes]
+        claimable.extend(self._special_claims(move_dict))
+        claimable.sort()
+
+        for num_claimed in range(1, len(claimable) + 1):
+            for claimed in itertools.combinations(claimable, num_claimed):
+                special = [crit for _, _, needed, crit in claimed if needed is None]
+                marks = set((st_idx, k) for crit in special for st_idx, k in crit[1])
+                needed = sum([needed for _, _, needed, _ in claimed if needed is not None], Counter())
+                usable = [estate for estate in estates if not self._excluded(estate, [crit[0] for crit in special])]
+                for chosen in self._choose_estates(usable, needed):
+                    homes = marks | set((st_idx, start + x) for st_idx, start, size in chosen for x in range(size))
+                    yield [[i, score] for i, score, _, _ in claimed], [list(home) for home in sorted(homes)]
+
+    def _excluded(self, estate: Tuple[int, int, int], special: List[CriteriaCard]) -> bool:
+        '''
+        Returns True if estate can't count towards a city plan claimed along
+        with the special city plans given, since its homes are used by them.
+        '''
+        st_idx, start, size = estate
+        if CriteriaCard.END_HOUSES in special and (start == 0 or start + size == STREET_LENS[st_idx]):
+            return True
+        return ((CriteriaCard.ALL_HOUSES_0 in special and st_idx == 0) or
+            (CriteriaCard.ALL_HOUSES_2 in special and st_idx == 2))
+
+    def _choose_estates(self, estates: List[Tuple[int, int, int]], needed: Counter) -> Iterator[Tuple]:
+        '''
+        Yields each set of estates with the sizes needed.
+        '''
+        choices = [itertools.combinations([estate for estate in estates if estate[2] == size], count)
+            for size, count in sorted(needed.items())]
+        for chosen in itertools.product(*choices):
+            yield tuple(estate for group in chosen for estate in group)
+
+    def _special_claims(self, move_dict: Dict) -> List[Tuple]:
+        '''
+        Returns the special city plans that can be claimed after move_dict, each
+        with the homes it marks as used in a plan.
+        '''
+        if not self._specials:
+            return []
+        new_ps = self._ps.clone()
+        DeltaMoveValidator(self._game_st, new_ps, Move._unchecked(move_dict)).validate_move()
+
+        claimable = []
+        for i, score, criteria in self._specials:
+            card = criteria.valid_criteria
+            if card in [CriteriaCard.ALL_HOUSES_0, CriteriaCard.ALL_HOUSES_2]:
+                st_idx = card.value[1]
+                homes = [(st_idx, k) for k in range(STREET_LENS[st_idx])]
+            elif card == CriteriaCard.END_HOUSES:
+                homes = [(st_idx, k) for st_idx, st_len in enumerate(STREET_LENS) for k in [0, st_len - 1]]
+            else:
+                homes = []
+            # the homes can only be used if they're all built
+            if not all(type(new_ps.streets[st_idx].homes_view[k].num) == int for st_idx, k in homes):
+                continue
+            marks = [(st_idx, k) for st_idx, k in homes if not new_ps.streets[st_idx].homes_view[k].in_plan]
+            for st_idx, k in marks:
+                new_ps.streets[st_idx].homes[k].in_plan = True
+            if criteria.is_satisfied(new_ps, {}):
+                claimable.append((i, score, None, (card, marks)))
+        return claimable
+
+    def _within_one_move(self, card: CriteriaCard) -> bool:
+        '''
+        Returns False if a special city plan can't be satisfied by the next move,
+        which builds at most two houses, a roundabout, and a park, pool or temp.
+        '''
+        ps = self._ps
+        streets = ps.streets
+        missing = [PARK_MAXES[i] - street.parks + street.pools.count(False) for i, street in enumerate(streets)]
+        if card in [CriteriaCard.ALL_HOUSES_0, CriteriaCard.ALL_HOUSES_2]:
+            return [home.num for home in streets[card.value[1]].homes_view].count("blank") <= 2
+        elif card == CriteriaCard.END_HOUSES:
+            return [street.homes_view[k].num for street in streets for k in [0, -1]].count("blank") <= 2
+        elif card == CriteriaCard.SEVEN_TEMPS:
+            return ps.temps >= 6
+        elif card == CriteriaCard.FIVE_BIS:
+            return max(street.bis_count() for street in streets) >= 4
+        elif card == CriteriaCard.TWO_STREETS_ALL_PARKS:
+            return [PARK_MAXES[i] - street.parks <= 1 for i, street in enumerate(streets)].count(True) >= 2
+        elif card == CriteriaCard.TWO_STREETS_ALL_POOLS:
+            return [street.pools.count(False) <= 1 for street in streets].count(True) >= 2
+        elif card == CriteriaCard.ALL_POOLS_ALL_PARKS_1:
+            return missing[1] <= 1
+        elif card == CriteriaCard.ALL_POOLS_ALL_PARKS_2:
+            return missing[2] <= 1
+        return min(missing) <= 1
@@ -0,0 +1,266 @@
+import json
+from typing import *
+from helpers import *
+from exception import MoveException, my_assert
+from constants import STREET_LENS, AGENT_MAXES, NUM_CPS, POOL_LOCS
+
+class Move():
+    '''
+    A single turn, described by what changed rather than by the resulting
+    PlayerState. Positions are [street, home] pairs; a fence position is the
+    home the fence is to the left of.
+    '''
+    def __init__(self, move_dict: Dict={}) -> None:
+        move_keys = set(["house", "bis", "roundabout", "fence", "park", "pool",
+            "agent", "temp", "refusal", "in-plan", "city-plans"])
+        my_assert(type(move_dict) == dict and set(move_dict.keys()) <= move_keys,
+            MoveException,
+            f"A move must be a dictionary containing only these keys: {move_keys}")
+
+        self.house = move_dict.get("house", None)
+        self.bis = move_dict.get("bis", None)
+        self.roundabout = move_dict.get("roundabout", None)
+        self.fence = move_dict.get("fence", None)
+        self.park = move_dict.get("park", None)
+        self.pool = move_dict.get("pool", None)
+        self.agent = move_dict.get("agent", None)
+        self.temp = move_dict.get("temp", False)
+        self.refusal = move_dict.get("refusal", False)
+        self.in_plan = move_dict.get("in-plan", [])
+        self.city_plans = move_dict.get("city-plans", [])
+
+    @classmethod
+    def refusal_move(cls) -> "Move":
+        return cls({"refusal": True})
+
+    @classmethod
+    def _unchecked(cls, move_dict: Dict) -> "Move":
+        '''
+        Returns the Move for move_dict without validating its fields, for
+        moves built from positions already known to be on the board.
+        '''
+        move = cls.__new__(cls)
+        move._house = move_dict.get("house", None)
+        move._bis = move_dict.get("bis", None)
+        move._roundabout = move_dict.get("roundabout", None)
+        move._fence = move_dict.get("fence", None)
+        move._park = move_dict.get("park", None)
+        move._pool = move_dict.get("pool", None)
+        move._agent = move_dict.get("agent", None)
+        move._temp = move_dict.get("temp", False)
+        move._refusal = move_dict.get("refusal", False)
+        move._in_plan = move_dict.get("in-plan", [])
+        move._city_plans = move_dict.get("city-plans", [])
+        return move
+
+    def _validate_position(self, posn: List[int], offset: int=0) -> bool:
+        '''
+        Returns True if posn is [street, home] with a home on that street.
+        offset extends the last valid home index, for fence positions.
+        '''
+        return (check_valid_lst(posn, 2, check_nat) and posn[0] < len(STREET_LENS) and
+            posn[1] < STREET_LENS[posn[0]] + offset)
+
+    def _validate_numbered(self, posn: List[int]) -> bool:
+        '''
+        Returns True if posn is [street, home, number] with a number 0-17.
+        '''
+        return (type(posn) == list and len(posn) == 3 and self._validate_position(posn[:2]) and
+            check_nat(posn[2]) and posn[2] <= 17)
+
+    @property
+    def house(self) -> Optional[List[int]]:
+        '''
+        The new non-bis house as [street, home, number], or None.
+        '''
+        return self._house
+
+    @house.setter
+    def house(self, house: Optional[List[int]]) -> None:
+        my_assert(house is None or self._validate_numbered(house),
+            MoveException,
+            f"Given {house}, but house must be [street, home, number] or null.")
+        self._house = house
+
+    @property
+    def bis(self) -> Optional[List[int]]:
+        '''
+        The new bis house as [street, home, number], or None.
+        '''
+        return self._bis
+
+    @bis.setter
+    def bis(self, bis: Optional[List[int]]) -> None:
+        my_assert(bis is None or self._validate_numbered(bis),
+            MoveException,
+            f"Given {bis}, but bis must be [street, home, number] or null.")
+        self._bis = bis
+
+    @property
+    def roundabout(self) -> Optional[List[int]]:
+        return self._roundabout
+
+    @roundabout.setter
+    def roundabout(self, roundabout: Optional[List[int]]) -> None:
+        my_assert(roundabout is None or self._validate_position(roundabout),
+            MoveException,
+            f"Given {roundabout}, but roundabout must be [street, home] or null.")
+        self._roundabout = roundabout
+
+    @property
+    def fence(self) -> Optional[List[int]]:
+        '''
+        The new fence as [street, home], built to the left of that home, or None.
+        '''
+        return self._fence
+
+    @fence.setter
+    def fence(self, fence: Optional[List[int]]) -> None:
+        my_assert(fence is None or (self._validate_position(fence) and fence[1] > 0),
+            MoveException,
+            f"Given {fence}, but fence must be [street, home] with home > 0, or null.")
+        self._fence = fence
+
+    @property
+    def park(self) -> Optional[int]:
+        '''
+        The street a park was built on, or None.
+        '''
+        return self._park
+
+    @park.setter
+    def park(self, park: Optional[int]) -> None:
+        my_assert(park is None or check_type_and_membership(park, int, set(range(len(STREET_LENS)))),
+            MoveException,
+            f"Given {park}, but park must be a street index or null.")
+        self._park = park
+
+    @property
+    def pool(self) -> Optional[List[int]]:
+        '''
+        The pool built as [street, pool index], or None.
+        '''
+        return self._pool
+
+    @pool.setter
+    def pool(self, pool: Optional[List[int]]) -> None:
+        my_assert(pool is None or (check_valid_lst(pool, 2, check_nat) and
+                pool[0] < len(STREET_LENS) and pool[1] < len(POOL_LOCS[pool[0]])),
+            MoveException,
+            f"Given {pool}, but pool must be [street, pool index] or null.")
+        self._pool = pool
+
+    @property
+    def agent(self) -> Optional[int]:
+        '''
+        The estate size index an agent was used on, or None.
+        '''
+        return self._agent
+
+    @agent.setter
+    def agent(self, agent: Optional[int]) -> None:
+        my_assert(agent is None or check_type_and_membership(agent, int, set(range(len(AGENT_MAXES)))),
+            MoveException,
+            f"Given {agent}, but agent must be an index 0-5 or null.")
+        self._agent = agent
+
+    @property
+    def temp(self) -> bool:
+        return self._temp
+
+    @temp.setter
+    def temp(self, temp: bool) -> None:
+        my_assert(type(temp) == bool,
+            MoveException,
+            f"Given {temp}, but temp must be a boolean.")
+        self._temp = temp
+
+    @property
+    def refusal(self) -> bool:
+        return self._refusal
+
+    @refusal.setter
+    def refusal(self, refusal: bool) -> None:
+        my_assert(type(refusal) == bool,
+            MoveException,
+            f"Given {refusal}, but refusal must be a boolean.")
+        self._refusal = refusal
+
+    @property
+    def in_plan(self) -> List[List[int]]:
+        '''
+        The homes newly marked used-in-plan, as [street, home] pairs.
+        '''
+        return self._in_plan
+
+    @in_plan.setter
+    def in_plan(self, in_plan: List[List[int]]) -> None:
+        my_assert(check_valid_lst(in_plan, None, self._validate_position),
+            MoveException,
+            f"Given {in_plan}, but in-plan must be a list of [street, home].")
+        self._in_plan = in_plan
+
+    @property
+    def city_plans(self) -> List[List[int]]:
+        '''
+        The city plans claimed, as [city plan index, score] pairs.
+        '''
+        return self._city_plans
+
+    @city_plans.setter
+    def city_plans(self, city_plans: List[List[int]]) -> None:
+        my_assert(check_valid_lst(city_plans, None,
+                lambda cp: check_valid_lst(cp, 2, check_nat) and cp[0] < NUM_CPS),
+            MoveException,
+            f"Given {city_plans}, but city-plans must be a list of [city plan index, score].")
+        self._city_plans = city_plans
+
+    @property
+    def effect(self) -> Optional[str]:
+        '''
+        Returns the name of the effect this move used, or None. Raises a
+        MoveException if the move uses more than one effect.
+        '''
+        effects_lst = [
+            (self._fence, "surveyor"),
+            (self._bis, "bis"),
+            (self._agent is not None, "agent"),
+            (self._temp, "temp"),
+            (self._park is not None, "landscaper"),
+            (self._pool, "pool")]
+        used = [effect for ch_field, effect in effects_lst if ch_field]
+        my_assert(len(used) <= 1,
+            MoveException,
+            f"Cannot use multiple effects.")
+        return used[0] if used else None
+
+    def to_dict(self) -> Dict:
+        '''
+        Returns the Dictionary representation of a Move, leaving out the
+        fields the move doesn't use.
+        '''
+        dict_repr = {
+            "house": self._house,
+            "bis": self._bis,
+            "roundabout": self._roundabout,
+            "fence": self._fence,
+            "park": self._park,
+            "pool": self._pool,
+            "agent": self._agent,
+            "temp": self._temp,
+            "refusal": self._refusal,
+            "in-plan": self._in_plan,
+            "city-plans": self._city_plans
+        }
+        # park and agent can be 0, so compare against the unused values by identity
+        return {key: val for key, val in dict_repr.items()
+            if val is not None and val is not False and val != []}
+
+    def __repr__(self) -> str:
+        '''
+        Returns the JSON representation of a Move.
+        '''
+        return json.dumps(self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) == Move and self.to_dict() == other.to_dict()
@@ -1,10 +1,23 @@
+import random
+from typing import *
 from game_state import *
 from player_state import *
 
+# unseeded, so generators without an rng of their own can share it rather
+# than each seeding a new one
+_default_rng = random.Random()
+
 class MoveGenerator():
-    def __init__(self, game_state: GameState, player_state: PlayerState) -> None:
+    def __init__(self, game_state: GameState, player_state: PlayerState, rng: Optional[random.Random]=None,
+            remaining_cards: Optional[List[List]]=None) -> None:
         self.game_st = game_state
         self.player_st = player_state
+        # generators that pick moves at random draw from rng, so a game with
+        # a seeded rng plays out the same every time
+        self.rng = rng if rng is not None else _default_rng
+        # the construction cards still to be drawn before the deck is
+        # reshuffled, if the host knows them, as [number, effect] lists
+        self.remaining_cards = remaining_cards
 
     def generate_move(self) -> PlayerState:
         '''
@@ -5,6 +5,7 @@ from exception import MoveException, my_assert
 from constants import POOL_LOCS, STREET_LENS, CriteriaCard
 from collections import defaultdict
 from helpers import is_eq_or_mono_incr, check_valid_lst
+from . import Move
 
 class MoveValidator():
     def __init__(self, game_state: GameState, ps1: PlayerState, ps2: PlayerState) -> None:
@@ -21,6 +22,8 @@ class MoveValidator():
         self._ps2 = ps2
         # if True, check that surveyor was used
         self._surveyor = False
+        # holds [row, col] of the home the new fence is left of
+        self._fence = []
         # check that the # on the house corresponds to the correct ConstructionCard
         # holds: [row, col, House object]
         self._houses = []
@@ -40,6 +43,8 @@ class MoveValidator():
         self._temps = False
         # check that a real estate agent was used
         self._agents = False
+        # holds the index of the agent column that was increased
+        self._agent_col = None
         # check that a refusal was used
         self._refusals = False
         # holds: list of [city_plan_idx, score_claimed]
@@ -76,6 +81,29 @@ class MoveValidator():
         }
         return dict_repr
 
+    def to_move(self) -> Move:
+        '''
+        Returns the Move found by validate_move().
+        '''
+        move = Move()
+        if self._houses:
+            move.house = [self._houses[0], self._houses[1], self._houses[2].num]
+        if self._bis_houses:
+            move.bis = [self._bis_houses[0], self._bis_houses[1], self._bis_houses[2].num]
+        if self._roundabout:
+            move.roundabout = self._roundabout
+        if self._fence:
+            move.fence = self._fence
+        move.park = self._parks
+        if self._pools:
+            move.pool = [self._pools[0], POOL_LOCS[self._pools[0]].index(self._pools[1])]
+        move.agent = self._agent_col
+        move.temp = self._temps
+        move.refusal = self._refusals
+        move.in_plan = [[i, j] for i, row in enumerate(self._in_plan) for j, _ in row]
+        move.city_plans = [[i, score] for i, score in self._city_plan_scores]
+        return move
+
     def validate_move(self):
         '''
         Validates the move from player_state_1 to player_state_2.\n
@@ -146,6 +174,8 @@ class MoveValidator():
             (self._ps1.refusals, self._ps2.refusals, "refusals"),
             (sum(self._ps1.agents), sum(self._ps2.agents), "agents")
             ]
+        if any(a2 < a1 for a1, a2 in zip(self._ps1.agents, self._ps2.agents)):
+            raise MoveException(f'agents must stay the same or increase by only one.')
 
         for f1, f2, ch_field in to_check:
             if not is_eq_or_mono_incr(f1, f2):
@@ -157,6 +187,7 @@ class MoveValidator():
                     self._refusals = True
                 elif ch_field == "agents":
                     self._agents = True
+                    self._agent_col = next((i for i, a in enumerate(self._ps2.agents) if a > self._ps1.agents[i]), None)
 
         # find new city plan scores
         for i, cp1 in enumerate(self._ps1.city_plan_score):
@@ -202,6 +233,7 @@ class MoveValidator():
             # ignore left fence of house adjacent to roundabout
             if not (self._roundabout and self._roundabout == [i, j-1]):
                 self._surveyor = True
+                self._fence = [i, j]
 
         if h1.in_plan != h2.in_plan:
             if h1.in_plan:
@@ -278,75 +310,18 @@ class MoveValidator():
             raise MoveException(f"Cannot use refusal and place a house.")
 
     def _can_player_place_home(self) -> bool:
-        for i in range(len(self._ps1.streets)):
-            street = self._ps1.streets[i]
-            for j in range(len(street.homes)):
-                if street.homes[j].num == "blank":
-                    # try to play each of the construction cards
-                    for ccard in self._game_st.ccards:
-                        try:
-                            # try setting home with the new number
-                            street.try_place_new_home(j, ccard.num)
-                        except StreetException:
-                            # change home number back to "blank"
-                            street.try_place_new_home(j, "blank")
-                        else:
-                            # if we can successfully place a home, then the refusal is invalid
-                            street.try_place_new_home(j, "blank")
-                            raise MoveException(f"Invalid refusal use, you can place a house.")
+        for street in self._ps1.streets:
+            # if any card can be placed anywhere, then the refusal is invalid
+            for ccard in self._game_st.ccards:
+                if street.placement_mask(ccard.num):
+                    raise MoveException(f"Invalid refusal use, you can place a house.")
         return True
 
-    def _find_new_estates(self) -> DefaultDict[int, int]:
-        '''
-        Returns a dictionary with the new estates claimed during this turn,
-        or False if there was a rule violation. Keys are estate sizes, values are # of estates with that size
-        '''
-        estates = defaultdict(int)
-        first_home = True
-        # if we're trying to claim the "end houses" city plan, then exclude them from 
-        # the loop (since they can't be double counted)
-        start, end = 0, STREET_LENS[0] - 1
-        cps_claimed_criteria = [self._game_st.city_plans[i].criteria.valid_criteria for i, _ in self._city_plan_scores]
-        if CriteriaCard.END_HOUSES in cps_claimed_criteria:
-            start += 1
-            end -= 1
-
-        for curr_row in self._in_plan: 
-            in_curr_estate = []
-            for j, h in curr_row:
-                if j < start or j > end:
-                    continue
-
-                if first_home:
-                    # first home MUST have a fence on the left, if not, it's invalid.
-                    if not h.fence_left:
-                        raise MoveException(f"City plans must be enclosed by fences.")
-                    first_home = False
-                else:
-                    # if not first home, then this home MUST be adjacent to the previous one
-                    if not in_curr_estate or j != in_curr_estate[-1] + 1:
-                        raise MoveException(f"Houses used in the same city plan estate must be adjacent.")
-
-                in_curr_estate.append(j)
-
-                if h.fence_right:
-                    # then, we found an estate
-                    estates[len(in_curr_estate)] += 1
-                    in_curr_estate = []
-                    first_home = True
-            end += 1
-
-        return estates
-                        
     def _validate_used_in_plan(self) -> bool:
         '''
-        Validates the new estates being used in a plan. Raises MoveException
-        otherwise.
+        Validates the city plans claimed, and that the homes marked used-in-plan
+        this turn are exactly the ones they need. Raises MoveException otherwise.
         '''
-        # first, find all new estates
-        # keys are estate sizes, values are # of estates with that size
-        estates = self._find_new_estates()
-        # find city plans that were potentially claimed
         for i, cp_score in self._city_plan_scores:
             cp_claimed = self._game_st.city_plans[i]
 
@@ -356,9 +331,11 @@ class MoveValidator():
             else:
                 if cp_score != cp_claimed.score1:
                     raise MoveException(f"City plan score invalid.")
-            
-            if not cp_claimed.criteria.is_satisfied(self._ps2, estates):
-                raise MoveException(f"Incorrectly attemped to claim city plan {cp_claimed}.")
+
+        new_marks = [[i, j] for i, row in enumerate(self._in_plan) for j, _ in row]
+        index = CityPlanIndex(self._game_st, self._ps2, new_marks)
+        if not index.matches_claims([i for i, _ in self._city_plan_scores]):
+            raise MoveException(f"Houses marked used-in-plan must be exactly the estates of the city plans claimed this turn.")
 
         return True
 
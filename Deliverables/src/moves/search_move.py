@@ -0,0 +1,253 @@
+import math
+import random
+import time
+from typing import *
+from game_state import *
+from player_state import *
+from exception import MoveException
+from helpers import mask_to_indices
+from constants import CONSTRUCTION_CARDS, NUM_CCS, POOL_LOCS, PARK_MAXES, AGENT_MAXES, MAX_ROUNDABOUTS
+from . import Move, MoveGenerator, DeltaMoveValidator, TranspositionTable
+
+class SearchMoveGenerator(MoveGenerator):
+    '''
+    Picks a move with flat Monte Carlo search: no tree is built below this
+    turn's moves. The legal moves are ranked by the score they lead to, and
+    the best few are kept. Each iteration picks one of them by UCB1 and
+    plays random rounds from it, with cards drawn from the remaining deck,
+    then scores the result. Without remaining_cards, e.g. for a network
+    player, the deck is every card but the ones showing.
+
+    Stops after iterations iterations or time_budget seconds, whichever
+    comes first, so it can be fit to a turn deadline. Without a time_budget,
+    the same rng state always picks the same move.
+
+    Scores are cached by PlayerState hash in a TranspositionTable, shared by
+    every SearchMoveGenerator unless one is given, so they carry over
+    between turns. A score only depends on the PlayerState, so players in
+    different games can share it.
+    '''
+    _shared_scores = TranspositionTable()
+
+    def __init__(self, game_state: GameState, player_state: PlayerState, iterations: int=200,
+            time_budget: Optional[float]=None, max_children: int=12, rollout_depth: int=4,
+            rng: Optional[random.Random]=None, scores: Optional[TranspositionTable]=None,
+            remaining_cards: Optional[List[List]]=None) -> None:
+        super().__init__(game_state, player_state, rng, remaining_cards)
+        self._iterations = iterations
+        self._time_budget = time_budget
+        self._max_children = max_children
+        self._rollout_depth = rollout_depth
+        self._scores = scores if scores is not None else SearchMoveGenerator._shared_scores
+        # picks the city plans each candidate move can claim
+        self._plan_solver = EstatePlanSolver(game_state)
+        # cards rollouts draw from until the deck runs out. Without the real
+        # remaining deck, the cards drawn earlier since the last reshuffle
+        # aren't known, so they stay in
+        if remaining_cards is not None:
+            self._future_cards = list(remaining_cards)
+        else:
+            self._future_cards = list(CONSTRUCTION_CARDS)
+            for ccard in game_state.ccards:
+                if ccard.to_list() in self._future_cards:
+                    self._future_cards.remove(ccard.to_list())
+
+    def generate_move(self) -> PlayerState:
+        '''
+        Returns a new PlayerState with the best move found, or a refusal used.
+        '''
+        children = self._expand_root()
+        if len(children) == 1:
+            return children[0][1]
+
+        deadline = time.monotonic() + self._time_budget if self._time_budget is not None else None
+        visits = [0] * len(children)
+        totals = [0.0] * len(children)
+        for iteration in range(self._iterations):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            child = self._select_child(visits, totals, iteration)
+            totals[child] += self._rollout(children[child][1])
+            visits[child] += 1
+
+        best = max(range(len(children)), key=lambda i: totals[i] / visits[i] if visits[i] else float("-inf"))
+        return children[best][1]
+
+    def _expand_root(self) -> List[Tuple[Move, PlayerState]]:
+        '''
+        Returns the best (Move, PlayerState) pairs reachable this turn, ranked
+        by score, or just the refusal if nothing can be built.
+        '''
+        children = self._try_moves(self._candidate_moves())
+        # roundabouts cost points, so only use them to avoid a refusal
+        if not children:
+            children = self._try_moves(self._roundabout_moves())
+        if not children:
+            new_ps = self.player_st.clone()
+            new_ps.refusals += 1
+            return [(Move.refusal_move(), new_ps)]
+
+        children.sort(key=lambda child: child[0], reverse=True)
+        return [(move, new_ps) for _, move, new_ps in children[:self._max_children]]
+
+    def _try_moves(self, moves: Iterable[Move]) -> List[Tuple[float, Move, PlayerState]]:
+        '''
+        Returns (score, Move, PlayerState) for each legal move in moves.
+        '''
+        children = []
+        # different moves can reach the same PlayerState, which only needs to
+        # be searched once
+        seen = set()
+        for move in moves:
+            new_ps = self.player_st.clone()
+            try:
+                DeltaMoveValidator(self.game_st, new_ps, move).validate_move()
+            except MoveException:
+                continue
+            move, new_ps = self._claim_city_plans(move, new_ps)
+            if new_ps in seen:
+                continue
+            seen.add(new_ps)
+            children.append((self._evaluate(new_ps), move, new_ps))
+        return children
+
+    def _claim_city_plans(self, move: Move, new_ps: PlayerState) -> Tuple[Move, PlayerState]:
+        '''
+        Adds the best set of city plans the move lets the player claim to the
+        move, if the DeltaMoveValidator accepts it.
+        '''
+        city_plans, in_plan = self._plan_solver.solve(new_ps)
+        if not city_plans:
+            return move, new_ps
+        claim_move = Move(dict(move.to_dict(), **{ "in-plan": in_plan, "city-plans": city_plans }))
+        claim_ps = self.player_st.clone()
+        try:
+            DeltaMoveValidator(self.game_st, claim_ps, claim_move).validate_move()
+        except MoveException:
+            return move, new_ps
+        return claim_move, claim_ps
+
+    def _candidate_moves(self) -> Iterator[Move]:
+        '''
+        Yields every card, home and effect combination worth trying. Some may
+        break the rules; they're weeded out by the DeltaMoveValidator.
+        '''
+        streets = self.player_st.streets
+        for i, ccard in enumerate(self.game_st.ccards):
+            effect = str(self.game_st.effects[i])
+            offsets = range(-TEMP_OFFSET, TEMP_OFFSET + 1) if effect == "temp" else [0]
+            for offset in offsets:
+                num = ccard.num + offset
+                if num < 0 or num > 17:
+                    continue
+                for st_idx, street in enumerate(streets):
+                    for j in mask_to_indices(street.placement_mask(num)):
+                        house = [st_idx, j, num]
+                        yield Move({ "house": house, "temp": offset != 0 })
+                        if offset == 0:
+                            yield from self._effect_moves(effect, house)
+
+    def _effect_moves(self, effect: str, house: List[int]) -> Iterator[Move]:
+        st_idx, j, num = house
+        streets = self.player_st.streets
+        if effect == "surveyor":
+            for fence_st, street in enumerate(streets):
+                homes = street.homes_view
+                for k in range(1, len(homes)):
+                    if not homes[k].fence_left:
+                        yield Move({ "house": house, "fence": [fence_st, k] })
+        elif effect == "bis":
+            for bis_st, street in enumerate(streets):
+                homes = street.homes_view
+                for k, home in enumerate(homes):
+                    if home.num == "blank":
+                        for neighbor in [k - 1, k + 1]:
+                            if 0 <= neighbor < len(homes) and type(homes[neighbor].num) == int:
+                                yield Move({ "house": house, "bis": [bis_st, k, homes[neighbor].num] })
+                    # the new house itself can be copied by a neighbor
+                    if bis_st == st_idx and abs(k - j) == 1 and home.num == "blank":
+                        yield Move({ "house": house, "bis": [bis_st, k, num] })
+        elif effect == "landscaper" and streets[st_idx].parks < PARK_MAXES[st_idx]:
+            yield Move({ "house": house, "park": st_idx })
+        elif effect == "pool" and j in POOL_LOCS[st_idx]:
+            yield Move({ "house": house, "pool": [st_idx, POOL_LOCS[st_idx].index(j)] })
+        elif effect == "agent":
+            for col, max_agents in enumerate(AGENT_MAXES):
+                if self.player_st.agents[col] < max_agents:
+                    yield Move({ "house": house, "agent": col })
+
+    def _roundabout_moves(self) -> Iterator[Move]:
+        '''
+        Yields a roundabout on each blank home, with each card built anywhere
+        else in that street, since the roundabout restarts the numbering.
+        '''
+        if self.player_st.roundabouts >= MAX_ROUNDABOUTS:
+            return
+        for st_idx, street in enumerate(self.player_st.streets):
+            blanks = [k for k, home in enumerate(street.homes_view) if home.num == "blank"]
+            for k in blanks:
+                for ccard in self.game_st.ccards:
+                    for j in blanks:
+                        if j != k:
+                            yield Move({ "house": [st_idx, j, ccard.num], "roundabout": [st_idx, k] })
+
+    def _select_child(self, visits: List[int], totals: List[float], iteration: int) -> int:
+        '''
+        UCB1, visiting every child once first.
+        '''
+        for child, child_visits in enumerate(visits):
+            if child_visits == 0:
+                return child
+        # scores span tens of points, so explore on the same scale
+        exploration = 10.0
+        return max(range(len(visits)), key=lambda i: totals[i] / visits[i] +
+            exploration * math.sqrt(math.log(iteration) / visits[i]))
+
+    def _rollout(self, player_state: PlayerState) -> float:
+        '''
+        Play rollout_depth random rounds from player_state, then score it.
+        '''
+        player_state = player_state.clone()
+        # the rounds draw from the deck without putting cards back, and from
+        # the whole reshuffled deck once it runs out
+        drawn = self.rng.sample(self._future_cards, min(len(self._future_cards), NUM_CCS * self._rollout_depth))
+        for round_idx in range(self._rollout_depth):
+            if player_state.is_game_over():
+                break
+            ccards = drawn[round_idx * NUM_CCS:(round_idx + 1) * NUM_CCS]
+            if len(ccards) < NUM_CCS:
+                ccards = self.rng.sample(CONSTRUCTION_CARDS, NUM_CCS)
+            self._play_random_card(player_state, ccards)
+        return self._evaluate(player_state)
+
+    def _play_random_card(self, player_state: PlayerState, ccards: List[List]) -> None:
+        '''
+        Build a random card in a random legal home, and use its effect if it's
+        a park or a pool. Uses a refusal if nothing fits.
+        '''
+        options = []
+        for num, effect in ccards:
+            for st_idx, street in enumerate(player_state.streets):
+                for j in mask_to_indices(street.placement_mask(num)):
+                    options.append((st_idx, j, num, effect))
+        if not options:
+            player_state.refusals += 1
+            return
+
+        st_idx, j, num, effect = self.rng.choice(options)
+        street = player_state.streets[st_idx]
+        street.homes[j].num = num
+        if effect == "landscaper" and street.parks < PARK_MAXES[st_idx]:
+            street.parks += 1
+        elif effect == "pool" and j in POOL_LOCS[st_idx]:
+            pools = list(street.pools)
+            pools[POOL_LOCS[st_idx].index(j)] = True
+            street.pools = pools
+
+    def _evaluate(self, player_state: PlayerState) -> float:
+        key = player_state.zobrist_hash()
+        score = self._scores.get(key)
+        if score is None:
+            score = player_state.calculate_score([])
+            self._scores.put(key, score)
+        return score
@@ -1,3 +1,5 @@
+import random
+from typing import *
 from game_state import *
 from player_state import *
 from . import MoveGenerator
@@ -6,28 +8,24 @@ class SmartMoveGenerator(MoveGenerator):
     '''
     Makes a smart move.
     '''
-    def __init__(self, game_state: GameState, player_state: PlayerState) -> None:
-        super().__init__(game_state, player_state)
+    def __init__(self, game_state: GameState, player_state: PlayerState, rng: Optional[random.Random]=None,
+            remaining_cards: Optional[List[List]]=None) -> None:
+        super().__init__(game_state, player_state, rng, remaining_cards)
 
     def generate_move(self) -> PlayerState:
         '''
         Returns a new PlayerState with a new house placed, or a refusal used.
         '''
-        new_player_st = PlayerState(self.player_st.to_dict())
+        new_player_st = self.player_st.clone()
         for i in range(len(new_player_st.streets)):
             street = new_player_st.streets[i]
             for j in range(len(street.homes)):
                 if street.homes[j].num == "blank":
                     # try to play each of the construction cards
                     for ccard in self.game_st.ccards:
-                        try:
-                            # try setting home with the new number
-                            street.try_place_new_home(j, ccard.num)
-                        except StreetException:
-                            # change home number back to "blank"
-                            street.try_place_new_home(j, "blank")
-                        else:
-                            # then, we were able to place the home
+                        if street.can_place_home(j, ccard.num):
+                            # then, we are able to place the home
+                            street.homes[j].num = ccard.num
                             return new_player_st
         # if we get here, we weren't able to place a home
         new_player_st.refusals += 1
@@ -0,0 +1,48 @@
+import threading
+from collections import OrderedDict
+from typing import *
+
+class TranspositionTable():
+    '''
+    A bounded cache of values found for PlayerStates, keyed by their Zobrist
+    hash, so a search can reuse them across branches that reach the same
+    state, and across turns. Once full, the least recently used entry is
+    dropped. Every access takes a lock, so local players searching in other
+    threads can share one table.
+    '''
+    def __init__(self, max_size: int=100000) -> None:
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: int, default=None):
+        '''
+        Returns the value stored for key, or default.
+        '''
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: int, value) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key: int) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1 +1,3 @@
-from .network_adapter import NetworkAdapter
\ No newline at end of file
+from .codec import JsonCodec, BinaryCodec, CODECS
+from .network_adapter import NetworkAdapter
+from .async_network_adapter import AsyncNetworkAdapter
\ No newline at end of file
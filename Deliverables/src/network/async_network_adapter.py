@@ -0,0 +1,90 @@
+import asyncio
+from typing import *
+
+from exception import PlayerConnectionException, PlayerTimeoutException
+from constants import MAX_FRAME_SIZE, JSON_ENCODING
+from .codec import CODECS, FRAME_HEADER
+
+class AsyncNetworkAdapter():
+    '''
+    The asyncio counterpart of NetworkAdapter: messages framed and encoded
+    by a codec over an asyncio StreamReader and StreamWriter, newline-delimited
+    JSON until another encoding is negotiated.
+    '''
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+            max_frame_size: int=MAX_FRAME_SIZE):
+        self._reader = reader
+        self._writer = writer
+        self._codec = CODECS[JSON_ENCODING]
+        # newline-delimited lines are capped by the reader's own limit
+        self._max_frame_size = max_frame_size
+
+    @property
+    def encoding(self) -> str:
+        return self._codec.name
+
+    def set_encoding(self, encoding: str) -> None:
+        self._codec = CODECS[encoding]
+
+    async def send(self, msg, timeout: Optional[float]=None) -> None:
+        '''
+        Sends msg. Raises a PlayerTimeoutException if it isn't all sent within
+        timeout seconds, e.g. because the player stopped reading.
+        '''
+        try:
+            self._writer.write(self._codec.frame(msg))
+            await asyncio.wait_for(self._writer.drain(), timeout)
+        except asyncio.TimeoutError:
+            raise PlayerTimeoutException()
+        except ConnectionError:
+            raise PlayerConnectionException()
+
+    async def recv(self, timeout: Optional[float]=None):
+        '''
+        Returns the next message. Raises a PlayerTimeoutException if it
+        hasn't all arrived within timeout seconds.
+        '''
+        read = self._read_length_prefixed() if self._codec.length_prefixed else self._read_line()
+        try:
+            payload = await asyncio.wait_for(read, timeout)
+        except asyncio.TimeoutError:
+            raise PlayerTimeoutException()
+        # raised for lines longer than the reader's limit
+        except (ValueError, ConnectionError):
+            raise PlayerConnectionException()
+
+        try:
+            return self._codec.decode(memoryview(payload))
+        except ValueError:
+            raise PlayerConnectionException("Player sent an invalid message.")
+
+    async def _read_line(self) -> bytes:
+        line = await self._reader.readline()
+        # readline() returns a partial line, or nothing, once the connection is closed
+        if not line.endswith(b"\n"):
+            raise PlayerConnectionException()
+        return line[:-1]
+
+    async def _read_length_prefixed(self) -> bytes:
+        try:
+            length, = FRAME_HEADER.unpack(await self._reader.readexactly(FRAME_HEADER.size))
+            if length > self._max_frame_size:
+                raise PlayerConnectionException(f"Message is longer than {self._max_frame_size} bytes.")
+            return await self._reader.readexactly(length)
+        # the connection closed partway through the message
+        except asyncio.IncompleteReadError:
+            raise PlayerConnectionException()
+
+    def at_eof(self) -> bool:
+        '''
+        Returns True if the other end closed the connection and every message
+        it sent has been read.
+        '''
+        return self._reader.at_eof()
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
\ No newline at end of file
@@ -0,0 +1,106 @@
+import json
+import struct
+from typing import *
+
+from player_state import CompactPlayerState, PACKED_SIZE
+from exception import WelcomeToException
+from constants import JSON_ENCODING, BINARY_ENCODING
+
+ENCODING = "utf-8"
+
+class JsonCodec():
+    '''
+    Messages as JSON text, one per line.
+    '''
+    name = JSON_ENCODING
+    # frames end with a newline, rather than starting with their length
+    length_prefixed = False
+
+    def encode(self, msg) -> bytes:
+        return json.dumps(msg).encode(ENCODING)
+
+    def frame(self, msg) -> bytes:
+        return f"{ json.dumps(msg) }\n".encode(ENCODING)
+
+    def decode(self, payload: memoryview):
+        return json.loads(str(payload, ENCODING))
+
+
+# each binary frame starts with the length of the rest of it
+FRAME_HEADER = struct.Struct(">I")
+_PS_KEYS = set(["agents", "city-plan-score", "refusals", "streets", "temps"])
+
+class BinaryCodec():
+    '''
+    Messages with their PlayerStates in the fixed layout of
+    CompactPlayerState.to_bytes(), each frame prefixed with its length. A
+    payload is the number of packed PlayerStates, then each one after the
+    message key it was under ("" for a message that is a PlayerState), then
+    the rest of the message as JSON. Only the format of a PlayerState is
+    checked when it is packed or unpacked, so one that breaks the rules still
+    reaches the receiver, which checks it as usual.
+    '''
+    name = BINARY_ENCODING
+    length_prefixed = True
+
+    def encode(self, msg) -> bytes:
+        packed = []
+        if type(msg) == dict:
+            if self._pack_player_state(msg, "", packed):
+                return self._payload(packed, b"")
+            rest = {}
+            for key, value in msg.items():
+                if not (type(value) == dict and self._pack_player_state(value, key, packed)):
+                    rest[key] = value
+            msg = rest
+        return self._payload(packed, json.dumps(msg).encode(ENCODING))
+
+    def frame(self, msg) -> bytes:
+        payload = self.encode(msg)
+        return FRAME_HEADER.pack(len(payload)) + payload
+
+    def _pack_player_state(self, value: Dict, key: str, packed: List[bytes]) -> bool:
+        '''
+        Adds value to packed, after key, if it is a well-formed PlayerState.
+        Returns True if it was.
+        '''
+        if value.keys() != _PS_KEYS or len(packed) == 255:
+            return False
+        try:
+            data = CompactPlayerState(value, check_rules=False).to_bytes()
+        except (WelcomeToException, struct.error, OverflowError):
+            return False
+        encoded_key = key.encode(ENCODING)
+        if len(encoded_key) > 255:
+            return False
+        packed.append(bytes((len(encoded_key),)) + encoded_key + data)
+        return True
+
+    def _payload(self, packed: List[bytes], json_data: bytes) -> bytes:
+        return b"".join([bytes((len(packed),))] + packed + [json_data])
+
+    def decode(self, payload: memoryview):
+        try:
+            states, pos = {}, 1
+            for _ in range(payload[0]):
+                key_end = pos + 1 + payload[pos]
+                key = str(payload[pos + 1:key_end], ENCODING)
+                data = payload[key_end:key_end + PACKED_SIZE]
+                states[key] = CompactPlayerState.from_bytes(data, check_rules=False).to_dict()
+                pos = key_end + PACKED_SIZE
+        except (IndexError, UnicodeDecodeError, WelcomeToException) as err:
+            raise ValueError(f"Invalid binary message: {err}")
+
+        if "" in states:
+            if len(states) > 1 or pos != len(payload):
+                raise ValueError("Invalid binary message: a packed message must be the whole message.")
+            return states[""]
+        msg = json.loads(str(payload[pos:], ENCODING))
+        if states:
+            if type(msg) != dict or any(key in msg for key in states):
+                raise ValueError("Invalid binary message: packed states must go into a dictionary.")
+            msg.update(states)
+        return msg
+
+
+CODECS = { codec.name: codec for codec in [JsonCodec(), BinaryCodec()] }
@@ -1,36 +1,150 @@
 import socket
-import json
+import time
+from typing import *
 
-from exception import PlayerConnectionException
+from exception import PlayerConnectionException, PlayerTimeoutException
+from constants import MAX_FRAME_SIZE, JSON_ENCODING
+from .codec import CODECS, FRAME_HEADER
 
-ENCODING = "utf-8"
+# the receive buffer starts this big, and doubles as longer messages arrive
+INITIAL_BUFFER_SIZE = 8192
 
 class NetworkAdapter():
-    def __init__(self, sock: socket):
+    '''
+    Messages over a socket, framed and encoded by a codec: newline-delimited
+    JSON until another encoding is negotiated. Messages are received into one
+    reusable buffer: bytes are read straight into its free space, only newly
+    received bytes are scanned for the newline, and messages already buffered
+    are returned without reading the socket again.
+    '''
+    def __init__(self, sock: socket, max_frame_size: int=MAX_FRAME_SIZE):
         self._sock = sock
-        self._data = b""
+        self._codec = CODECS[JSON_ENCODING]
+        self._max_frame_size = max_frame_size
+        # room for the largest frame and its newline or header
+        self._capacity = max_frame_size + FRAME_HEADER.size
+        self._buf = bytearray(min(INITIAL_BUFFER_SIZE, self._capacity))
+        self._view = memoryview(self._buf)
+        # _buf[_start:_end] is received but not yet returned, and has no
+        # newline before _scanned
+        self._start, self._end, self._scanned = 0, 0, 0
 
-    def send(self, msg: str):
-        self._sock.sendall(f"{ json.dumps(msg) }\n".encode())
+    @property
+    def encoding(self) -> str:
+        return self._codec.name
 
-    def recv(self) -> str:
-        curr_data, data_lst = b"", []
-        while b"\n" not in curr_data:
-            curr_data = self._sock.recv(8192)
-            # socket module docs state that a recv() that returns zero 
+    def set_encoding(self, encoding: str) -> None:
+        '''
+        Sends and receives every later message with the given encoding.
+        Messages already buffered are decoded with it too.
+        '''
+        self._codec = CODECS[encoding]
+        self._scanned = self._start
+
+    def send(self, msg, timeout: Optional[float]=None) -> None:
+        '''
+        Sends msg. Raises a PlayerTimeoutException if it isn't all sent within
+        timeout seconds, e.g. because the player stopped reading.
+        '''
+        frame = self._codec.frame(msg)
+        if timeout is not None:
+            if timeout <= 0:
+                raise PlayerTimeoutException()
+            self._sock.settimeout(timeout)
+        try:
+            self._sock.sendall(frame)
+        except socket.timeout:
+            raise PlayerTimeoutException()
+        except ConnectionError:
+            raise PlayerConnectionException()
+        finally:
+            if timeout is not None:
+                self._sock.settimeout(None)
+
+    def recv(self, timeout: Optional[float]=None):
+        '''
+        Returns the next message. Raises a PlayerTimeoutException if it
+        hasn't all arrived within timeout seconds.
+        '''
+        frame = self._find_frame()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while frame is None:
+            if self._end == len(self._buf):
+                self._make_room()
+            num_bytes = self._recv_into(deadline)
+            # socket module docs state that a recv() that returns zero
             # bytes means the connection was closed
-            if len(curr_data) == 0:
+            if num_bytes == 0:
                 raise PlayerConnectionException()
-            data_lst.append(curr_data)
+            self._end += num_bytes
+            frame = self._find_frame()
+
+        payload_start, payload_end, next_start = frame
+        payload = self._view[payload_start:payload_end]
+        self._start = self._scanned = next_start
+        if self._start == self._end:
+            self._start, self._end, self._scanned = 0, 0, 0
+
+        try:
+            return self._codec.decode(payload)
+        except ValueError:
+            raise PlayerConnectionException("Player sent an invalid message.")
+
+    def _recv_into(self, deadline: Optional[float]) -> int:
+        if deadline is None:
+            return self._sock.recv_into(self._view[self._end:])
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise PlayerTimeoutException()
+        self._sock.settimeout(remaining)
+        try:
+            return self._sock.recv_into(self._view[self._end:])
+        except socket.timeout:
+            raise PlayerTimeoutException()
+        finally:
+            self._sock.settimeout(None)
+
+    def _find_frame(self) -> Optional[Tuple[int, int, int]]:
+        '''
+        Returns where the first buffered message's payload starts and ends,
+        and where the next message starts, or None if it hasn't all arrived.
+        '''
+        if self._codec.length_prefixed:
+            if self._end - self._start < FRAME_HEADER.size:
+                return None
+            length, = FRAME_HEADER.unpack_from(self._buf, self._start)
+            self._check_frame_size(length)
+            payload_start = self._start + FRAME_HEADER.size
+            if self._end - payload_start < length:
+                return None
+            return payload_start, payload_start + length, payload_start + length
+
+        newline = self._buf.find(b"\n", self._scanned, self._end)
+        if newline == -1:
+            self._scanned = self._end
+            self._check_frame_size(self._end - self._start)
+            return None
+        return self._start, newline, newline + 1
+
+    def _check_frame_size(self, length: int) -> None:
+        if length > self._max_frame_size:
+            raise PlayerConnectionException(f"Message is longer than {self._max_frame_size} bytes.")
 
-        self._data += b"".join(data_lst)
-        split_data_lst = self._data.split(b"\n", maxsplit=1)
-        request = split_data_lst[0].decode(ENCODING).strip()
-        # if we somehow have >2 valid json objects, keep the remaining
-        # so we can access them in the future
-        self._data = split_data_lst[1]
-        
-        return json.loads(request)
+    def _make_room(self) -> None:
+        '''
+        Frees space at the end of the full buffer: moves the unread message
+        to the front, or doubles the buffer if it takes up all of it.
+        '''
+        unread = self._end - self._start
+        if self._start > 0:
+            self._view[:unread] = self._view[self._start:self._end]
+        else:
+            new_buf = bytearray(min(2 * len(self._buf), self._capacity))
+            new_buf[:unread] = self._view[:unread]
+            self._view.release()
+            self._buf, self._view = new_buf, memoryview(new_buf)
+        self._scanned -= self._start
+        self._start, self._end = 0, unread
 
     def close(self) -> None:
-        self._sock.close()
\ No newline at end of file
+        self._sock.close()
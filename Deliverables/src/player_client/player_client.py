@@ -1,19 +1,31 @@
 import socket
+from typing import *
 
-from exception import PlayerClientException
+from exception import PlayerClientException, MoveException
 from game_state import GameState
 from player_state import PlayerState
-from moves import MoveGenerator
+from moves import MoveGenerator, MoveValidator
 from network import NetworkAdapter
+from constants import FULL_PROTOCOL, DELTA_PROTOCOL, JSON_ENCODING
 
 class PlayerClient():
-    def __init__(self, network_config: dict, Player: MoveGenerator) -> None:
+    def __init__(self, network_config: dict, Player: MoveGenerator, protocols: List[str]=[FULL_PROTOCOL],
+            encodings: List[str]=[JSON_ENCODING]) -> None:
         if set(network_config.keys()) != set(["host", "port"]):
             return PlayerClientException(f"Received {network_config}\n\n, but expected a dictionary \
                     with keys 'host' and 'port-number'.")
         self._host = network_config["host"]
         self._port = network_config["port"]
         self._Player = Player
+        # protocols and encodings to offer the server, in order of preference.
+        # Offering only the full protocol over JSON signs up the legacy way,
+        # with just the name
+        self._protocols = protocols
+        self._encodings = encodings
+        self._protocol = FULL_PROTOCOL
+        # the current states, kept between turns for the delta protocol
+        self._gs_dict = None
+        self._player_state = None
         self._create_tcp_connection()
 
     def _create_tcp_connection(self):
@@ -21,16 +33,44 @@ class PlayerClient():
         sock.connect((self._host, self._port))
         self._network = NetworkAdapter(sock)
 
+    @property
+    def protocol(self) -> str:
+        return self._protocol
+
+    @property
+    def encoding(self) -> str:
+        return self._network.encoding
+
+    def _sign_up(self, name: str) -> None:
+        if self._protocols == [FULL_PROTOCOL] and self._encodings == [JSON_ENCODING]:
+            self._network.send(name)
+            return
+
+        sign_up = { "name": name, "protocols": self._protocols }
+        if self._encodings != [JSON_ENCODING]:
+            sign_up["encodings"] = self._encodings
+        self._network.send(sign_up)
+        response = self._network.recv()
+        if (type(response) != dict or response.get("protocol") not in self._protocols or
+                response.get("encoding", JSON_ENCODING) not in self._encodings + [JSON_ENCODING]):
+            raise PlayerClientException(f"Received {response}\n\n but expected one of the \
+                    protocols {self._protocols} and encodings {self._encodings}.")
+        self._protocol = response["protocol"]
+        self._network.set_encoding(response.get("encoding", JSON_ENCODING))
+
     def play_game(self) -> None:
         playing_keys = set(["game-state", "player-state"])
+        delta_keys = set(["game-state-delta"])
         game_over_keys = set(["game-over"])
-        self._network.send("team23")
+        self._sign_up("team23")
 
         while True:
             request = self._network.recv()
             req_keys = set(request.keys()) if type(request) == dict else None
             if req_keys == playing_keys:
                 self._play_move(request)
+            elif req_keys == delta_keys and self._gs_dict is not None:
+                self._play_delta_move(request)
             elif req_keys == game_over_keys:
                 self._end_game()
                 break
@@ -39,10 +79,36 @@ class PlayerClient():
                         with keys ('game-state', 'player-state'), or 'game-over'.")
 
     def _play_move(self, request: dict) -> None:
-        game_state = GameState(request["game-state"])
-        player_state = PlayerState(request["player-state"])
-        new_player_state = self._Player(game_state, player_state).generate_move()
-        self._network.send(new_player_state.to_dict())
+        self._gs_dict = request["game-state"]
+        self._player_state = PlayerState(request["player-state"])
+        self._send_move(GameState(self._gs_dict))
+
+    def _play_delta_move(self, request: dict) -> None:
+        '''
+        Only the changed GameState fields are sent, and the PlayerState is the
+        one this client sent back last turn.
+        '''
+        self._gs_dict.update(request["game-state-delta"])
+        self._send_move(GameState(self._gs_dict))
+
+    def _send_move(self, game_state: GameState) -> None:
+        '''
+        With the delta protocol, reply with only the Move that was made. If no
+        valid Move can be made from it, send the whole PlayerState like a
+        legacy client, and let the server decide.
+        '''
+        new_player_state = self._Player(game_state, self._player_state).generate_move()
+        response = new_player_state.to_dict()
+        if self._protocol == DELTA_PROTOCOL:
+            try:
+                validator = MoveValidator(game_state, self._player_state, new_player_state)
+                validator.validate_move()
+                response = { "move": validator.to_move().to_dict() }
+            except MoveException:
+                pass
+
+        self._player_state = new_player_state
+        self._network.send(response)
 
     def _end_game(self):
         self._network.send("ack")
@@ -1,3 +1,4 @@
 from .home import *
 from .street import *
-from .player_state import *
\ No newline at end of file
+from .player_state import *
+from .compact_player_state import *
\ No newline at end of file
@@ -0,0 +1,453 @@
+import json
+import struct
+from array import array
+from typing import *
+from helpers import *
+from exception import PlayerStateException, StreetException, HomeException, my_assert
+from constants import EMPTY_PS, MAX_REFUSALS, AGENT_MAXES, MAX_TEMPS, TEMP_SCORES, MAX_ROUNDABOUTS
+from constants import PARK_MAXES, POOL_LOCS, STREET_LENS
+from constants import ESTATE_SCORES, POOL_SCORES, BIS_SCORES, REFUSAL_SCORES, ROUNDABOUT_SCORES
+
+# house codes stored in the houses buffer. naturals 0-17 are stored as-is.
+BLANK = -1
+ROUNDABOUT = -2
+# "blank" city plan score
+BLANK_SCORE = -1
+
+NUM_HOMES = sum(STREET_LENS)
+# offset of the first home of each street in the home buffers
+HOME_OFFSETS = [sum(STREET_LENS[:i]) for i in range(len(STREET_LENS))]
+# each street has one more fence slot than homes; fence k is left of home k
+FENCE_OFFSETS = [HOME_OFFSETS[i] + i for i in range(len(STREET_LENS))]
+NUM_FENCES = NUM_HOMES + len(STREET_LENS)
+# to_bytes() lays out the houses, bis, used-in-plan, fences, parks, pools and
+# agents buffers in that order, then the city plan scores, temps and refusals
+_PACKED_FORMAT = struct.Struct(f">{NUM_HOMES}s{NUM_HOMES}s{NUM_HOMES}s{NUM_FENCES}s"
+    f"{len(STREET_LENS)}s{len(STREET_LENS) * 3}s{len(AGENT_MAXES)}s3hBB")
+PACKED_SIZE = _PACKED_FORMAT.size
+
+
+class CompactPlayerState():
+    '''
+    An array-backed PlayerState. Holds the same information as a PlayerState
+    in a handful of fixed-size buffers, so it can be copied, checked and scored
+    without building any Street or Home objects.
+    '''
+    def __init__(self, ps_dict: Dict=EMPTY_PS, check_rules: bool=True) -> None:
+        ps_keys = set(["agents", "city-plan-score", "refusals", "streets", "temps"])
+        my_assert(type(ps_dict) == dict and set(ps_dict.keys()) == ps_keys,
+            PlayerStateException,
+            f"A player-state must be a dictionary containing only these keys: {ps_keys}")
+
+        self._houses = array("b", [BLANK] * NUM_HOMES)
+        self._bis = bytearray(NUM_HOMES)
+        self._in_plan = bytearray(NUM_HOMES)
+        self._fences = bytearray(NUM_FENCES)
+        self._parks = bytearray(len(STREET_LENS))
+        self._pools = bytearray(len(STREET_LENS) * 3)
+        self._agents = bytearray(len(AGENT_MAXES))
+        self._cp_scores = array("i", [BLANK_SCORE] * 3)
+        self._temps = 0
+        self._refusals = 0
+
+        self._load_agents(ps_dict["agents"])
+        self._load_cp_scores(ps_dict["city-plan-score"])
+        self._load_refusals(ps_dict["refusals"])
+        self._load_temps(ps_dict["temps"])
+        self._load_streets(ps_dict["streets"])
+        # without check_rules only the format is checked, for a state that
+        # is checked elsewhere, e.g. one being sent over the network
+        if check_rules:
+            self.check_rule_violations()
+
+    @classmethod
+    def from_player_state(cls, player_state) -> "CompactPlayerState":
+        return cls(player_state.to_dict())
+
+    def to_player_state(self):
+        from . import PlayerState
+        # this state was checked when it was built, and to_dict() makes new lists
+        return PlayerState.from_trusted(self.to_dict())
+
+    def copy(self) -> "CompactPlayerState":
+        '''
+        Returns a copy of this CompactPlayerState. Only the buffers are copied.
+        '''
+        new_ps = CompactPlayerState.__new__(CompactPlayerState)
+        new_ps._houses = array("b", self._houses)
+        new_ps._bis = bytearray(self._bis)
+        new_ps._in_plan = bytearray(self._in_plan)
+        new_ps._fences = bytearray(self._fences)
+        new_ps._parks = bytearray(self._parks)
+        new_ps._pools = bytearray(self._pools)
+        new_ps._agents = bytearray(self._agents)
+        new_ps._cp_scores = array("i", self._cp_scores)
+        new_ps._temps = self._temps
+        new_ps._refusals = self._refusals
+        return new_ps
+
+    def to_bytes(self) -> bytes:
+        '''
+        Returns the buffers packed into PACKED_SIZE bytes.
+        '''
+        return _PACKED_FORMAT.pack(self._houses.tobytes(), self._bis, self._in_plan, self._fences,
+            self._parks, self._pools, self._agents, *self._cp_scores, self._temps, self._refusals)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, check_rules: bool=True) -> "CompactPlayerState":
+        '''
+        Builds a CompactPlayerState from to_bytes() output, checking it just
+        like the constructor checks a dictionary.
+        '''
+        my_assert(len(data) == PACKED_SIZE,
+            PlayerStateException,
+            f"A packed player-state must be {PACKED_SIZE} bytes.")
+        houses, bis, in_plan, fences, parks, pools, agents, *cp_scores, temps, refusals = _PACKED_FORMAT.unpack(data)
+        new_ps = cls.__new__(cls)
+        new_ps._houses = array("b", houses)
+        new_ps._bis = bytearray(bis)
+        new_ps._in_plan = bytearray(in_plan)
+        new_ps._fences = bytearray(fences)
+        new_ps._parks = bytearray(parks)
+        new_ps._pools = bytearray(pools)
+        new_ps._agents = bytearray(agents)
+        new_ps._cp_scores = array("i", cp_scores)
+        new_ps._temps = temps
+        new_ps._refusals = refusals
+        new_ps._check_packed()
+        if check_rules:
+            new_ps.check_rule_violations()
+        return new_ps
+
+    def _check_packed(self) -> None:
+        '''
+        Checks what the _load methods check for a dictionary: every value is
+        in range, and only built houses are bis or used in a plan.
+        '''
+        my_assert(all(ROUNDABOUT <= num <= 17 for num in self._houses) and
+                max(self._bis + self._in_plan + self._fences + self._pools) <= 1 and
+                all(num >= 0 or not (bis or in_plan) for num, bis, in_plan in zip(self._houses, self._bis, self._in_plan)) and
+                all(self._fences[FENCE_OFFSETS[i]] and self._fences[FENCE_OFFSETS[i] + STREET_LENS[i]] for i in range(len(STREET_LENS))),
+            HomeException,
+            "A packed player-state has a house or flag out of range.")
+        my_assert(all(agent <= AGENT_MAXES[i] for i, agent in enumerate(self._agents)) and
+                all(score >= BLANK_SCORE for score in self._cp_scores) and
+                self._temps <= MAX_TEMPS and self._refusals <= MAX_REFUSALS,
+            PlayerStateException,
+            "A packed player-state has a count out of range.")
+
+    def _load_agents(self, agents: List[int]) -> None:
+        my_assert(check_valid_lst(agents, 6, check_nat) and all(a <= AGENT_MAXES[i] for i, a in enumerate(agents)),
+            PlayerStateException,
+            f"Given {agents}, but agents must be a list of 6 naturals.")
+        self._agents[:] = bytes(agents)
+
+    def _load_cp_scores(self, cp_scores: List) -> None:
+        my_assert(check_valid_lst(cp_scores, 3, lambda x: (check_nat(x) or x == "blank")),
+            PlayerStateException,
+            f"Given {cp_scores}, but city_plan_scores must be a list containing naturals or 'blank'.")
+        for i, score in enumerate(cp_scores):
+            self._cp_scores[i] = BLANK_SCORE if score == "blank" else score
+
+    def _load_refusals(self, refusals: int) -> None:
+        my_assert(check_nat(refusals) and refusals <= MAX_REFUSALS,
+            PlayerStateException,
+            f"Given {refusals}, but refusals must be either 0, 1, 2, or 3.")
+        self._refusals = refusals
+
+    def _load_temps(self, temps: int) -> None:
+        my_assert(check_nat(temps) and temps <= MAX_TEMPS,
+            PlayerStateException,
+            f"Given {temps}, but temps must be an integer between 0 and 11.")
+        self._temps = temps
+
+    def _load_streets(self, streets: List[Dict]) -> None:
+        my_assert(check_valid_lst(streets, 3, lambda x: type(x) == dict),
+            PlayerStateException,
+            f"Given {streets}, but streets must be a list 3 dictionaries.")
+        st_keys = set(["homes", "parks", "pools"])
+        for st_idx, st_dict in enumerate(streets):
+            my_assert(set(st_dict.keys()) == st_keys,
+                StreetException,
+                f"A street must be a dictionary containing only these keys: {st_keys}")
+            self._load_homes(st_idx, st_dict["homes"])
+            self._load_pools(st_idx, st_dict["pools"])
+            # parks are checked against the homes in check_rule_violations
+            my_assert(check_nat(st_dict["parks"]),
+                StreetException,
+                f"Given {st_dict['parks']}, but parks must be a natural.")
+            self._parks[st_idx] = min(st_dict["parks"], 255)
+
+    def _load_homes(self, st_idx: int, homes: List) -> None:
+        st_len = STREET_LENS[st_idx]
+        my_assert(type(homes) == list and len(homes) == st_len + 1 and
+                check_valid_lst(homes[2:], st_len - 1, lambda x: type(x) == list and len(x) == 3),
+            StreetException,
+            f"homes for row {st_idx} must be a list with {st_len} homes.")
+
+        h_off, f_off = HOME_OFFSETS[st_idx], FENCE_OFFSETS[st_idx]
+        self._fences[f_off] = 1
+        self._fences[f_off + st_len] = 1
+        self._load_home(h_off, homes[0], homes[1])
+        for i, (fence, house, in_plan) in enumerate(homes[2:], 1):
+            my_assert(type(fence) == bool,
+                HomeException,
+                f"Given {fence}, but fence-or-not must be a boolean.")
+            self._fences[f_off + i] = fence
+            self._load_home(h_off + i, house, in_plan)
+
+    def _load_home(self, idx: int, house: Union[int, str, List], in_plan: bool) -> None:
+        if type(house) == list and len(house) == 2 and check_nat(house[0]) and house[0] <= 17 and house[1] == "bis":
+            self._houses[idx], self._bis[idx] = house[0], 1
+        elif check_nat(house) and house <= 17:
+            self._houses[idx] = house
+        elif house in ["blank", "roundabout"]:
+            self._houses[idx] = BLANK if house == "blank" else ROUNDABOUT
+        else:
+            raise HomeException(f"Given {house}, but house must be one of:\n1. natural, 0-17 \n2. 'blank'\n3. [natural, 'bis']\n4. 'roundabout' (with fences on both sides)")
+
+        my_assert(type(in_plan) == bool and (self._houses[idx] >= 0 or not in_plan),
+            HomeException,
+            f"Given {in_plan}, but used-in-plan must be a boolean.")
+        self._in_plan[idx] = in_plan
+
+    def _load_pools(self, st_idx: int, pools: List[bool]) -> None:
+        my_assert(check_valid_lst(pools, 3, lambda x: type(x) == bool),
+            StreetException,
+            f"Given {pools}, but pools must be a list of 3 boolean values")
+        self._pools[st_idx * 3:st_idx * 3 + 3] = bytes(pools)
+
+    def check_rule_violations(self) -> None:
+        '''
+        Check that the buffers don't violate any game rules. These are the
+        same rules enforced by PlayerState, Street and Home.
+        '''
+        for st_idx in range(len(STREET_LENS)):
+            self._check_street(st_idx)
+
+        my_assert(self.roundabouts <= MAX_ROUNDABOUTS,
+            PlayerStateException,
+            f"You can only play two roundabouts in a game.")
+
+    def _check_street(self, st_idx: int) -> None:
+        h_off, f_off, st_len = HOME_OFFSETS[st_idx], FENCE_OFFSETS[st_idx], STREET_LENS[st_idx]
+        houses, bis, fences = self._houses, self._bis, self._fences
+
+        prev_non_bis = -1
+        bis_anchor, bis_obligation = None, None
+        non_bis_ct = 0
+        for i in range(st_len):
+            num = houses[h_off + i]
+            if num == ROUNDABOUT:
+                my_assert(fences[f_off + i] and fences[f_off + i + 1],
+                    HomeException,
+                    f"Given roundabout, but a roundabout must have fences on both sides.")
+                prev_non_bis = -1
+            elif num != BLANK and not bis[h_off + i]:
+                my_assert(num > prev_non_bis,
+                    StreetException,
+                    f"Violation in street {st_idx + 1}: non-bis house numbers must be strictly increasing.")
+                prev_non_bis = num
+                non_bis_ct += 1
+
+            # same anchor/obligation walk as Street._check_homes_bis
+            if bis[h_off + i]:
+                if bis_anchor != num:
+                    bis_obligation = num
+                left_ok = i > 0 and houses[h_off + i - 1] == num and not fences[f_off + i]
+                right_ok = i < st_len - 1 and houses[h_off + i + 1] == num and not fences[f_off + i + 1]
+                my_assert(left_ok or right_ok,
+                    StreetException,
+                    f"Violation in street {st_idx + 1}: bis must have the same number as an adjacent house.")
+            else:
+                my_assert(bis_obligation is None or num == bis_obligation,
+                    StreetException,
+                    f"Violation in street {st_idx + 1}: bis played next to a house with a different number (or blank).")
+                bis_anchor, bis_obligation = (None, None) if num == BLANK else (num, None)
+
+        my_assert(bis_obligation is None,
+            StreetException,
+            f"Violation in street {st_idx + 1}: bis played next to a house with a different number (or blank).")
+
+        for i, loc in enumerate(POOL_LOCS[st_idx]):
+            if self._pools[st_idx * 3 + i]:
+                my_assert(houses[h_off + loc] >= 0 and not bis[h_off + loc],
+                    StreetException,
+                    f"Violation in street {st_idx + 1}: pool cannot be on a blank, bis, or roundabout house.")
+
+        parks = self._parks[st_idx]
+        my_assert(parks <= PARK_MAXES[st_idx] and parks <= non_bis_ct,
+            StreetException,
+            f"Given {parks}, but parks must be a natural no greater than {min(non_bis_ct, PARK_MAXES[st_idx])}.")
+
+    def house(self, st_idx: int, home_idx: int) -> Union[int, str, List]:
+        '''
+        Returns the house at the given position, in the to_dict() format.
+        '''
+        idx = HOME_OFFSETS[st_idx] + home_idx
+        num = self._houses[idx]
+        if num == BLANK:
+            return "blank"
+        elif num == ROUNDABOUT:
+            return "roundabout"
+        return [num, "bis"] if self._bis[idx] else num
+
+    def can_place_home(self, st_idx: int, home_idx: int, num: int) -> bool:
+        '''
+        Returns True if a non-bis house with number num can be built on the blank
+        home at home_idx without breaking the increasing-order rule.
+        '''
+        h_off, st_len = HOME_OFFSETS[st_idx], STREET_LENS[st_idx]
+        houses, bis = self._houses, self._bis
+        if houses[h_off + home_idx] != BLANK:
+            return False
+
+        for i in range(home_idx - 1, -1, -1):
+            curr = houses[h_off + i]
+            if curr == ROUNDABOUT:
+                break
+            if curr != BLANK and not bis[h_off + i]:
+                if curr >= num:
+                    return False
+                break
+
+        for i in range(home_idx + 1, st_len):
+            curr = houses[h_off + i]
+            if curr == ROUNDABOUT:
+                break
+            if curr != BLANK and not bis[h_off + i]:
+                if curr <= num:
+                    return False
+                break
+
+        return True
+
+    def get_possible_home_locations(self, st_idx: int, num: int) -> List[int]:
+        return [i for i in range(STREET_LENS[st_idx]) if self.can_place_home(st_idx, i, num)]
+
+    def place_home(self, st_idx: int, home_idx: int, num: int) -> None:
+        '''
+        Build a non-bis house with number num on the blank home at home_idx.
+        Raises a StreetException if it breaks a street rule.
+        '''
+        my_assert(self.can_place_home(st_idx, home_idx, num),
+            StreetException,
+            f"Violation in street {st_idx + 1}: cannot place {num} at home {home_idx}.")
+        self._houses[HOME_OFFSETS[st_idx] + home_idx] = num
+
+    @property
+    def agents(self) -> List[int]:
+        return list(self._agents)
+
+    @property
+    def city_plan_score(self) -> List[Union[int, str]]:
+        return [score if score != BLANK_SCORE else "blank" for score in self._cp_scores]
+
+    @property
+    def refusals(self) -> int:
+        return self._refusals
+
+    @refusals.setter
+    def refusals(self, refusals: int) -> None:
+        self._load_refusals(refusals)
+
+    @property
+    def temps(self) -> int:
+        return self._temps
+
+    @temps.setter
+    def temps(self, temps: int) -> None:
+        self._load_temps(temps)
+
+    @property
+    def roundabouts(self) -> int:
+        return self._houses.count(ROUNDABOUT)
+
+    def _estates_count(self, counts: List[int]) -> None:
+        '''
+        Add the estates of every street to counts, indexed by estate size.
+        An estate is a run of built houses between two fences, at most 6 long.
+        '''
+        houses, fences = self._houses, self._fences
+        for st_idx, st_len in enumerate(STREET_LENS):
+            h_off, f_off = HOME_OFFSETS[st_idx], FENCE_OFFSETS[st_idx]
+            start = 0
+            for i in range(st_len):
+                if houses[h_off + i] < 0:
+                    start = None
+                elif fences[f_off + i]:
+                    start = i
+                if start is not None and fences[f_off + i + 1]:
+                    size = i - start + 1
+                    if size <= 6:
+                        counts[size] += 1
+                    start = None
+
+    def calculate_score(self, temps_lst: List[int]) -> int:
+        estates_counts = [0] * 7
+        self._estates_count(estates_counts)
+
+        total_score = 0
+        for st_idx, parks in enumerate(self._parks):
+            total_score += parks * 2 if parks != PARK_MAXES[st_idx] else parks * 4 - 2
+        for size in range(1, 7):
+            total_score += ESTATE_SCORES[size][self._agents[size - 1]] * estates_counts[size]
+
+        total_score += POOL_SCORES[self._pools.count(1)]
+        total_score += sum(score for score in self._cp_scores if score != BLANK_SCORE)
+        total_score += self.temps_score(temps_lst)
+        total_score -= BIS_SCORES[self._bis.count(1)]
+        total_score -= REFUSAL_SCORES[self._refusals]
+        total_score -= ROUNDABOUT_SCORES[self.roundabouts]
+        return total_score
+
+    def temps_score(self, temps_lst: List[int]) -> int:
+        if self._temps == 0:
+            return 0
+        if not temps_lst:
+            return TEMP_SCORES[0]
+
+        sorted_temps_lst = sorted(set(temps_lst) | set([self._temps]), reverse=True)
+        rank = sorted_temps_lst.index(self._temps)
+        return TEMP_SCORES[rank] if rank < 3 else 0
+
+    def is_game_over(self) -> bool:
+        return (self._refusals == MAX_REFUSALS or
+            BLANK not in self._houses or
+            BLANK_SCORE not in self._cp_scores)
+
+    def _street_to_dict(self, st_idx: int) -> Dict:
+        h_off, f_off, st_len = HOME_OFFSETS[st_idx], FENCE_OFFSETS[st_idx], STREET_LENS[st_idx]
+        homes_lst = [self.house(st_idx, 0), bool(self._in_plan[h_off])]
+        for i in range(1, st_len):
+            homes_lst.append([bool(self._fences[f_off + i]), self.house(st_idx, i), bool(self._in_plan[h_off + i])])
+
+        return {
+            "homes": homes_lst,
+            "parks": self._parks[st_idx],
+            "pools": [bool(p) for p in self._pools[st_idx * 3:st_idx * 3 + 3]]
+        }
+
+    def to_dict(self) -> Dict:
+        '''
+        Returns the Dictionary representation of this player state, identical to
+        PlayerState.to_dict().
+        '''
+        return {
+            "agents": list(self._agents),
+            "city-plan-score": self.city_plan_score,
+            "refusals": self._refusals,
+            "streets": [self._street_to_dict(i) for i in range(len(STREET_LENS))],
+            "temps": self._temps
+        }
+
+    def __repr__(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def __eq__(self, other: object) -> bool:
+        return (type(other) == CompactPlayerState and
+            self._houses == other._houses and self._bis == other._bis and
+            self._in_plan == other._in_plan and self._fences == other._fences and
+            self._parks == other._parks and self._pools == other._pools and
+            self._agents == other._agents and self._cp_scores == other._cp_scores and
+            self._temps == other._temps and self._refusals == other._refusals)
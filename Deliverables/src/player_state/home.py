@@ -1,19 +1,47 @@
 import json
 from typing import *
 from helpers import *
-from exception import HomeException, my_assert
+from exception import ValidationResult, Violation, my_check
 
 class Home():
     def __init__(self, home_lst: List) -> None:
-        my_assert(type(home_lst) == list and len(home_lst) == 4,
-            HomeException,
+        self._load(home_lst).raise_if_invalid()
+
+    @classmethod
+    def check(cls, home_lst: List) -> ValidationResult:
+        '''
+        Validate home_lst without raising. Returns a ValidationResult.
+        '''
+        return cls.__new__(cls)._load(home_lst)
+
+    def _load(self, home_lst: List) -> ValidationResult:
+        '''
+        Set this home's fields from home_lst, stopping at the first violation.
+        '''
+        # the Street this home belongs to, and its index in that street.
+        # the owner is told about every change so it can keep its caches current
+        self._owner = None
+        self._idx = None
+        result = my_check(type(home_lst) == list and len(home_lst) == 4,
+            Violation.HOME_FORMAT,
             f"A home must be a list containing four elements.")
-        
+        if not result.ok:
+            return result
+
         fence_left, house, in_plan, fence_right = home_lst
-        self.fence_left = fence_left
-        self.fence_right = fence_right
-        self.house = house
-        self.in_plan = in_plan
+        for fence in [fence_left, fence_right]:
+            result = self._check_fence(fence)
+            if not result.ok:
+                return result
+        self._fence_left, self._fence_right = fence_left, fence_right
+
+        result, self._num, self._is_bis = self._check_house(house)
+        if not result.ok:
+            return result
+
+        result = self._check_in_plan(in_plan)
+        self._in_plan = in_plan
+        return result
 
     def _validate_house(self, house: Union[int, str, List]) -> Tuple[bool, Union[int, str], bool]:
         '''
@@ -50,16 +78,35 @@ class Home():
 
         return True
 
+    def _check_fence(self, fence: bool) -> ValidationResult:
+        return my_check(type(fence) == bool,
+            Violation.FENCE,
+            f"Given {fence}, but fence-or-not must be a boolean.")
+
+    def _check_house(self, house: Union[int, str, List]) -> Tuple[ValidationResult, Union[int, str], bool]:
+        '''
+        Returns the ValidationResult for house, and its num and bis.
+        '''
+        valid_house, num, bis = self._validate_house(house)
+        result = my_check(valid_house,
+            Violation.HOUSE,
+            f"Given {house}, but house must be one of:\n1. natural, 0-17 \n2. 'blank'\n3. [natural, 'bis']\n4. 'roundabout' (with fences on both sides)")
+        return result, num, bis
+
+    def _check_in_plan(self, in_plan: bool) -> ValidationResult:
+        return my_check(self._validate_used_ip(in_plan),
+            Violation.IN_PLAN,
+            f"Given {in_plan}, but used-in-plan must be a boolean.")
+
     @property
     def fence_left(self) -> bool:
         return self._fence_left
 
     @fence_left.setter
     def fence_left(self, fence: bool) -> None:
-        my_assert(type(fence) == bool,
-            HomeException,
-            f"Given {fence}, but fence-or-not must be a boolean.")
-        self._fence_left = fence
+        self._check_fence(fence).raise_if_invalid()
+        old_fence, self._fence_left = self._fence_left, fence
+        self._notify("fence_left", old_fence)
 
     @property
     def fence_right(self) -> bool:
@@ -67,10 +114,9 @@ class Home():
 
     @fence_right.setter
     def fence_right(self, fence: bool) -> None:
-        my_assert(type(fence) == bool,
-            HomeException,
-            f"Given {fence}, but fence-or-not must be a boolean.")
-        self._fence_right = fence
+        self._check_fence(fence).raise_if_invalid()
+        old_fence, self._fence_right = self._fence_right, fence
+        self._notify("fence_right", old_fence)
 
     @property
     def house(self) -> Union[int, str, List]:
@@ -85,10 +131,8 @@ class Home():
 
     @house.setter
     def house(self, house: Union[int, str, List]):
-        valid_house, num, bis = self._validate_house(house)
-        my_assert(valid_house,
-            HomeException,
-            f"Given {house}, but house must be one of:\n1. natural, 0-17 \n2. 'blank'\n3. [natural, 'bis']\n4. 'roundabout' (with fences on both sides)")
+        result, num, bis = self._check_house(house)
+        result.raise_if_invalid()
         self.num, self.is_bis = num, bis
 
     @property
@@ -100,10 +144,11 @@ class Home():
 
     @num.setter
     def num(self, num: Union[int, str]):
-        my_assert((check_nat(num) and num <= 17) or num in ["blank", "roundabout"],
-            HomeException,
-            f"Given {num}, but house must either:\n1. natural, 0-17\n2. 'blank'\n3. 'roundabout'.")
-        self._num = num
+        my_check((check_nat(num) and num <= 17) or num in ["blank", "roundabout"],
+            Violation.HOUSE,
+            f"Given {num}, but house must either:\n1. natural, 0-17\n2. 'blank'\n3. 'roundabout'.").raise_if_invalid()
+        old_num, self._num = self._num, num
+        self._notify("num", old_num)
 
     @property
     def is_bis(self) -> bool:
@@ -114,10 +159,11 @@ class Home():
 
     @is_bis.setter
     def is_bis(self, is_bis: bool) -> None:
-        my_assert(type(is_bis) == bool,
-            HomeException,
-            f"Given {is_bis}, but bis must be a boolean.")
-        self._is_bis = is_bis
+        my_check(type(is_bis) == bool,
+            Violation.HOUSE,
+            f"Given {is_bis}, but bis must be a boolean.").raise_if_invalid()
+        old_is_bis, self._is_bis = self._is_bis, is_bis
+        self._notify("is_bis", old_is_bis)
 
     @property
     def in_plan(self) -> bool:
@@ -128,10 +174,42 @@ class Home():
 
     @in_plan.setter
     def in_plan(self, in_plan) -> None:
-        my_assert(self._validate_used_ip(in_plan),
-            HomeException,
-            f"Given {in_plan}, but used-in-plan must be a boolean.")
-        self._in_plan = in_plan
+        self._check_in_plan(in_plan).raise_if_invalid()
+        old_in_plan, self._in_plan = self._in_plan, in_plan
+        self._notify("in_plan", old_in_plan)
+
+    @classmethod
+    def from_trusted(cls, home_lst: List) -> "Home":
+        '''
+        Builds a home from [fence-left, house, used-in-plan, fence-right]
+        without checking it. Only for homes this engine produced.
+        '''
+        home = cls.__new__(cls)
+        home._owner, home._idx = None, None
+        home._fence_left, house, home._in_plan, home._fence_right = home_lst
+        home._num, home._is_bis = (house[0], True) if type(house) == list else (house, False)
+        return home
+
+    def clone(self) -> "Home":
+        '''
+        Returns a copy of this home, without an owner and without re-validating it.
+        '''
+        home = Home.__new__(Home)
+        home._owner, home._idx = None, None
+        home._fence_left, home._fence_right = self._fence_left, self._fence_right
+        home._num, home._is_bis, home._in_plan = self._num, self._is_bis, self._in_plan
+        return home
+
+    def _set_owner(self, owner, idx: int) -> None:
+        self._owner = owner
+        self._idx = idx
+
+    def _notify(self, field: str, old_val: Union[int, str, bool]) -> None:
+        '''
+        Tell the owning Street that field changed on this home from old_val.
+        '''
+        if self._owner is not None:
+            self._owner._home_changed(self._idx, field, old_val)
 
     def to_list(self) -> List:
         '''
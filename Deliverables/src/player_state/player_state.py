@@ -1,26 +1,74 @@
 import json
 from typing import *
 from helpers import *
-from exception import PlayerStateException, my_assert
+from exception import ValidationResult, Violation, VALID, my_check
 from . import Street
-from collections import defaultdict
-from constants import EMPTY_PS, MAX_REFUSALS, AGENT_MAXES, MAX_TEMPS, TEMP_SCORES
+from .zobrist import zobrist_key, count_key
+from constants import EMPTY_PS, MAX_REFUSALS, AGENT_MAXES, MAX_TEMPS, TEMP_SCORES, MAX_ROUNDABOUTS
+from constants import ESTATE_SCORES, POOL_SCORES, BIS_SCORES, REFUSAL_SCORES, ROUNDABOUT_SCORES
 
 class PlayerState():
     def __init__(self, ps_dict: Dict=EMPTY_PS) -> None:
+        self._load(ps_dict).raise_if_invalid()
+
+    @classmethod
+    def check(cls, ps_dict: Dict) -> ValidationResult:
+        '''
+        Validate ps_dict without raising. Returns a ValidationResult.
+        '''
+        return cls.__new__(cls)._load(ps_dict)
+
+    @classmethod
+    def from_trusted(cls, ps_dict: Dict) -> "PlayerState":
+        '''
+        Builds a PlayerState from ps_dict without checking it, for states this
+        engine produced. Only the short lists are copied, so the PlayerState
+        never shares them with ps_dict; the homes are rebuilt anyway. Call
+        validate() to check it later; untrusted input must go through the
+        constructor.
+        '''
+        ps = cls.__new__(cls)
+        ps._agents = list(ps_dict["agents"])
+        ps._cp_scores = list(ps_dict["city-plan-score"])
+        ps._refusals = ps_dict["refusals"]
+        ps._temps = ps_dict["temps"]
+        ps._streets = [Street.from_trusted(st_dict, i) for i, st_dict in enumerate(ps_dict["streets"])]
+        return ps
+
+    def validate(self) -> ValidationResult:
+        '''
+        Runs every check the constructor does on this PlayerState, without
+        raising. Returns a ValidationResult.
+        '''
+        return PlayerState.check(self.to_dict())
+
+    def _load(self, ps_dict: Dict) -> ValidationResult:
+        '''
+        Set this player state's fields from ps_dict, stopping at the first violation.
+        '''
         ps_keys = set(["agents", "city-plan-score", "refusals", "streets", "temps"])
-        my_assert(type(ps_dict) == dict and set(ps_dict.keys()) == ps_keys,
-            PlayerStateException,
+        result = my_check(type(ps_dict) == dict and set(ps_dict.keys()) == ps_keys,
+            Violation.PLAYER_STATE_FORMAT,
             f"A player-state must be a dictionary containing only these keys: {ps_keys}")
+        if not result.ok:
+            return result
 
         agents, cp_scores, refusals = ps_dict["agents"], ps_dict["city-plan-score"], ps_dict["refusals"]
         streets, temps = ps_dict["streets"], ps_dict["temps"]
 
-        self.agents = agents
-        self.city_plan_score = cp_scores
-        self.refusals = refusals
-        self.streets = streets
-        self.temps = temps
+        for check_field, value, attr in [
+            (self._check_agents, agents, "_agents"),
+            (self._check_city_plan_score, cp_scores, "_cp_scores"),
+            (self._check_refusals, refusals, "_refusals"),
+            (self._load_streets, streets, None),
+            (self._check_temps, temps, "_temps")]:
+            result = check_field(value)
+            if not result.ok:
+                return result
+            if attr is not None:
+                setattr(self, attr, value)
+
+        return VALID
 
     def _validate_agents(self, agents: List[int]) -> bool:
         '''
@@ -30,6 +78,62 @@ class PlayerState():
         '''
         return check_valid_lst(agents, 6, check_nat) and all(a <= AGENT_MAXES[i] for i, a in enumerate(agents))
 
+    def _check_agents(self, agents: List[int]) -> ValidationResult:
+        return my_check(self._validate_agents(agents),
+            Violation.AGENTS,
+            f"Given {agents}, but agents must be a list of 6 naturals.")
+
+    def _check_city_plan_score(self, cp_scores: list) -> ValidationResult:
+        return my_check(check_valid_lst(cp_scores, 3, lambda x: (check_nat(x) or x == "blank")),
+            Violation.CITY_PLAN_SCORES,
+            f"Given {cp_scores}, but city_plan_scores must be a list containing naturals or 'blank'.")
+
+    def _check_refusals(self, refusals: int) -> ValidationResult:
+        return my_check(check_nat(refusals) and refusals <= MAX_REFUSALS,
+            Violation.REFUSALS,
+            f"Given {refusals}, but refusals must be either 0, 1, 2, or 3.")
+
+    def _check_temps(self, temps: int) -> ValidationResult:
+        return my_check(check_nat(temps) and temps <= MAX_TEMPS,
+            Violation.TEMPS,
+            f"Given {temps}, but temps must be an integer between 0 and 11.")
+
+    def _load_streets(self, streets: List) -> ValidationResult:
+        '''
+        Build the Street objects and check the roundabout limit across them.
+        '''
+        result = my_check(check_valid_lst(streets, 3, lambda x: type(x) == dict),
+            Violation.STREETS,
+            f"Given {streets}, but streets must be a list 3 dictionaries.")
+        if not result.ok:
+            return result
+
+        self._streets = []
+        for i, st in enumerate(streets):
+            street = Street.__new__(Street)
+            result = street._load(st, i)
+            if not result.ok:
+                return result
+            self._streets.append(street)
+
+        num_roundabouts = sum([street.roundabout_count() for street in self._streets])
+        return my_check(num_roundabouts <= MAX_ROUNDABOUTS,
+            Violation.TOO_MANY_ROUNDABOUTS,
+            f"You can only play two roundabouts in a game.")
+
+    def clone(self) -> "PlayerState":
+        '''
+        Returns a copy of this PlayerState without re-validating it. The streets
+        are cloned, so they share their homes until they're changed.
+        '''
+        ps = PlayerState.__new__(PlayerState)
+        ps._agents = list(self._agents)
+        ps._cp_scores = list(self._cp_scores)
+        ps._refusals = self._refusals
+        ps._temps = self._temps
+        ps._streets = [street.clone() for street in self._streets]
+        return ps
+
     @property
     def streets(self) -> List[Street]:
         '''
@@ -39,15 +143,7 @@ class PlayerState():
 
     @streets.setter
     def streets(self, streets: List) -> None:
-        my_assert(check_valid_lst(streets, 3, lambda x: type(x) == dict),
-            PlayerStateException,
-            f"Given {streets}, but streets must be a list 3 dictionaries.")
-        self._streets = [Street(st, i) for i, st in enumerate(streets)]
-
-        num_roundabouts = sum([street.roundabout_count() for street in self._streets])
-        my_assert(num_roundabouts <= 2,
-            PlayerStateException,
-            f"You can only play two roundabouts in a game.")
+        self._load_streets(streets).raise_if_invalid()
 
     @property
     def agents(self) -> List[int]:
@@ -58,9 +154,7 @@ class PlayerState():
 
     @agents.setter
     def agents(self, agents: List[int]) -> None:
-        my_assert(self._validate_agents(agents),
-            PlayerStateException,
-            f"Given {agents}, but agents must be a list of 6 naturals.")
+        self._check_agents(agents).raise_if_invalid()
         self._agents = agents
 
     @property
@@ -69,9 +163,7 @@ class PlayerState():
 
     @city_plan_score.setter
     def city_plan_score(self, cp_scores: list):
-        my_assert(check_valid_lst(cp_scores, 3, lambda x: (check_nat(x) or x == "blank")),
-            PlayerStateException,
-            f"Given {cp_scores}, but city_plan_scores must be a list containing naturals or 'blank'.")
+        self._check_city_plan_score(cp_scores).raise_if_invalid()
         self._cp_scores = cp_scores
     
     @property
@@ -80,9 +172,7 @@ class PlayerState():
 
     @refusals.setter
     def refusals(self, refusals: int) -> None:
-        my_assert(check_nat(refusals) and refusals <= MAX_REFUSALS,
-            PlayerStateException,
-            f"Given {refusals}, but refusals must be either 0, 1, 2, or 3.")
+        self._check_refusals(refusals).raise_if_invalid()
         self._refusals = refusals
 
     @property
@@ -91,11 +181,21 @@ class PlayerState():
 
     @temps.setter
     def temps(self, temps: int) -> None:
-        my_assert(check_nat(temps) and temps <= MAX_TEMPS,
-            PlayerStateException,
-            f"Given {temps}, but temps must be an integer between 0 and 11.")
+        self._check_temps(temps).raise_if_invalid()
         self._temps = temps
     
+    def check_place_new_home(self, st_idx: int, home_idx: int, new_num: Union[int, str, List]) -> ValidationResult:
+        '''
+        Returns the result of building new_num on home home_idx of street st_idx,
+        without raising and without changing this PlayerState.
+        '''
+        result = self._streets[st_idx].check_place_new_home(home_idx, new_num)
+        if result.ok and new_num == "roundabout":
+            result = my_check(self.roundabouts < MAX_ROUNDABOUTS,
+                Violation.TOO_MANY_ROUNDABOUTS,
+                f"You can only play two roundabouts in a game.")
+        return result
+
     @property
     def roundabouts(self) -> int:
         return sum([street.roundabout_count() for street in self._streets])
@@ -122,43 +222,40 @@ class PlayerState():
         return total
 
     def calculate_score(self, temps_lst: List[int]) -> int:
+        '''
+        Returns this player's score. Each street keeps its bis, roundabout and
+        estate counts up to date as its homes change, so no street is scanned
+        again after the first call.
+        '''
         total_score = 0
         pools_count = 0
         bis_count = 0
-        estates_count_dict = defaultdict(int)
-        estate_scores = {
-            1: [1, 3], 
-            2: [2, 3, 4],
-            3: [3, 4, 5, 6],
-            4: [4, 5, 6, 7, 8],
-            5: [5, 6, 7, 8, 10],
-            6: [6, 7, 8, 10, 12] 
-        }
-        pools_score = [0, 3, 6, 9, 13, 17, 21, 26, 31, 36]
-        bis_score = [0, 1, 3, 6, 9, 12, 16, 20, 24, 28]
-        refusal_score = [0, 0, 3, 5]
-        roundabout_score = [0, 3, 8]
+        roundabout_count = 0
+        estates_counts = [0] * 7
         for street in self._streets:
             pools_count += street.pools_built()
-            bis_count += street.bis_count()
+            st_bis, st_roundabouts, st_estates = street.score_parts()
+            bis_count += st_bis
+            roundabout_count += st_roundabouts
             # total estates count
-            for size, ct in street.estates_dict().items():
-                estates_count_dict[size] += ct
+            for size in range(1, 7):
+                estates_counts[size] += st_estates[size]
 
             total_score += street.parks_score()
-        
+
         estates_total_score = 0
-        for size, ct in estates_count_dict.items():
-            agent_ct = self._agents[size - 1]
-            estates_total_score += estate_scores[size][agent_ct] * ct
+        for size in range(1, 7):
+            if estates_counts[size]:
+                agent_ct = self._agents[size - 1]
+                estates_total_score += ESTATE_SCORES[size][agent_ct] * estates_counts[size]
 
-        total_score += pools_score[pools_count]
+        total_score += POOL_SCORES[pools_count]
         total_score += self.total_cp_scores()
         total_score += self.temps_score(temps_lst)
         total_score += estates_total_score
-        total_score -= bis_score[bis_count]
-        total_score -= refusal_score[self._refusals]
-        total_score -= roundabout_score[self.roundabouts]
+        total_score -= BIS_SCORES[bis_count]
+        total_score -= REFUSAL_SCORES[self._refusals]
+        total_score -= ROUNDABOUT_SCORES[roundabout_count]
 
         return total_score
 
@@ -188,6 +285,30 @@ class PlayerState():
         '''
         return json.dumps(self.to_dict())
 
+    def zobrist_hash(self) -> int:
+        '''
+        Returns a 64-bit hash of this PlayerState. The homes' part of each
+        street's hash is kept up to date as they change, and the handful of
+        other fields are added in on each call.
+        '''
+        ps_hash = count_key("temps", 0, self._temps) ^ count_key("refusals", 0, self._refusals)
+        for street in self._streets:
+            ps_hash ^= street.zobrist_hash()
+        for col, agents in enumerate(self._agents):
+            ps_hash ^= count_key("agents", col, agents)
+        for i, score in enumerate(self._cp_scores):
+            if score != "blank":
+                ps_hash ^= zobrist_key("city-plan-score", i, score)
+        return ps_hash
+
     def __eq__(self, other: object) -> bool:
-        return type(other) == PlayerState and self.to_dict() == other.to_dict()
+        # PlayerStates with different hashes can't be equal
+        if type(other) != PlayerState or self.zobrist_hash() != other.zobrist_hash():
+            return False
+        return self.to_dict() == other.to_dict()
+
+    def __hash__(self) -> int:
+        # changing a PlayerState changes its hash, so don't change one that's
+        # used as a key
+        return self.zobrist_hash()
 
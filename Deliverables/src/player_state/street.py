@@ -2,37 +2,94 @@ import json
 from copy import deepcopy
 from typing import *
 from helpers import *
-from exception import StreetException, my_assert
+from exception import ValidationResult, Violation, VALID, my_check
 from . import Home
+from .zobrist import home_key, count_key
 from constants import PARK_MAXES, POOL_LOCS, STREET_LENS
 from collections import defaultdict
 
+# bounds used when there is no filled non-bis house on one side of a home
+NO_LOWER_BOUND = -1
+NO_UPPER_BOUND = 18
+# temp agents can change a card's number by up to this much
+TEMP_OFFSET = 2
+
 class Street():
     def __init__(self, st_dict: Dict, st_idx: int) -> None:
+        self._load(st_dict, st_idx).raise_if_invalid()
+
+    @classmethod
+    def check(cls, st_dict: Dict, st_idx: int) -> ValidationResult:
+        '''
+        Validate st_dict as street st_idx without raising. Returns a ValidationResult.
+        '''
+        return cls.__new__(cls)._load(st_dict, st_idx)
+
+    def _load(self, st_dict: Dict, st_idx: int) -> ValidationResult:
+        '''
+        Set this street's fields from st_dict, stopping at the first violation.
+        '''
         # index of this street
         self._idx = st_idx
+        # _lower[i]/_upper[i] hold the nearest filled non-bis house numbers to the
+        # left/right of home i, stopping at roundabouts. built lazily, then kept
+        # up to date as homes change
+        self._lower, self._upper = None, None
+        # _masks[n] is a bitmask of the homes where a house numbered n can be
+        # built. cached until a house in the street changes
+        self._masks = None
+        # _score_parts holds (bis count, roundabout count, estate counts by size)
+        # for scoring. built lazily, then updated with each change to a house
+        # or fence
+        self._score_parts = None
+        # _plan_estates holds the estates still open to city plans. cached
+        # until a house, fence or used-in-plan mark in the street changes
+        self._plan_estates = None
+        # _homes_hash is the XOR of the Zobrist keys of every home's fields.
+        # built lazily, then updated with each change to a home
+        self._homes_hash = None
+        # True while _homes is shared with a clone of this street
+        self._homes_shared = False
         st_keys = set(["homes", "parks", "pools"])
-        my_assert(type(st_dict) == dict and set(st_dict.keys()) == st_keys,
-            StreetException,
+        result = my_check(type(st_dict) == dict and set(st_dict.keys()) == st_keys,
+            Violation.STREET_FORMAT,
             f"A street must be a dictionary containing only these keys: {st_keys}"
         )
+        if not result.ok:
+            return result
 
         homes, parks, pools = st_dict["homes"], st_dict["parks"], st_dict["pools"]
-        self.pools = pools
-        self.homes = homes
-        self.parks = parks
+        result = self._check_pools(pools)
+        if not result.ok:
+            return result
+        self._pools = pools
+
+        result = self._load_homes(homes)
+        if not result.ok:
+            return result
+
+        result = self._check_parks(parks)
+        self._parks = parks
+        return result
 
     @property 
     def homes(self) -> List[Home]:
+        # homes shared with a clone are copied before anyone can change them
+        if self._homes_shared:
+            self._copy_homes()
         return self._homes
 
     @homes.setter
     def homes(self, homes: List) -> None:
-        my_assert(self._validate_homes(homes),
-            StreetException,
-            f"homes for row {self._idx} must be a list with {STREET_LENS[self._idx]} homes.")
-        self._build_homes(homes)
-        self._check_homes_rule_violations()
+        self._load_homes(homes).raise_if_invalid()
+
+    @property
+    def homes_view(self) -> Tuple[Home, ...]:
+        '''
+        The homes, for reading only: unlike homes, it doesn't copy homes
+        shared with a clone, so none of them may be changed through it.
+        '''
+        return tuple(self._homes)
 
     @property
     def pools(self) -> List[bool]:
@@ -40,9 +97,7 @@ class Street():
 
     @pools.setter
     def pools(self, pools: List[bool]) -> None:
-        my_assert(check_valid_lst(pools, 3, lambda x: type(x) == bool),
-            StreetException,
-            f"Given {pools}, but pools must be a list of 3 boolean values")
+        self._check_pools(pools).raise_if_invalid()
         self._pools = pools
 
     @property
@@ -51,14 +106,38 @@ class Street():
 
     @parks.setter
     def parks(self, parks: int) -> None:
+        self._check_parks(parks).raise_if_invalid()
+        self._parks = parks
+
+    def _check_pools(self, pools: List[bool]) -> ValidationResult:
+        return my_check(check_valid_lst(pools, 3, lambda x: type(x) == bool),
+            Violation.POOLS,
+            f"Given {pools}, but pools must be a list of 3 boolean values")
+
+    def _check_parks(self, parks: int) -> ValidationResult:
         # count number of non-bis houses
         non_bis_ct = [type(h.num) == int and not h.is_bis for h in self._homes].count(True)
-        my_assert(self._validate_parks(parks, non_bis_ct),
-            StreetException,
+        return my_check(self._validate_parks(parks, non_bis_ct),
+            Violation.PARKS,
             f"Given {parks}, but parks must be a natural no greater than {min(non_bis_ct, PARK_MAXES[self._idx])}.")
-        self._parks = parks
 
-    def _build_homes(self, homes: List) -> None:
+    def _load_homes(self, homes: List) -> ValidationResult:
+        '''
+        Build the homes of this street and check them against the street rules.
+        '''
+        result = my_check(self._validate_homes(homes),
+            Violation.STREET_HOMES,
+            f"homes for row {self._idx} must be a list with {STREET_LENS[self._idx]} homes.")
+        if not result.ok:
+            return result
+
+        result = self._build_homes(homes)
+        if not result.ok:
+            return result
+
+        return self._find_homes_rule_violation()
+
+    def _build_homes(self, homes: List) -> ValidationResult:
         '''
         Initialize a list of our internal representation of homes, the Home class.
         NOTE: we represent the first home just like the rest, as a list of four fields.
@@ -84,8 +163,218 @@ class Street():
 
             home_lst.append(curr_home)
 
-        self._homes = [Home(home) for home in home_lst]       
-            
+        self._homes = []
+        for i, curr_home in enumerate(home_lst):
+            home = Home.__new__(Home)
+            result = home._load(curr_home)
+            if not result.ok:
+                return result
+            home._set_owner(self, i)
+            self._homes.append(home)
+        self._homes_shared = False
+        self._lower, self._upper = None, None
+        self._masks = None
+        self._score_parts = None
+        self._plan_estates = None
+        self._homes_hash = None
+        return VALID
+
+    @classmethod
+    def from_trusted(cls, st_dict: Dict, st_idx: int) -> "Street":
+        '''
+        Builds street st_idx from st_dict without checking it, for streets
+        this engine produced.
+        '''
+        street = cls.__new__(cls)
+        street._idx = st_idx
+        street._lower, street._upper = None, None
+        street._masks, street._score_parts, street._plan_estates, street._homes_hash = None, None, None, None
+        street._homes_shared = False
+        street._pools = list(st_dict["pools"])
+        street._parks = st_dict["parks"]
+
+        homes = st_dict["homes"]
+        # the first home is given as house, used-in-plan, and has a fence on its left
+        home_lsts = [[True, homes[0], homes[1]]] + [list(home) for home in homes[2:]]
+        for i, home_lst in enumerate(home_lsts):
+            home_lst.append(home_lsts[i+1][0] if i + 1 < len(home_lsts) else True)
+        street._homes = [Home.from_trusted(home_lst) for home_lst in home_lsts]
+        for i, home in enumerate(street._homes):
+            home._set_owner(street, i)
+        return street
+
+    def clone(self) -> "Street":
+        '''
+        Returns a copy of this street without re-validating it. The copy shares
+        this street's homes, and both only copy them once the homes property
+        is used.
+        '''
+        street = Street.__new__(Street)
+        street._idx = self._idx
+        street._pools = list(self._pools)
+        street._parks = self._parks
+        street._homes = self._homes
+        street._lower, street._upper = self._lower, self._upper
+        street._masks = self._masks
+        street._score_parts = self._score_parts
+        street._plan_estates = self._plan_estates
+        street._homes_hash = self._homes_hash
+        street._homes_shared = self._homes_shared = True
+        return street
+
+    def _copy_homes(self) -> None:
+        self._homes = [home.clone() for home in self._homes]
+        for i, home in enumerate(self._homes):
+            home._set_owner(self, i)
+        # the bounds are updated in place, so they can't stay shared either
+        if self._lower is not None:
+            self._lower, self._upper = list(self._lower), list(self._upper)
+        self._homes_shared = False
+
+    def _home_changed(self, home_idx: int, field: str, old_val: Union[int, str, bool]) -> None:
+        '''
+        Called by a Home in this street whenever one of its fields changes.
+        '''
+        if self._homes_hash is not None:
+            new_val = getattr(self._homes[home_idx], "_" + field)
+            self._homes_hash ^= (home_key(self._idx, home_idx, field, old_val) ^
+                home_key(self._idx, home_idx, field, new_val))
+        if field in ["num", "is_bis"]:
+            self._masks = None
+            if self._lower is not None:
+                self._update_bounds(home_idx)
+        if field != "in_plan" and self._score_parts is not None:
+            self._update_score_parts(home_idx, field, old_val)
+        self._plan_estates = None
+
+    def _update_score_parts(self, home_idx: int, field: str, old_val: Union[int, str, bool]) -> None:
+        '''
+        Update the cached score parts for a change to home home_idx, by
+        sweeping only the homes between the blanks or roundabouts around it,
+        as the sweep starts over at each of those.
+        '''
+        start, end = home_idx, home_idx + 1
+        while start > 0 and self._homes[start - 1].num not in ["blank", "roundabout"]:
+            start -= 1
+        while end < len(self._homes) and self._homes[end].num not in ["blank", "roundabout"]:
+            end += 1
+        old_bis, old_roundabouts, old_estates = self._sweep_score_parts(start, end, (home_idx, field, old_val))
+        new_bis, new_roundabouts, new_estates = self._sweep_score_parts(start, end)
+        bis_ct, roundabout_ct, estate_cts = self._score_parts
+        # a new tuple, as clones of this street may share the old one
+        self._score_parts = (bis_ct + new_bis - old_bis, roundabout_ct + new_roundabouts - old_roundabouts,
+            tuple(ct + new - old for ct, new, old in zip(estate_cts, new_estates, old_estates)))
+
+    def _is_bound(self, home: Home) -> bool:
+        '''
+        Returns True if home limits the numbers around it: a filled non-bis
+        house or a roundabout.
+        '''
+        return home.num != "blank" and not home.is_bis
+
+    def _build_bounds(self) -> None:
+        '''
+        Compute the placement bounds of every home in one pass in each direction.
+        '''
+        st_len = len(self._homes)
+        self._lower, self._upper = [NO_LOWER_BOUND] * st_len, [NO_UPPER_BOUND] * st_len
+        lower = NO_LOWER_BOUND
+        for i, home in enumerate(self._homes):
+            self._lower[i] = lower
+            if self._is_bound(home):
+                lower = home.num if home.num != "roundabout" else NO_LOWER_BOUND
+
+        upper = NO_UPPER_BOUND
+        for i in range(st_len - 1, -1, -1):
+            home = self._homes[i]
+            self._upper[i] = upper
+            if self._is_bound(home):
+                upper = home.num if home.num != "roundabout" else NO_UPPER_BOUND
+
+    def _update_bounds(self, home_idx: int) -> None:
+        '''
+        Recompute the bounds around home_idx after it changed. Only the homes
+        between the nearest bounding houses on each side are touched.
+        '''
+        left = home_idx - 1
+        while left >= 0 and not self._is_bound(self._homes[left]):
+            left -= 1
+        right = home_idx + 1
+        while right < len(self._homes) and not self._is_bound(self._homes[right]):
+            right += 1
+
+        lower = NO_LOWER_BOUND if left < 0 or self._homes[left].num == "roundabout" else self._homes[left].num
+        upper = NO_UPPER_BOUND if right == len(self._homes) or self._homes[right].num == "roundabout" else self._homes[right].num
+        # if the changed home is now a bound itself, it splits the interval in two
+        home = self._homes[home_idx]
+        mid_lower, mid_upper = lower, upper
+        if self._is_bound(home):
+            mid_lower = home.num if home.num != "roundabout" else NO_LOWER_BOUND
+            mid_upper = home.num if home.num != "roundabout" else NO_UPPER_BOUND
+
+        for i in range(left + 1, home_idx):
+            self._lower[i], self._upper[i] = lower, mid_upper
+        self._lower[home_idx], self._upper[home_idx] = lower, upper
+        for i in range(home_idx + 1, right):
+            self._lower[i], self._upper[i] = mid_lower, upper
+
+    def can_place_home(self, home_idx: int, new_num: int) -> bool:
+        '''
+        Returns True if a non-bis house numbered new_num can be built on the blank
+        home at home_idx. In a valid street only the increasing-order rule can
+        be broken by such a house, so this is a lookup against the bounds.
+        '''
+        if self._lower is None:
+            self._build_bounds()
+        return (self._homes[home_idx].num == "blank" and
+            self._lower[home_idx] < new_num < self._upper[home_idx])
+
+    def placement_masks(self) -> List[int]:
+        '''
+        Returns a list of 18 bitmasks; bit i of element n is set if a non-bis
+        house numbered n can be built on home i. Computed in one sweep over
+        the street and cached until a house changes.
+        '''
+        if self._masks is None:
+            if self._lower is None:
+                self._build_bounds()
+            masks = [0] * NO_UPPER_BOUND
+            for i, home in enumerate(self._homes):
+                if home.num != "blank":
+                    continue
+                for num in range(self._lower[i] + 1, self._upper[i]):
+                    masks[num] |= 1 << i
+            self._masks = masks
+
+        return self._masks
+
+    def placement_mask(self, new_num: int, temp: bool=False) -> int:
+        '''
+        Returns a bitmask of the homes where a card numbered new_num can be
+        built. If temp is True, the card may be changed by up to +/- 2.
+        '''
+        masks = self.placement_masks()
+        if not temp:
+            return masks[new_num]
+
+        mask = 0
+        for num in range(max(new_num - TEMP_OFFSET, 0), min(new_num + TEMP_OFFSET, NO_UPPER_BOUND - 1) + 1):
+            mask |= masks[num]
+        return mask
+
+    def can_place_bis(self, home_idx: int, new_num: int) -> bool:
+        '''
+        Returns True if a bis numbered new_num can be built on the blank home at
+        home_idx, i.e. an adjacent house not separated by a fence has that number.
+        '''
+        home = self._homes[home_idx]
+        if home.num != "blank":
+            return False
+        prev_home = self._homes[home_idx - 1] if home_idx > 0 else None
+        next_home = self._homes[home_idx + 1] if home_idx < len(self._homes) - 1 else None
+        return ((prev_home is not None and prev_home.num == new_num and not home.fence_left) or
+            (next_home is not None and next_home.num == new_num and not home.fence_right))
+
 
     def _validate_homes(self, homes: List) -> bool:
         '''
@@ -100,11 +389,26 @@ class Street():
         '''
         Check that the homes don't violate any game rules.
         '''
-        self._check_homes_increasing()
-        self._check_homes_bis()
-        self._check_homes_pools()
+        self._find_homes_rule_violation().raise_if_invalid()
+
+    def find_rule_violation(self) -> ValidationResult:
+        '''
+        Returns the first game rule the homes on this street break, or VALID.
+        '''
+        return self._find_homes_rule_violation()
 
-    def _check_homes_increasing(self) -> None:
+    def _find_homes_rule_violation(self) -> ValidationResult:
+        '''
+        Returns the first game rule the homes violate, or VALID.
+        '''
+        for check_rule in [self._check_homes_increasing, self._check_homes_bis, self._check_homes_pools]:
+            result = check_rule()
+            if not result.ok:
+                return result
+
+        return VALID
+
+    def _check_homes_increasing(self) -> ValidationResult:
         '''
         Check that homes are increasing. Accounts for roundabouts.
         '''
@@ -116,11 +420,13 @@ class Street():
                 prev_non_bis = -1
                 continue
             if home.num <= prev_non_bis:
-                raise StreetException(f"Violation in street {self._idx + 1}: non-bis house numbers must be strictly increasing.")
+                return ValidationResult(Violation.NOT_INCREASING, f"Violation in street {self._idx + 1}: non-bis house numbers must be strictly increasing.")
             
             prev_non_bis = home.num
+
+        return VALID
     
-    def _check_homes_bis(self) -> None:
+    def _check_homes_bis(self) -> ValidationResult:
         '''
         Check that: 
         - bis houses are the same number as an adjacent house
@@ -151,10 +457,10 @@ class Street():
                 if next_home and curr_num == next_home.num and not home.fence_right:
                     continue
 
-                raise StreetException(f"Violation in street {self._idx + 1}: bis must have the same number as an adjacent house.")
+                return ValidationResult(Violation.BIS_NO_MATCH, f"Violation in street {self._idx + 1}: bis must have the same number as an adjacent house.")
             else:
                 if bis_obligation is not None and curr_num != bis_obligation:
-                    raise StreetException(f"Violation in street {self._idx + 1}: bis played next to a house with a different number (or blank).")
+                    return ValidationResult(Violation.BIS_OBLIGATION, f"Violation in street {self._idx + 1}: bis played next to a house with a different number (or blank).")
                 if curr_num == "blank":
                     bis_anchor, bis_obligation = None, None
                     continue
@@ -162,10 +468,11 @@ class Street():
                 bis_anchor, bis_obligation = curr_num, None
                     
         # if we make it outside the loop but still fulfilled the bis_obligation, it's invalid
-        if bis_obligation is not None:
-            raise StreetException(f"Violation in street {self._idx + 1}: bis played next to a house with a different number (or blank).")
+        return my_check(bis_obligation is None,
+            Violation.BIS_OBLIGATION,
+            f"Violation in street {self._idx + 1}: bis played next to a house with a different number (or blank).")
                 
-    def _check_homes_pools(self) -> None:
+    def _check_homes_pools(self) -> ValidationResult:
         '''
         Check that a house with a pool isn't a blank, bis, or roundabout
         '''
@@ -174,8 +481,9 @@ class Street():
             if has_pool:
                 home = self._homes[curr_pool_locs[i]]
                 if type(home.num) != int or home.is_bis:
-                    raise StreetException(f"Violation in street {self._idx + 1}: pool cannot be on a blank, bis, or roundabout house.")
+                    return ValidationResult(Violation.POOL_ON_INVALID_HOUSE, f"Violation in street {self._idx + 1}: pool cannot be on a blank, bis, or roundabout house.")
 
+        return VALID
 
     def _validate_parks(self, parks: int, non_bis_ct: int) -> bool:
         '''
@@ -186,23 +494,35 @@ class Street():
         '''
         return check_nat(parks) and parks <= PARK_MAXES[self._idx] and parks <= non_bis_ct
 
-    def get_possible_home_locations(self, new_num: int):
-        locations = []
-        for i, curr_home in enumerate(self._homes):
-            if curr_home.num != "blank":
-                continue
-            
-            try:
-                self.try_place_new_home(i, new_num)
-            except:
-                pass
-            else:
-                locations.append(i)
-            finally:
-                curr_home.num = "blank"
-
-        return locations
+    def get_possible_home_locations(self, new_num: int) -> List[int]:
+        return mask_to_indices(self.placement_mask(new_num))
     
+    def check_place_new_home(self, home_idx: int, new_num: Union[int, str, List]) -> ValidationResult:
+        '''
+        Returns the result of building new_num (in any house format) on the blank
+        home at home_idx, without raising and without changing the street.
+        Assumes the street is currently valid.
+        '''
+        home = self._homes[home_idx]
+        if home.num != "blank":
+            return ValidationResult(Violation.HOME_OCCUPIED, f"Violation in street {self._idx + 1}: home {home_idx} is already built.")
+        # a plain house can only break the increasing-order rule
+        if check_nat(new_num) and new_num <= 17:
+            return my_check(self.can_place_home(home_idx, new_num),
+                Violation.NOT_INCREASING,
+                f"Violation in street {self._idx + 1}: non-bis house numbers must be strictly increasing.")
+
+        result, num, bis = home._check_house(new_num)
+        if not result.ok:
+            return result
+
+        # the house is set for the check, so this street needs its own homes
+        home = self.homes[home_idx]
+        home.num, home.is_bis = num, bis
+        result = self._find_homes_rule_violation()
+        home.num, home.is_bis = "blank", False
+        return result
+
     def try_place_new_home(self, home_idx: int, new_num: Union[int, str, List]) -> None:
         '''
         Place a new home with new_num at index home_idx and validate that it doesn't
@@ -218,13 +538,45 @@ class Street():
     def pools_built(self) -> int:
         return self._pools.count(True)
     
-    def estates_dict(self) -> DefaultDict[int, int]:
-        ret_dict = defaultdict(int)
+    def score_parts(self) -> Tuple[int, int, Tuple[int, ...]]:
+        '''
+        Returns (bis count, roundabout count, estate counts) for scoring, where
+        element i of estate counts is the number of estates of size i. Computed
+        in one sweep over the street, then kept up to date as homes change.
+        '''
+        if self._score_parts is None:
+            bis_ct, roundabout_ct, estate_cts = self._sweep_score_parts(0, len(self._homes))
+            self._score_parts = (bis_ct, roundabout_ct, tuple(estate_cts))
+
+        return self._score_parts
+
+    def _sweep_score_parts(self, start: int, end: int,
+            changed: Optional[Tuple[int, str, Union[int, str, bool]]]=None) -> Tuple[int, int, List[int]]:
+        '''
+        Returns (bis count, roundabout count, estate counts) of homes start
+        to end - 1. changed, if given, is (home index, field, value) of a
+        field to read as value instead, so the sweep can be rerun on the
+        homes as they were before that field changed.
+        '''
+        bis_ct, roundabout_ct = 0, 0
+        estate_cts = [0] * 7
         in_estate = False
         size_counter = 0
-        for home in self._homes:
-            if home.num not in ["blank", "roundabout"]:
-                if home._fence_left:
+        for k in range(start, end):
+            home = self._homes[k]
+            num, is_bis, fence_left, fence_right = home._num, home._is_bis, home._fence_left, home._fence_right
+            if changed is not None and changed[0] == k:
+                if changed[1] == "num":
+                    num = changed[2]
+                elif changed[1] == "is_bis":
+                    is_bis = changed[2]
+                elif changed[1] == "fence_left":
+                    fence_left = changed[2]
+                elif changed[1] == "fence_right":
+                    fence_right = changed[2]
+            bis_ct += is_bis
+            if num not in ["blank", "roundabout"]:
+                if fence_left:
                     in_estate = True
                 if in_estate:
                     size_counter += 1
@@ -232,21 +584,71 @@ class Street():
                         size_counter = 0
                         in_estate = False
                         continue
-                    if home._fence_right:
-                        ret_dict[size_counter] += 1
+                    if fence_right:
+                        estate_cts[size_counter] += 1
                         size_counter = 0
                         in_estate = False
             else:
+                roundabout_ct += num == "roundabout"
                 size_counter = 0
                 in_estate = False
-        
+        return bis_ct, roundabout_ct, estate_cts
+
+    def plan_estates(self, unmarked: FrozenSet[int]=frozenset()) -> Tuple[Tuple[int, int], ...]:
+        '''
+        Returns the estates on this street that can still be used in a city
+        plan, as (first home, size): the runs of built houses between two
+        fences with none used in a plan yet. The homes in unmarked are read
+        as not used in a plan, e.g. to check the marks a move just made.
+        Cached until a house, fence or used-in-plan mark changes, when
+        unmarked is empty.
+        '''
+        if unmarked or self._plan_estates is None:
+            estates = []
+            start, usable = 0, True
+            for k, home in enumerate(self._homes):
+                if k > start and home.fence_left:
+                    if usable:
+                        estates.append((start, k - start))
+                    start, usable = k, True
+                usable = usable and type(home.num) == int and (not home.in_plan or k in unmarked)
+            if usable:
+                estates.append((start, len(self._homes) - start))
+            if unmarked:
+                return tuple(estates)
+            self._plan_estates = tuple(estates)
+
+        return self._plan_estates
+
+    def zobrist_hash(self) -> int:
+        '''
+        Returns a 64-bit hash of this street. The homes' part is kept up to
+        date as they change; parks and pools are added in on each call.
+        '''
+        if self._homes_hash is None:
+            homes_hash = 0
+            for k, home in enumerate(self._homes):
+                for field in ["num", "is_bis", "fence_left", "fence_right", "in_plan"]:
+                    homes_hash ^= home_key(self._idx, k, field, getattr(home, "_" + field))
+            self._homes_hash = homes_hash
+
+        st_hash = self._homes_hash ^ count_key("parks", self._idx, self._parks)
+        for i, pool in enumerate(self._pools):
+            st_hash ^= count_key("pools", (self._idx, i), pool)
+        return st_hash
+
+    def estates_dict(self) -> DefaultDict[int, int]:
+        ret_dict = defaultdict(int)
+        for size, ct in enumerate(self.score_parts()[2]):
+            if ct:
+                ret_dict[size] = ct
         return ret_dict
 
     def bis_count(self) -> int:
-        return [h.is_bis for h in self._homes].count(True)
+        return self.score_parts()[0]
 
     def roundabout_count(self) -> int:
-        return [h.num == "roundabout" for h in self._homes].count(True)
+        return self.score_parts()[1]
 
     def is_full(self) -> bool:
         return all([h.num != "blank" for h in self._homes])
@@ -267,5 +669,11 @@ class Street():
         return json.dumps(self.to_dict())
 
     def __eq__(self, other: object) -> bool:
+        # streets with different hashes can't be equal
+        if type(other) == Street and self.zobrist_hash() != other.zobrist_hash():
+            return False
         return self.to_dict() == other.to_dict()
 
+    def __hash__(self) -> int:
+        return self.zobrist_hash()
+
@@ -0,0 +1,33 @@
+import random
+from typing import *
+
+# keys are drawn on first use, each from a generator seeded by what it stands
+# for, so the same state hashes the same in every process
+_zobrist_keys = {}
+
+def zobrist_key(*parts) -> int:
+    '''
+    Returns the random 64-bit key for parts, e.g. a field, its position and
+    its value.
+    '''
+    if parts not in _zobrist_keys:
+        _zobrist_keys[parts] = random.Random(repr(parts)).getrandbits(64)
+    return _zobrist_keys[parts]
+
+def home_key(st_idx: int, home_idx: int, field: str, value: Union[int, str, bool]) -> int:
+    '''
+    Returns the key for one field of home home_idx on street st_idx. Blank
+    houses and unset flags have key 0, so they don't need hashing.
+    '''
+    if value is False or value == "blank":
+        return 0
+    return zobrist_key("home", st_idx, home_idx, field, value)
+
+def count_key(field: str, idx: int, count: Union[int, str, bool]) -> int:
+    '''
+    Returns the key for a count or flag outside the homes, e.g. the parks on
+    street idx. Zero, False and "blank" have key 0.
+    '''
+    if count is False or count == 0 or count == "blank":
+        return 0
+    return zobrist_key(field, idx, count)
@@ -1,3 +1,8 @@
+from .latency_stats import LatencyStats
 from .player import Player
+from .sync_player import SyncPlayer
+from .remote_player import RemotePlayer
 from .network_player import NetworkPlayer
-from .local_player import LocalPlayer
\ No newline at end of file
+from .local_player import LocalPlayer
+from .async_network_player import AsyncNetworkPlayer
+from .replay_player import ReplayPlayer
\ No newline at end of file
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import *
+
+from . import RemotePlayer
+from game_state import GameState
+from exception import PlayerConnectionException, PlayerTimeoutException
+from network import AsyncNetworkAdapter
+from constants import SUPPORTED_PROTOCOLS, SUPPORTED_ENCODINGS, TURN_TIMEOUT, GAME_TIMEOUT
+
+class AsyncNetworkPlayer(RemotePlayer):
+    '''
+    A NetworkPlayer for asyncio servers. Build one with connect(). Unlike a
+    SyncPlayer it has no blocking way to ask for a move: use
+    async_request_next_move() and async_send_final_scores().
+    '''
+    def __init__(self, network: AsyncNetworkAdapter, name: str, protocol: str,
+            turn_timeout: Optional[float]=TURN_TIMEOUT, game_timeout: Optional[float]=GAME_TIMEOUT) -> None:
+        self._network = network
+        self._closed = False
+        self._close_task = None
+        super().__init__(name, protocol, turn_timeout, game_timeout)
+
+    @classmethod
+    async def connect(cls, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+            protocols: List[str]=SUPPORTED_PROTOCOLS, encodings: List[str]=SUPPORTED_ENCODINGS,
+            turn_timeout: Optional[float]=TURN_TIMEOUT, game_timeout: Optional[float]=GAME_TIMEOUT) -> "AsyncNetworkPlayer":
+        '''
+        Receive the player's sign up and negotiate their protocol and encoding.
+        '''
+        network = AsyncNetworkAdapter(reader, writer)
+        sign_up = await network.recv(turn_timeout)
+        name, protocol, encoding, reply = cls.negotiate_protocol(sign_up, protocols, encodings)
+        if reply:
+            await network.send(reply, turn_timeout)
+        network.set_encoding(encoding)
+        return cls(network, name, protocol, turn_timeout, game_timeout)
+
+    @property
+    def encoding(self) -> str:
+        return self._network.encoding
+
+    @property
+    def connected(self) -> bool:
+        return not self._closed and not self._network.at_eof()
+
+    async def async_request_next_move(self, game_state: GameState):
+        start = time.monotonic()
+        timeout = self._next_timeout()
+        try:
+            # sending the request counts towards the turn, so a player who
+            # stops reading runs out of time too
+            await self._network.send(self._turn_request(game_state), timeout)
+            response = await self._network.recv(self._remaining(start, timeout))
+        # a player out of time is treated like one who cheated
+        except PlayerTimeoutException:
+            self._record_turn(start, timed_out=True)
+            return False
+        except PlayerConnectionException:
+            return False
+
+        self._record_turn(start)
+        return self._parse_response(response)
+
+    def close(self):
+        # Player._set_cheater() can't wait, so the connection is closed in the background
+        if not self._closed:
+            self._closed = True
+            # kept, so the task isn't garbage collected before it runs
+            self._close_task = asyncio.ensure_future(self._network.close())
+
+    async def async_close(self):
+        if not self._closed:
+            self._closed = True
+            await self._network.close()
+        elif self._close_task:
+            await self._close_task
+
+    async def async_send_final_scores(self, scores: dict):
+        if not self._closed:
+            try:
+                await self._network.send(scores, self._turn_timeout)
+                # wait for the ack
+                await self._network.recv(self._turn_timeout)
+            except PlayerConnectionException:
+                # if the player disconnected, we're closing anyways
+                pass
+
+            await self.async_close()
\ No newline at end of file
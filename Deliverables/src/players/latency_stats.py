@@ -0,0 +1,51 @@
+import math
+from typing import *
+
+class LatencyStats():
+    '''
+    How long a player took to answer each message they were sent, in
+    seconds, and how many times they ran out of time.
+    '''
+    def __init__(self) -> None:
+        self._samples = []
+        self.timeouts = 0
+
+    def record(self, seconds: float, timed_out: bool=False) -> None:
+        self._samples.append(seconds)
+        if timed_out:
+            self.timeouts += 1
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def total(self) -> float:
+        return sum(self._samples)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self._samples else 0.0
+
+    @property
+    def max(self) -> float:
+        return max(self._samples, default=0.0)
+
+    def percentile(self, pct: float) -> float:
+        '''
+        Returns the latency pct percent of answers came within, by the
+        nearest-rank method.
+        '''
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p95": self.percentile(95),
+            "max": self.max,
+            "timeouts": self.timeouts
+        }
@@ -1,12 +1,23 @@
-from . import Player
+import random
+from typing import *
+from . import SyncPlayer
 from game_state import GameState
 from moves import MoveGenerator
 from player_state import PlayerState
 
-class LocalPlayer(Player):
-    def __init__(self, name: str, move_generator: MoveGenerator) -> None:
+class LocalPlayer(SyncPlayer):
+    def __init__(self, name: str, move_generator: MoveGenerator, rng: Optional[random.Random]=None,
+            remaining_cards: Optional[Callable[[], List[List]]]=None) -> None:
         self._MoveGenerator = move_generator
+        # every move is generated with the same rng, so a seeded player repeats
+        # its game; None leaves it to the generator
+        self._rng = rng
+        # returns the cards left in the game's deck, for generators that
+        # sample future cards; None if the player isn't hosted by a Game
+        self._remaining_cards = remaining_cards
         super().__init__(name)
 
     def _get_next_player_state(self, game_state: GameState) -> PlayerState:
-        return self._MoveGenerator(game_state, self._player_state).generate_move()
\ No newline at end of file
+        remaining_cards = self._remaining_cards() if self._remaining_cards is not None else None
+        return self._MoveGenerator(game_state, self._player_state, rng=self._rng,
+            remaining_cards=remaining_cards).generate_move()
\ No newline at end of file
@@ -1,35 +1,50 @@
 import socket
+import time
+from typing import *
 
-from . import Player
+from . import RemotePlayer, SyncPlayer
 from game_state import GameState
-from player_state import PlayerState
-from exception import PlayerStateException, PlayerConnectionException
+from exception import PlayerConnectionException, PlayerTimeoutException
 from network import NetworkAdapter
+from constants import SUPPORTED_PROTOCOLS, SUPPORTED_ENCODINGS, TURN_TIMEOUT, GAME_TIMEOUT
 
-class NetworkPlayer(Player):
-    def __init__(self, sock: socket, addr) -> None:
+class NetworkPlayer(RemotePlayer, SyncPlayer):
+    def __init__(self, sock: socket, addr, protocols: List[str]=SUPPORTED_PROTOCOLS,
+            encodings: List[str]=SUPPORTED_ENCODINGS, turn_timeout: Optional[float]=TURN_TIMEOUT,
+            game_timeout: Optional[float]=GAME_TIMEOUT) -> None:
         self._network = NetworkAdapter(sock)
         self._closed = False
         self._addr = addr
-        name = self._network.recv()
-        super().__init__(name)
+        # a player who never signs up mustn't hold up the server either
+        sign_up = self._network.recv(turn_timeout)
+        name, protocol, encoding, reply = self.negotiate_protocol(sign_up, protocols, encodings)
+        if reply:
+            self._network.send(reply, turn_timeout)
+        self._network.set_encoding(encoding)
+        super().__init__(name, protocol, turn_timeout, game_timeout)
+
+    @property
+    def encoding(self) -> str:
+        return self._network.encoding
 
     def _get_next_player_state(self, game_state: GameState):
-        self._network.send({
-            "game-state": game_state.to_dict(), 
-            "player-state": self._player_state.to_dict()
-        })
+        start = time.monotonic()
+        timeout = self._next_timeout()
         try:
-            new_ps = self._network.recv()
+            # sending the request counts towards the turn, so a player who
+            # stops reading runs out of time too
+            self._network.send(self._turn_request(game_state), timeout)
+            response = self._network.recv(self._remaining(start, timeout))
+        # a player out of time is treated like one who cheated
+        except PlayerTimeoutException:
+            self._record_turn(start, timed_out=True)
+            return False
         except PlayerConnectionException:
             return False
 
-        try:
-            return PlayerState(new_ps)
-        # if player sends an invalid PlayerState, they cheated
-        except PlayerStateException:
-            return False
-    
+        self._record_turn(start)
+        return self._parse_response(response)
+
     def close(self):
         if not self._closed:
             self._network.close()
@@ -37,15 +52,13 @@ class NetworkPlayer(Player):
 
     def send_final_scores(self, scores: dict):
         if not self._closed:
-            self._network.send(scores)
-            # wait for the ack
             try:
-                self._network.recv()
+                self._network.send(scores, self._turn_timeout)
+                # wait for the ack
+                self._network.recv(self._turn_timeout)
             except PlayerConnectionException:
                 # if the player disconnected, we're closing anyways
                 pass
 
             self.close()
 
-
-    
\ No newline at end of file
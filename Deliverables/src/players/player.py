@@ -1,20 +1,30 @@
-from typing import List
+from typing import List, Optional, Union
 from game_state import GameState
 from player_state import PlayerState
-from moves import MoveValidator
+from moves import Move, MoveValidator, DeltaMoveValidator
 from exception import MoveException
 
 class Player():
+    '''
+    A player's state over a game, and the checks applied to each move they
+    make. How a move is asked for is up to subclasses: SyncPlayer blocks
+    until it has one, AsyncNetworkPlayer waits on the event loop.
+    '''
     def __init__(self, name:str) -> None:
         self._player_state = PlayerState()
         self._prev_ps = PlayerState()
         self._name = name
+        self._last_move = None
         self.cheated = False
 
     @property
     def name(self):
         return self._name
 
+    @name.setter
+    def name(self, name: str) -> None:
+        self._name = name
+
     @property
     def player_state(self) -> PlayerState:
         '''
@@ -30,27 +40,41 @@ class Player():
     def player_state(self, player_state: PlayerState) -> None:
         self._player_state = player_state
 
-    def play_next_move(self, game_state: GameState) -> None:
+    @property
+    def last_move(self) -> Optional[Move]:
         '''
-        Given a GameState, get the player's next move and update self.player_state
-        their new PlayerState, or False if they cheated.
+        The Move made in the last turn, or None if the player cheated.
         '''
-        self._prev_ps = self._player_state
-        new_ps = self._get_next_player_state(game_state)
+        return self._last_move
 
+    def resolve_next_move(self, game_state: GameState, new_ps: Union[PlayerState, Move]) -> None:
+        '''
+        Validate the move the player returned for this turn and update
+        self.player_state, or mark the player as a cheater.
+        '''
+        self._prev_ps = self._player_state
+        self._last_move = None
         try:
-            MoveValidator(game_state, self._player_state, new_ps).validate_move()
+            if type(new_ps) == Move:
+                self._last_move = new_ps
+                new_ps = self._apply_move(game_state, new_ps)
+            else:
+                validator = MoveValidator(game_state, self._player_state, new_ps)
+                validator.validate_move()
+                self._last_move = validator.to_move()
             self._player_state = new_ps
         except MoveException:
+            self._last_move = None
             self._set_cheater()
 
-    def _get_next_player_state(self, game_state: GameState) -> PlayerState:
+    def _apply_move(self, game_state: GameState, move: Move) -> PlayerState:
         '''
-        Given a GameState, get the player's new player state. Returns
-        their new PlayerState, (or False if they disconnected or sent
-        an invalid PlayerState, only possible with the NetworkPlayer).
+        Validate the Move and return the PlayerState it results in. The move
+        is applied to a copy so prev_ps keeps the old state.
         '''
-        raise NotImplementedError()
+        new_ps = self._player_state.clone()
+        DeltaMoveValidator(game_state, new_ps, move).validate_move()
+        return new_ps
 
     def get_new_city_plan_scores(self) -> List[int]:
         '''
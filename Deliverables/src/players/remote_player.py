@@ -0,0 +1,121 @@
+import time
+from typing import *
+
+from . import Player, LatencyStats
+from game_state import GameState
+from player_state import PlayerState
+from moves import Move
+from exception import PlayerStateException, PlayerConnectionException, MoveException, my_assert
+from constants import FULL_PROTOCOL, DELTA_PROTOCOL, JSON_ENCODING, SUPPORTED_ENCODINGS
+
+class RemotePlayer(Player):
+    '''
+    The wire protocol shared by players on the other end of a connection,
+    independent of how the messages are sent.
+    '''
+    def __init__(self, name: str, protocol: str=FULL_PROTOCOL, turn_timeout: Optional[float]=None,
+            game_timeout: Optional[float]=None) -> None:
+        self._protocol = protocol
+        # the GameState dictionary last sent, so delta turns only send what changed
+        self._prev_gs_dict = None
+        # seconds to answer each turn, and to answer every turn of the game
+        # between them; None for no limit
+        self._turn_timeout = turn_timeout
+        self._game_timeout = game_timeout
+        self._latency = LatencyStats()
+        super().__init__(name)
+
+    @property
+    def protocol(self) -> str:
+        return self._protocol
+
+    @property
+    def latency(self) -> LatencyStats:
+        '''
+        How long this player took to answer each turn.
+        '''
+        return self._latency
+
+    def _next_timeout(self) -> Optional[float]:
+        '''
+        Returns the seconds this player has to answer this turn: the turn
+        timeout, or whatever is left of their time for the game if that's less.
+        '''
+        timeouts = [self._turn_timeout] if self._turn_timeout is not None else []
+        if self._game_timeout is not None:
+            timeouts.append(max(0.0, self._game_timeout - self._latency.total))
+        return min(timeouts, default=None)
+
+    @staticmethod
+    def _remaining(start: float, timeout: Optional[float]) -> Optional[float]:
+        '''
+        Returns what is left of timeout seconds started at start.
+        '''
+        return timeout - (time.monotonic() - start) if timeout is not None else None
+
+    def _record_turn(self, start: float, timed_out: bool=False) -> None:
+        self._latency.record(time.monotonic() - start, timed_out)
+
+    @staticmethod
+    def negotiate_protocol(sign_up, protocols: List[str],
+            encodings: List[str]=SUPPORTED_ENCODINGS) -> Tuple[str, str, str, Optional[Dict]]:
+        '''
+        Legacy clients sign up with just their name and use the full protocol
+        over JSON. Others send { "name": ..., "protocols": [...] }, and may
+        add "encodings": [...]; they are told which of each the server picked,
+        and both sides switch encoding after the reply. Returns the player's
+        name, their protocol and encoding, and the reply to send them, if any.
+        Raises a PlayerConnectionException if the name isn't a non-empty string.
+        '''
+        name = sign_up.get("name") if type(sign_up) == dict else sign_up
+        my_assert(type(name) == str and name != "",
+            PlayerConnectionException,
+            "A player must sign up with a non-empty name.")
+        if type(sign_up) != dict:
+            return name, FULL_PROTOCOL, JSON_ENCODING, None
+
+        protocol = RemotePlayer._choose(protocols, sign_up.get("protocols", []), FULL_PROTOCOL)
+        reply = { "protocol": protocol }
+        encoding = JSON_ENCODING
+        if "encodings" in sign_up:
+            encoding = reply["encoding"] = RemotePlayer._choose(encodings, sign_up["encodings"], JSON_ENCODING)
+        return name, protocol, encoding, reply
+
+    @staticmethod
+    def _choose(server_options: List[str], client_options: List[str], default: str) -> str:
+        '''
+        Returns the server's most preferred option the client also offered.
+        '''
+        for option in server_options:
+            if type(client_options) == list and option in client_options:
+                return option
+        return default
+
+    def _turn_request(self, game_state: GameState) -> Dict:
+        '''
+        The first turn, and every turn with the full protocol, sends both
+        states. Later delta turns only send the GameState fields that changed,
+        since the client can track its own PlayerState.
+        '''
+        gs_dict = game_state.to_dict()
+        prev_gs_dict = self._prev_gs_dict
+        self._prev_gs_dict = gs_dict
+        if self._protocol != DELTA_PROTOCOL or prev_gs_dict is None:
+            return {
+                "game-state": gs_dict,
+                "player-state": self._player_state.to_dict()
+            }
+
+        return { "game-state-delta": {key: val for key, val in gs_dict.items() if prev_gs_dict[key] != val} }
+
+    def _parse_response(self, response) -> Union[PlayerState, Move, bool]:
+        '''
+        Returns the PlayerState or Move the player sent, or False if it's invalid.
+        '''
+        try:
+            if self._protocol == DELTA_PROTOCOL and type(response) == dict and set(response.keys()) == set(["move"]):
+                return Move(response["move"])
+            return PlayerState(response)
+        # if player sends an invalid PlayerState or Move, they cheated
+        except (PlayerStateException, MoveException):
+            return False
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import *
+from . import SyncPlayer
+from game_state import GameState
+from moves import Move
+
+class ReplayPlayer(SyncPlayer):
+    '''
+    Plays back the moves a player made in a logged game, one round at a time.
+    '''
+    def __init__(self, name: str, moves: List[Union[Dict, bool, None]]) -> None:
+        self._moves = moves
+        self._round = 0
+        super().__init__(name)
+
+    def _get_next_player_state(self, game_state: GameState) -> Union[Move, bool]:
+        move = self._moves[self._round]
+        self._round += 1
+        # a player who cheated is logged as False, and is set as a cheater again
+        return Move(move) if move is not False else False
\ No newline at end of file
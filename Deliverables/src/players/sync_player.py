@@ -0,0 +1,32 @@
+from typing import Union
+from . import Player
+from game_state import GameState
+from player_state import PlayerState
+from moves import Move
+
+class SyncPlayer(Player):
+    '''
+    A Player whose moves are asked for with a blocking call.
+    '''
+    def play_next_move(self, game_state: GameState) -> None:
+        '''
+        Given a GameState, get the player's next move and update self.player_state
+        their new PlayerState, or False if they cheated.
+        '''
+        self.resolve_next_move(game_state, self.request_next_move(game_state))
+
+    def request_next_move(self, game_state: GameState) -> Union[PlayerState, Move]:
+        '''
+        First half of play_next_move: ask the player for their move, without
+        validating it or changing any state. Safe to run for several players
+        at once.
+        '''
+        return self._get_next_player_state(game_state)
+
+    def _get_next_player_state(self, game_state: GameState) -> Union[PlayerState, Move]:
+        '''
+        Given a GameState, get the player's new player state, or the Move
+        that leads to it. Returns False if they disconnected or sent an
+        invalid PlayerState or Move, only possible with the NetworkPlayer.
+        '''
+        raise NotImplementedError()
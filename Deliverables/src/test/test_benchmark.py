@@ -0,0 +1,50 @@
+import unittest
+import os
+import tempfile
+from benchmark import Benchmark, BenchmarkSuite, build_suite, compare, load_baseline, save_baseline
+
+class TestBenchmark(unittest.TestCase):
+    # setup runs before every round, with the number of calls in it
+    def test_setup_per_round(self):
+        numbers, calls = [], []
+        benchmark = Benchmark("append", calls.append, lambda number: numbers.append(number) or [(i,) for i in range(number)])
+        result = benchmark.run(rounds=3, min_round_time=0.0)
+        self.assertEqual(numbers, [1, 1, 1])
+        self.assertEqual(calls, [0, 0, 0])
+        self.assertEqual((result["calls"], result["rounds"]), (1, 3))
+        self.assertLessEqual(result["min"], result["mean"])
+
+    # quick calls are repeated until a round takes long enough, up to max_calls
+    def test_calibration(self):
+        result = Benchmark("noop", lambda: None).run(rounds=1, min_round_time=1.0, max_calls=500)
+        self.assertEqual(result["calls"], 500)
+
+    def test_unknown_benchmark(self):
+        suite = BenchmarkSuite()
+        suite.add("noop", lambda: None)
+        self.assertEqual(list(suite.run(min_round_time=0.0)), ["noop"])
+        self.assertRaises(KeyError, suite.run, ["missing"])
+
+    def test_compare(self):
+        baseline = { "a": { "min": 1.0 }, "b": { "min": 1.0 } }
+        results = { "a": { "min": 1.2 }, "b": { "min": 1.5 }, "new": { "min": 9.0 } }
+        regressions = compare(results, baseline, threshold=0.25)
+        self.assertEqual([name for name, _ in regressions], ["b"])
+        self.assertAlmostEqual(regressions[0][1], 0.5)
+        self.assertEqual(compare(results, baseline, threshold=0.1)[0][0], "a")
+
+    def test_baseline_round_trip(self):
+        results = { "a": { "min": 1e-6, "mean": 2e-6, "calls": 10, "rounds": 5 } }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "baseline.json")
+            save_baseline(results, path)
+            self.assertEqual(load_baseline(path), results)
+
+    # every hot path is covered, and the quick ones run
+    def test_suite(self):
+        suite = build_suite()
+        for name in ["player_state_from_dict", "player_state_to_dict_round_trip", "street_possible_home_locations",
+                "move_validator_fixtures", "calculate_score", "move_generator_SmartMoveGenerator", "game_server_game"]:
+            self.assertIn(name, suite.names)
+        results = suite.run(["calculate_score", "move_validator_fixtures"], rounds=1, min_round_time=0.0)
+        self.assertTrue(all(result["min"] > 0 for result in results.values()))
@@ -1,8 +1,40 @@
 import unittest
+import asyncio
+import functools
+import io
+import json
+import random
+import socket
+import threading
+import time
 from game_server import *
-from moves import CheatingMoveGenerator, SimpleMoveGenerator
-from players import LocalPlayer
-from constants import CONSTRUCTION_CARDS, CITY_PLAN_CARDS
+from player_client import PlayerClient
+from network import NetworkAdapter, AsyncNetworkAdapter, JsonCodec, BinaryCodec
+from exception import PlayerConnectionException, PlayerTimeoutException
+from moves import CheatingMoveGenerator, SimpleMoveGenerator, SmartMoveGenerator, SearchMoveGenerator
+from players import LocalPlayer, LatencyStats, RemotePlayer, SyncPlayer, NetworkPlayer, AsyncNetworkPlayer
+from constants import CONSTRUCTION_CARDS, CITY_PLAN_CARDS, DELTA_PROTOCOL, FULL_PROTOCOL, JSON_ENCODING, BINARY_ENCODING
+from player_state import PlayerState
+
+class SlowMoveGenerator(SimpleMoveGenerator):
+    '''
+    Takes delay seconds over every move.
+    '''
+    delay = 0.1
+
+    def generate_move(self):
+        time.sleep(self.delay)
+        return super().generate_move()
+
+class StalledMoveGenerator(SlowMoveGenerator):
+    delay = 1.0
+
+class BrokenMoveGenerator(SimpleMoveGenerator):
+    '''
+    Fails on every move.
+    '''
+    def generate_move(self):
+        raise RuntimeError("broken generator")
 
 class TestConstructionCardDeck(unittest.TestCase):
     def test_draw_construction_cards(self):
@@ -16,6 +48,45 @@ class TestConstructionCardDeck(unittest.TestCase):
         deck.draw_new_cards()
         self.assertEqual(deck.get_prev_card_effects(), prev_card_effects)
 
+    # every card is drawn once before the deck is reshuffled
+    def test_reshuffle(self):
+        deck = ConstructionCardDeck(CONSTRUCTION_CARDS)
+        drawn = deck.curr_cards
+        for _ in range(len(CONSTRUCTION_CARDS) // 3 - 1):
+            drawn += deck.draw_new_cards()
+        self.assertEqual(sorted(drawn), sorted(CONSTRUCTION_CARDS))
+        self.assertEqual(len(deck.draw_new_cards()), 3)
+
+    # with three piles, the cards showing at a reshuffle aren't shuffled back in
+    def test_three_piles(self):
+        deck = ConstructionCardDeck(CONSTRUCTION_CARDS, random.Random(0), three_piles=True)
+        for _ in range(len(CONSTRUCTION_CARDS) // 3 - 1):
+            deck.draw_new_cards()
+        showing = deck.curr_cards
+        drawn = []
+        for _ in range(len(CONSTRUCTION_CARDS) // 3 - 1):
+            drawn += deck.draw_new_cards()
+        self.assertEqual(sorted(drawn + showing), sorted(CONSTRUCTION_CARDS))
+
+    # the remaining cards are exactly the ones drawn before the next reshuffle
+    def test_remaining_cards(self):
+        for three_piles in [False, True]:
+            deck = ConstructionCardDeck(CONSTRUCTION_CARDS, random.Random(0), three_piles=three_piles)
+            deck.draw_new_cards()
+            remaining = deck.remaining_cards()
+            drawn = []
+            for _ in range(len(remaining) // 3):
+                drawn += deck.draw_new_cards()
+            self.assertEqual(sorted(drawn), sorted(remaining))
+
+    # a restored deck draws the same cards again
+    def test_snapshot_restore(self):
+        deck = ConstructionCardDeck(CONSTRUCTION_CARDS)
+        snapshot = deck.snapshot()
+        drawn = [deck.draw_new_cards() for _ in range(40)]
+        deck.restore(snapshot)
+        self.assertEqual([deck.draw_new_cards() for _ in range(40)], drawn)
+
 class TestCityPlanDeck(unittest.TestCase):
     def test_separate_cards(self):
         cp_list = [
@@ -82,6 +153,17 @@ class TestGameServer(unittest.TestCase):
             self.assertFalse(curr_player.cheated)
             self.assertNotEqual(curr_player.prev_ps, curr_player.player_state)
 
+    # local players' generators are given the cards left in the game's deck
+    def test_local_players_see_remaining_cards(self):
+        seen = []
+        def generator(game_state, player_state, rng=None, remaining_cards=None):
+            seen.append(remaining_cards)
+            return SimpleMoveGenerator(game_state, player_state, rng, remaining_cards)
+        game = Game(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=0)
+        game._add_local_players([("p1", generator)])
+        game._all_players_play_move()
+        self.assertEqual(seen, [game.game_state.to_dict()["construction-cards"] + game._cc_deck.remaining_cards()])
+
     def test_play_game(self):
         local_players = [
             ("p1", SimpleMoveGenerator),
@@ -122,5 +204,488 @@ class TestGameServer(unittest.TestCase):
                 self.assertFalse(score)
     
     
+class TestNetworkProtocols(unittest.TestCase):
+    def _play_network_game(self, client_protocols, generators, concurrent=False, client_encodings=None,
+            **server_kwargs):
+        '''
+        Start a GameServer in a thread, connect a PlayerClient per entry of
+        client_protocols, and play the game out. Returns the server and clients.
+        '''
+        client_encodings = client_encodings or [[JSON_ENCODING]] * len(client_protocols)
+        network_config = { "players": len(client_protocols), "port": 8090 }
+        result = {}
+        def run_server():
+            result["server"] = GameServer(network_config, [], CONSTRUCTION_CARDS, CITY_PLAN_CARDS,
+                concurrent=concurrent, **server_kwargs)
+            result["server"].play_game()
+
+        def run_client(client):
+            try:
+                client.play_game()
+            # the server hangs up on clients that cheat
+            except (PlayerConnectionException, ConnectionError):
+                pass
+
+        server_thread = threading.Thread(target=run_server)
+        server_thread.start()
+        clients, client_threads = [], []
+        for protocols, encodings, generator in zip(client_protocols, client_encodings, generators):
+            while True:
+                try:
+                    client = PlayerClient({ "host": "localhost", "port": 8090 }, generator, protocols, encodings)
+                    break
+                except ConnectionRefusedError:
+                    time.sleep(0.01)
+            clients.append(client)
+            client_threads.append(threading.Thread(target=run_client, args=(client,)))
+            client_threads[-1].start()
+
+        for thread in client_threads + [server_thread]:
+            thread.join()
+        return result["server"], clients
+
+    # a delta client and a legacy client play the same game
+    def test_delta_and_legacy_clients(self):
+        server, clients = self._play_network_game(
+            [[DELTA_PROTOCOL, FULL_PROTOCOL], [FULL_PROTOCOL]],
+            [SimpleMoveGenerator, SimpleMoveGenerator])
+        self.assertEqual([client.protocol for client in clients], [DELTA_PROTOCOL, FULL_PROTOCOL])
+        self.assertEqual(sorted(player.protocol for player in server.players), sorted([DELTA_PROTOCOL, FULL_PROTOCOL]))
+        self.assertTrue(server._is_game_over())
+        for curr_player in server.players:
+            self.assertFalse(curr_player.cheated)
+        # both clients tracked the same PlayerState the server did
+        delta_player = [player for player in server.players if player.protocol == DELTA_PROTOCOL][0]
+        self.assertEqual(clients[0]._player_state, delta_player.player_state)
+
+    # a cheating delta client is still caught
+    def test_delta_cheater(self):
+        server, _ = self._play_network_game(
+            [[DELTA_PROTOCOL], [DELTA_PROTOCOL]],
+            [SimpleMoveGenerator, CheatingMoveGenerator])
+        self.assertEqual(sorted(player.cheated for player in server.players), [False, True])
+    # moves collected concurrently are validated the same way, cheaters included
+    def test_concurrent_rounds(self):
+        server, clients = self._play_network_game(
+            [[DELTA_PROTOCOL], [FULL_PROTOCOL], [FULL_PROTOCOL]],
+            [SimpleMoveGenerator, SimpleMoveGenerator, CheatingMoveGenerator], concurrent=True)
+        self.assertTrue(server._is_game_over())
+        self.assertEqual(sorted(player.cheated for player in server.players), [False, False, True])
+        for client in clients[:2]:
+            self.assertIn(client._player_state, [player.player_state for player in server.players])
+
+    # binary and JSON clients play the same game, and a binary cheater is still caught
+    def test_binary_encoding(self):
+        server, clients = self._play_network_game(
+            [[DELTA_PROTOCOL], [FULL_PROTOCOL], [FULL_PROTOCOL]],
+            [SimpleMoveGenerator, SimpleMoveGenerator, CheatingMoveGenerator],
+            client_encodings=[[BINARY_ENCODING, JSON_ENCODING], [BINARY_ENCODING], [BINARY_ENCODING]])
+        self.assertEqual([client.encoding for client in clients], [BINARY_ENCODING] * 3)
+        self.assertEqual([player.encoding for player in server.players], [BINARY_ENCODING] * 3)
+        self.assertTrue(server._is_game_over())
+        self.assertEqual(sorted(player.cheated for player in server.players), [False, False, True])
+        for client in clients[:2]:
+            self.assertIn(client._player_state, [player.player_state for player in server.players])
+
+    # a player over the turn timeout is treated as a cheater, and the game goes on
+    def test_turn_timeout(self):
+        server, _ = self._play_network_game(
+            [[FULL_PROTOCOL], [FULL_PROTOCOL]], [SimpleMoveGenerator, StalledMoveGenerator], turn_timeout=0.5)
+        self.assertTrue(server._is_game_over())
+        fast_player, slow_player = sorted(server.players, key=lambda player: player.cheated)
+        self.assertEqual([fast_player.cheated, slow_player.cheated], [False, True])
+        self.assertEqual(slow_player.latency.count, 1)
+        self.assertEqual(slow_player.latency.timeouts, 1)
+        self.assertGreater(fast_player.latency.count, 1)
+        self.assertEqual(fast_player.latency.timeouts, 0)
+
+    # a player's turns share one budget for the game: no single turn takes
+    # it all, but a few do
+    def test_game_timeout(self):
+        server, _ = self._play_network_game(
+            [[FULL_PROTOCOL], [FULL_PROTOCOL]], [SimpleMoveGenerator, SlowMoveGenerator], game_timeout=0.5)
+        player = [player for player in server.players if player.cheated][0]
+        self.assertEqual(player.latency.timeouts, 1)
+        self.assertGreater(player.latency.count, 1)
+
+    # a connection that never signs up doesn't hold up the players who do
+    def test_silent_sign_up(self):
+        result = {}
+        def run_server():
+            result["server"] = GameServer({ "players": 1, "port": 8093 }, [], CONSTRUCTION_CARDS, CITY_PLAN_CARDS,
+                turn_timeout=0.05)
+            result["server"].play_game()
+
+        server_thread = threading.Thread(target=run_server)
+        server_thread.start()
+        while True:
+            try:
+                silent_sock = socket.create_connection(("localhost", 8093))
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.01)
+        client = PlayerClient({ "host": "localhost", "port": 8093 }, SimpleMoveGenerator)
+        client.play_game()
+        server_thread.join()
+        silent_sock.close()
+        self.assertEqual(len(result["server"].players), 1)
+        self.assertFalse(result["server"].players[0].cheated)
+
+    # a sign up whose name isn't a non-empty string is refused
+    def test_sign_up_name(self):
+        self.assertEqual(RemotePlayer.negotiate_protocol("p1", [FULL_PROTOCOL])[0], "p1")
+        for sign_up in [["x"], "", None, 5, { "protocols": [FULL_PROTOCOL] }, { "name": ["x"] }, { "name": "" }]:
+            with self.assertRaises(PlayerConnectionException):
+                RemotePlayer.negotiate_protocol(sign_up, [FULL_PROTOCOL])
+
+    def test_latency_stats(self):
+        stats = LatencyStats()
+        for seconds in [0.3, 0.1, 0.2, 0.4]:
+            stats.record(seconds)
+        stats.record(1.0, timed_out=True)
+        self.assertEqual(stats.to_dict(), { "count": 5, "mean": 0.4, "p95": 1.0, "max": 1.0, "timeouts": 1 })
+        self.assertEqual(stats.percentile(50), 0.3)
+
+class TestCodecs(unittest.TestCase):
+    def setUp(self):
+        self.msg = {
+            "game-state": { "effects": ["bis", "pool"], "city-plans-won": [False, True, None] },
+            "player-state": PlayerState().to_dict(),
+            "numbers": [0, 255, 256, -1, 2 ** 70, 1.5, "x" * 300, "\u00e9"]
+        }
+
+    # both codecs decode exactly what was encoded, and binary packs the PlayerState
+    def test_round_trip(self):
+        json_payload = JsonCodec().encode(self.msg)
+        binary_payload = BinaryCodec().encode(self.msg)
+        self.assertEqual(JsonCodec().decode(memoryview(json_payload)), self.msg)
+        self.assertEqual(BinaryCodec().decode(memoryview(binary_payload)), self.msg)
+        self.assertLess(len(binary_payload), len(json_payload) / 2)
+
+    # a PlayerState that breaks the rules is sent as it is, for the receiver to reject
+    def test_invalid_player_state(self):
+        self.msg["player-state"]["temps"] = 12
+        self.assertEqual(BinaryCodec().decode(memoryview(BinaryCodec().encode(self.msg))), self.msg)
+
+    def test_invalid_message(self):
+        payload = BinaryCodec().encode(self.msg)
+        for bad_payload in [payload[:-1], payload + b"\x00", b"\xff", b""]:
+            with self.assertRaises(ValueError):
+                BinaryCodec().decode(memoryview(bad_payload))
+
+class TestNetworkAdapter(unittest.TestCase):
+    def setUp(self):
+        self.sock, self.peer = socket.socketpair()
+        self.network = NetworkAdapter(self.sock, max_frame_size=64)
+
+    def tearDown(self):
+        self.sock.close()
+        self.peer.close()
+
+    # messages split across reads, or sent together, come out one at a time
+    def test_framing(self):
+        self.peer.sendall(b'{"a": ')
+        self.peer.sendall(b'1}\n[1, 2]\n"x')
+        self.assertEqual(self.network.recv(), {"a": 1})
+        self.assertEqual(self.network.recv(), [1, 2])
+        self.peer.sendall(b'y"\n')
+        self.assertEqual(self.network.recv(), "xy")
+
+    # messages already buffered don't wait on the socket
+    def test_buffered(self):
+        self.peer.sendall(b'1\n2\n3\n')
+        self.assertEqual(self.network.recv(), 1)
+        self.sock.setblocking(False)
+        self.assertEqual([self.network.recv(), self.network.recv()], [2, 3])
+
+    # the buffer grows for long messages, up to the maximum frame size
+    def test_max_frame_size(self):
+        long_msg = "a" * 60
+        self.peer.sendall(f'"{ long_msg }"\n'.encode() * 3)
+        self.assertEqual([self.network.recv() for _ in range(3)], [long_msg] * 3)
+        self.peer.sendall(b'"' + b"a" * 100)
+        with self.assertRaises(PlayerConnectionException):
+            self.network.recv()
+
+    # binary frames are length-prefixed, and the encoding can change between messages
+    def test_binary_frames(self):
+        self.peer.sendall(b'"json"\n' + BinaryCodec().frame({"a": [1, "b"]}) + BinaryCodec().frame("\n"))
+        self.assertEqual(self.network.recv(), "json")
+        self.network.set_encoding(BINARY_ENCODING)
+        self.assertEqual(self.network.recv(), {"a": [1, "b"]})
+        self.assertEqual(self.network.recv(), "\n")
+        self.peer.sendall(BinaryCodec().frame("a" * 100))
+        with self.assertRaises(PlayerConnectionException):
+            self.network.recv()
+
+    def test_timeout(self):
+        self.peer.sendall(b'[1, 2')
+        with self.assertRaises(PlayerTimeoutException):
+            self.network.recv(0.05)
+        self.peer.sendall(b']\n')
+        self.assertEqual(self.network.recv(0.05), [1, 2])
+
+    def test_disconnect(self):
+        self.peer.sendall(b'[1, 2')
+        self.peer.close()
+        with self.assertRaises(PlayerConnectionException):
+            self.network.recv()
+
+    # a peer that stops reading makes send raise a PlayerTimeoutException
+    def test_send_timeout(self):
+        self.network.send([1, 2], 0.05)
+        self.assertEqual(self.peer.recv(16), b'[1, 2]\n')
+        with self.assertRaises(PlayerTimeoutException):
+            # far more than the socket buffers hold
+            self.network.send("x" * (1 << 24), 0.05)
+
+class TestAsyncGameServer(unittest.TestCase):
+    # one event loop hosts several games, each with its own network players
+    def test_many_games(self):
+        server = AsyncGameServer({ "players": 2, "port": 8091 }, [("local", SimpleMoveGenerator)],
+            CONSTRUCTION_CARDS, CITY_PLAN_CARDS)
+        server_thread = threading.Thread(target=asyncio.run, args=(server.serve(3),))
+        server_thread.start()
+        client_threads = []
+        for i in range(6):
+            while True:
+                try:
+                    client = PlayerClient({ "host": "localhost", "port": 8091 }, SimpleMoveGenerator,
+                        [DELTA_PROTOCOL] if i % 2 else [FULL_PROTOCOL],
+                        [BINARY_ENCODING] if i % 3 == 0 else [JSON_ENCODING])
+                    break
+                except ConnectionRefusedError:
+                    time.sleep(0.01)
+            client_threads.append(threading.Thread(target=client.play_game))
+            client_threads[-1].start()
+
+        for thread in client_threads + [server_thread]:
+            thread.join()
+        self.assertEqual(len(server.results), 3)
+        for scores in server.results:
+            self.assertEqual(scores[2][0], "local")
+            self.assertTrue(all(type(score) == int for _, score in scores))
+        # every client signed up as team23, but each gets its own name
+        network_names = [name for scores in server.results for name, _ in scores[:2]]
+        self.assertEqual(sorted(network_names), sorted(["team23"] + [f"team23-{i}" for i in range(2, 7)]))
+
+    # a slow local player doesn't hold up another game on the same loop
+    def test_slow_local_player(self):
+        released = threading.Event()
+        waits = []
+
+        class BlockingMoveGenerator(SimpleMoveGenerator):
+            # blocks until the other game is over, or for a second if the loop is stuck
+            def generate_move(self):
+                waits.append(released.wait(1))
+                return super().generate_move()
+
+        async def run():
+            slow_game = AsyncGame(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=1)
+            slow_game._add_local_players([("slow", BlockingMoveGenerator)])
+            fast_game = AsyncGame(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=2)
+            fast_game._add_local_players([("fast", SimpleMoveGenerator)])
+
+            async def play_then_release():
+                await fast_game.play_game()
+                released.set()
+            await asyncio.gather(slow_game.play_game(), play_then_release())
+
+        asyncio.run(run())
+        self.assertTrue(waits)
+        self.assertTrue(all(waits))
+
+    # a game that fails still counts as over, and its players are hung up on
+    def test_failed_game(self):
+        server = AsyncGameServer({ "players": 1, "port": 8094 }, [("broken", BrokenMoveGenerator)],
+            CONSTRUCTION_CARDS, CITY_PLAN_CARDS)
+        server_thread = threading.Thread(target=asyncio.run, args=(server.serve(1),), daemon=True)
+        server_thread.start()
+        while True:
+            try:
+                client = PlayerClient({ "host": "localhost", "port": 8094 }, SimpleMoveGenerator)
+                break
+            except ConnectionRefusedError:
+                time.sleep(0.01)
+
+        errors = []
+        def play():
+            try:
+                client.play_game()
+            except PlayerConnectionException as err:
+                errors.append(err)
+        client_thread = threading.Thread(target=play, daemon=True)
+        client_thread.start()
+
+        server_thread.join(10)
+        client_thread.join(10)
+        self.assertFalse(server_thread.is_alive())
+        self.assertEqual(server.results, [])
+        self.assertEqual(len(errors), 1)
+
+    # connections that sign up without a proper name are hung up on, and
+    # don't stop others from playing
+    def test_bad_sign_up(self):
+        server = AsyncGameServer({ "players": 1, "port": 8095 }, [("local", SimpleMoveGenerator)],
+            CONSTRUCTION_CARDS, CITY_PLAN_CARDS)
+        server_thread = threading.Thread(target=asyncio.run, args=(server.serve(1),), daemon=True)
+        server_thread.start()
+        for sign_up in [b'["x"]\n', b'{"protocols": ["full"]}\n']:
+            while True:
+                try:
+                    bad_sock = socket.create_connection(("localhost", 8095))
+                    break
+                except ConnectionRefusedError:
+                    time.sleep(0.01)
+            bad_sock.settimeout(5)
+            bad_sock.sendall(sign_up)
+            self.assertEqual(bad_sock.recv(1024), b"")
+            bad_sock.close()
+
+        client = PlayerClient({ "host": "localhost", "port": 8095 }, SimpleMoveGenerator)
+        client.play_game()
+        server_thread.join(10)
+        self.assertEqual(len(server.results), 1)
+
+    # only players with a blocking way to ask for a move have one
+    def test_sync_players(self):
+        self.assertTrue(issubclass(LocalPlayer, SyncPlayer) and issubclass(NetworkPlayer, SyncPlayer))
+        self.assertFalse(issubclass(AsyncNetworkPlayer, SyncPlayer))
+        self.assertFalse(hasattr(AsyncNetworkPlayer, "request_next_move"))
+
+    # a player that hangs up makes recv raise a PlayerConnectionException
+    def test_async_adapter_disconnect(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"a": 1}\n[1, 2')
+            reader.feed_eof()
+            network = AsyncNetworkAdapter(reader, None)
+            self.assertEqual(await network.recv(), {"a": 1})
+            with self.assertRaises(PlayerConnectionException):
+                await network.recv()
+        asyncio.run(run())
+
+    # a player that stops reading makes send raise a PlayerTimeoutException
+    def test_async_adapter_send_timeout(self):
+        async def run():
+            sock, peer = socket.socketpair()
+            reader, writer = await asyncio.open_connection(sock=sock)
+            network = AsyncNetworkAdapter(reader, writer)
+            with self.assertRaises(PlayerTimeoutException):
+                await network.send("x" * (1 << 24), 0.05)
+            writer.transport.abort()
+            peer.close()
+        asyncio.run(run())
+
+    # a player that goes quiet makes recv raise a PlayerTimeoutException
+    def test_async_adapter_timeout(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b'{"a": 1}\n[1, 2')
+            network = AsyncNetworkAdapter(reader, None)
+            self.assertEqual(await network.recv(0.05), {"a": 1})
+            with self.assertRaises(PlayerTimeoutException):
+                await network.recv(0.05)
+        asyncio.run(run())
+
+class TestTournament(unittest.TestCase):
+    # wins go to the best score in each game, and cheaters score nothing
+    def test_leaderboard(self):
+        leaderboard = Leaderboard()
+        leaderboard.record([["a", 10], ["b", 20], ["c", False]])
+        leaderboard.record([["a", 30], ["b", 30], ["c", 5]])
+        standings = leaderboard.standings()
+        self.assertEqual([stats["name"] for stats in standings], ["b", "a", "c"])
+        self.assertEqual(standings[0], { "name": "b", "games": 2, "wins": 2, "cheated": 0, "average-score": 25 })
+        self.assertEqual(standings[2]["cheated"], 1)
+        self.assertEqual(standings[2]["average-score"], 5)
+        self.assertRaises(ValueError, leaderboard.record, [["a", 10], ["a", 20]])
+
+    # games start as players arrive, and each result is streamed out
+    def test_tournament_server(self):
+        results_stream = io.StringIO()
+        server = TournamentServer({ "players": 2, "port": 8092 }, results_stream=results_stream)
+        server_thread = threading.Thread(target=asyncio.run, args=(server.serve(2),))
+        server_thread.start()
+        client_threads = []
+        for i in range(4):
+            while True:
+                try:
+                    client = PlayerClient({ "host": "localhost", "port": 8092 }, SimpleMoveGenerator)
+                    break
+                except ConnectionRefusedError:
+                    time.sleep(0.01)
+            client_threads.append(threading.Thread(target=client.play_game))
+            client_threads[-1].start()
+
+        for thread in client_threads + [server_thread]:
+            thread.join()
+        lines = [json.loads(line) for line in results_stream.getvalue().splitlines()]
+        self.assertEqual([line["game"] for line in lines], [1, 2])
+        # all four clients signed up as team23, and each has their own stats
+        standings = server.leaderboard.standings()
+        self.assertEqual(sorted(stats["name"] for stats in standings), ["team23", "team23-2", "team23-3", "team23-4"])
+        self.assertTrue(all(stats["games"] == 1 for stats in standings))
+        # a tie gives every tied player a win
+        self.assertGreaterEqual(sum(stats["wins"] for stats in standings), 2)
+
+class TestSimulator(unittest.TestCase):
+    local_players = [("simple", SimpleMoveGenerator), ("smart", SmartMoveGenerator)]
+
+    # games are played without a server, one result per seed
+    def test_run_in_process(self):
+        results = Simulator(self.local_players, processes=1).run(3, seed=5)
+        self.assertEqual([seed for seed, _ in results.game_scores], [5, 6, 7])
+        for _, scores in results.game_scores:
+            self.assertEqual([name for name, _ in scores], ["simple", "smart"])
+        self.assertEqual(set(results.win_rates().keys()), set(["simple", "smart"]))
+
+    # the same seed replays the same game, in a pool or not
+    def test_seeded_pool(self):
+        pooled = Simulator(self.local_players, processes=2).run(4, seed=11)
+        self.assertEqual(pooled.game_scores[2][1], simulate_game(self.local_players, 13))
+
+    # a player that picks moves at random gets its rng from the seed too
+    def test_seeded_search_player(self):
+        local_players = [("search", functools.partial(SearchMoveGenerator, iterations=20)), ("simple", SimpleMoveGenerator)]
+        game1 = Game(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=4, log_stream=io.StringIO())
+        game1._add_local_players(local_players)
+        game1.play_game()
+        game2 = Game(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=4, log_stream=io.StringIO())
+        game2._add_local_players(local_players)
+        game2.play_game()
+        self.assertEqual(game1.game_log.rounds, game2.game_log.rounds)
+
+class TestGameLog(unittest.TestCase):
+    local_players = [("simple", SimpleMoveGenerator), ("smart", SmartMoveGenerator), ("cheater", CheatingMoveGenerator)]
+
+    # decks with equally seeded RNGs draw the same cards
+    def test_seeded_decks(self):
+        deck1 = ConstructionCardDeck(CONSTRUCTION_CARDS, random.Random(3))
+        deck2 = ConstructionCardDeck(CONSTRUCTION_CARDS, random.Random(3))
+        for _ in range(30):
+            self.assertEqual(deck1.draw_new_cards(), deck2.draw_new_cards())
+        self.assertEqual(CityPlanDeck(CITY_PLAN_CARDS, random.Random(3)).draw_new_cards(),
+            CityPlanDeck(CITY_PLAN_CARDS, random.Random(3)).draw_new_cards())
+
+    # the log streamed out of a game replays it exactly, round by round
+    def test_replay(self):
+        log_stream = io.StringIO()
+        game = Game(CONSTRUCTION_CARDS, CITY_PLAN_CARDS, seed=42, log_stream=log_stream)
+        game._add_local_players(self.local_players)
+        game._all_players_play_move()
+        game_state = game.game_state.to_dict()
+        player_states = [curr_player.player_state for curr_player in game.players]
+        scores = game.play_game()
+
+        replay = GameReplay(GameLog.from_lines(log_stream.getvalue().splitlines()))
+        self.assertEqual(replay.num_rounds, len(game.game_log.rounds))
+        replay_gs, replay_pss = replay.state_at(1)
+        self.assertEqual(replay_gs.to_dict(), game_state)
+        self.assertEqual(replay_pss, player_states)
+        self.assertEqual(replay.final_scores(), scores)
+        # the cheater is out after the first round
+        self.assertEqual([curr_round[2] for curr_round in game.game_log.rounds[:2]], [False, None])
+
 if __name__ == "__main__":
     unittest.main()
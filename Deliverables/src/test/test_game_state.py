@@ -1,6 +1,9 @@
 import unittest
+from copy import deepcopy
 from game_state import *
+from player_state import *
 from exception import *
+from constants import EMPTY_PS
 
 class TestCityPlan(unittest.TestCase):
     def test_valid_cp(self):
@@ -160,6 +163,108 @@ class TestConstructionCards(unittest.TestCase):
         with self.assertRaises(ConstructionCardException):
             ConstructionCard(ccards_lst)
 
+class TestCriteria(unittest.TestCase):
+    # numeric criteria are matched without changing the estates given
+    def test_num_criteria_no_mutation(self):
+        criteria = Criteria([1, 1, 3], 1)
+        estates = {1: 2, 3: 1, 4: 1}
+        ps = PlayerState(deepcopy(EMPTY_PS))
+        self.assertTrue(criteria.is_satisfied(ps, estates))
+        self.assertEqual(estates, {1: 2, 3: 1, 4: 1})
+        self.assertFalse(criteria.is_satisfied(ps, {1: 1, 3: 1}))
+
+    def test_special_criteria(self):
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["temps"] = 7
+        self.assertTrue(Criteria("7 temps", 1).is_satisfied(PlayerState(ps_dict), {}))
+        self.assertFalse(Criteria("end houses", 1).is_satisfied(PlayerState(ps_dict), {}))
+
+
+class TestCityPlanIndex(unittest.TestCase):
+    def setUp(self):
+        self.gs = GameState({
+            "city-plans": [
+                {"criteria": "7 temps", "position": 1, "score1": 6, "score2": 3},
+                {"criteria": [2, 3], "position": 2, "score1": 11, "score2": 6},
+                {"criteria": [1, 1, 1, 1, 1, 1], "position": 3, "score1": 8, "score2": 4}],
+            "city-plans-won": [False, True, False],
+            "construction-cards": [[7, "bis"], [3, "pool"], [10, "temp"]],
+            "effects": ["surveyor", "pool", "temp"]})
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["streets"][0]["homes"] = [1, False, [False, 2, False], [True, 3, False], [False, 4, False],
+            [False, 5, False], [True, 6, False]] + EMPTY_PS["streets"][0]["homes"][7:]
+        self.ps = PlayerState(ps_dict)
+
+    # the estates open to a plan, and the homes to mark for it
+    def test_claimable(self):
+        index = CityPlanIndex(self.gs, self.ps)
+        self.assertEqual(index.claimable(1), [[0, 0], [0, 1], [0, 2], [0, 3], [0, 4]])
+        self.assertIsNone(index.claimable(0))
+        self.assertIsNone(index.claimable(2))
+        self.assertEqual(index.claimable_plans(), [1])
+        self.assertEqual(index.score(1), 6)
+
+    # the index follows changes to the PlayerState
+    def test_updated_on_change(self):
+        index = CityPlanIndex(self.gs, self.ps)
+        self.assertEqual(index.claimable_plans(), [1])
+        self.ps.streets[0].homes[1].in_plan = True
+        self.assertEqual(index.claimable_plans(), [])
+        self.ps.temps = 7
+        self.assertEqual(index.claimable(0), [])
+        self.ps.city_plan_score = [6, "blank", "blank"]
+        self.assertIsNone(index.claimable(0))
+
+    # a move's new marks must be exactly the estates of the plans it claims
+    def test_matches_claims(self):
+        estates = [[0, 0], [0, 1], [0, 2], [0, 3], [0, 4]]
+        for posn in estates:
+            self.ps.streets[0].homes[posn[1]].in_plan = True
+        self.ps.city_plan_score = ["blank", 6, "blank"]
+        self.assertTrue(CityPlanIndex(self.gs, self.ps, estates).matches_claims([1]))
+        self.assertFalse(CityPlanIndex(self.gs, self.ps, estates).matches_claims([]))
+        self.assertFalse(CityPlanIndex(self.gs, self.ps, estates[1:]).matches_claims([1]))
+        self.assertFalse(CityPlanIndex(self.gs, self.ps, estates + [[0, 5]]).matches_claims([1]))
+
+class TestEstatePlanSolver(unittest.TestCase):
+    def setUp(self):
+        self.gs = GameState({
+            "city-plans": [
+                {"criteria": [1, 2], "position": 1, "score1": 8, "score2": 4},
+                {"criteria": [2, 3], "position": 2, "score1": 11, "score2": 6},
+                {"criteria": [1, 1, 1, 1, 1, 1], "position": 3, "score1": 9, "score2": 5}],
+            "city-plans-won": [False, False, False],
+            "construction-cards": [[7, "bis"], [3, "pool"], [10, "temp"]],
+            "effects": ["surveyor", "pool", "temp"]})
+        # estates of size 1, 2 and 3 on the first street
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["streets"][0]["homes"] = [1, False, [True, 2, False], [False, 3, False], [True, 4, False],
+            [False, 5, False], [False, 6, False], [True, "blank", False]] + EMPTY_PS["streets"][0]["homes"][8:]
+        self.ps = PlayerState(ps_dict)
+
+    # only one plan can have the size 2 estate, so the one worth more is claimed
+    def test_best_plans(self):
+        city_plans, in_plan = EstatePlanSolver(self.gs).solve(self.ps)
+        self.assertEqual(city_plans, [[1, 11]])
+        self.assertEqual(in_plan, [[0, 1], [0, 2], [0, 3], [0, 4], [0, 5]])
+
+    # nothing to claim once the estates are used
+    def test_no_claims(self):
+        self.ps.city_plan_score = ["blank", 11, "blank"]
+        for k in range(1, 6):
+            self.ps.streets[0].homes[k].in_plan = True
+        self.assertEqual(EstatePlanSolver(self.gs).solve(self.ps), ([], []))
+
+    # the memo holds one entry per estate counts, and is cleared once plans are won
+    def test_memo(self):
+        solver = EstatePlanSolver(self.gs)
+        solver.solve(self.ps)
+        solver.solve(self.ps.clone())
+        self.assertEqual(len(solver._memo), 1)
+        # plan 1 is only worth 6 once won, less than plan 0's 8
+        self.gs.city_plans_won = [False, True, False]
+        city_plans, _ = solver.solve(self.ps)
+        self.assertEqual(city_plans, [[0, 8]])
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,281 @@
+import threading
+import unittest
+import random
+import time
+from copy import deepcopy
+from moves import *
+from game_state import *
+from player_state import *
+from exception import *
+from constants import EMPTY_PS, CONSTRUCTION_CARDS, CITY_PLAN_CARDS
+
+GS_DICT = {
+    "city-plans": [
+        {"criteria": [1, 1, 1, 1, 1, 1], "position": 1, "score1": 8, "score2": 4},
+        {"criteria": [1, 1, 1, 6], "position": 2, "score1": 11, "score2": 6},
+        {"criteria": [1, 2, 6], "position": 3, "score1": 12, "score2": 7}],
+    "city-plans-won": [False, False, False],
+    "construction-cards": [[7, "bis"], [3, "pool"], [10, "temp"]],
+    "effects": ["surveyor", "pool", "temp"]
+}
+
+class TestMove(unittest.TestCase):
+    # a move survives a round trip through its dictionary
+    def test_round_trip(self):
+        move_dict = {"house": [0, 2, 7], "fence": [0, 3], "in-plan": [], "city-plans": []}
+        move = Move(move_dict)
+        self.assertEqual(Move(move.to_dict()), move)
+        self.assertEqual(move.effect, "surveyor")
+
+    # house numbers and positions must be on the board
+    def test_invalid_house(self):
+        with self.assertRaises(MoveException):
+            Move({"house": [0, 10, 7]})
+        with self.assertRaises(MoveException):
+            Move({"house": [0, 2, 18]})
+
+    # a fence can't be built to the left of the first home
+    def test_invalid_fence(self):
+        with self.assertRaises(MoveException):
+            Move({"house": [0, 2, 7], "fence": [0, 0]})
+
+    # a move using two effects has no single effect
+    def test_multiple_effects(self):
+        move = Move({"house": [0, 2, 7], "temp": True, "agent": 1})
+        with self.assertRaises(MoveException):
+            move.effect
+
+
+class TestDeltaMoveValidator(unittest.TestCase):
+    def setUp(self):
+        self.gs = GameState(GS_DICT)
+        self.ps = PlayerState(deepcopy(EMPTY_PS))
+
+    # a valid house and fence are applied in place
+    def test_valid_move_applied(self):
+        move = Move({"house": [0, 2, 7], "fence": [0, 3]})
+        DeltaMoveValidator(self.gs, self.ps, move).validate_move()
+        self.assertEqual(self.ps.streets[0].homes[2].num, 7)
+        self.assertTrue(self.ps.streets[0].homes[3].fence_left)
+        self.assertTrue(self.ps.streets[0].homes[2].fence_right)
+
+    # a pool built on the new house
+    def test_valid_pool(self):
+        move = Move({"house": [0, 2, 3], "pool": [0, 0]})
+        DeltaMoveValidator(self.gs, self.ps, move).validate_move()
+        self.assertEqual(self.ps.streets[0].pools, [True, False, False])
+
+    # an invalid move raises and leaves the PlayerState unchanged
+    def test_invalid_move_reverted(self):
+        before = self.ps.to_dict()
+        move = Move({"house": [0, 5, 3], "pool": [0, 0]})
+        with self.assertRaises(MoveException):
+            DeltaMoveValidator(self.gs, self.ps, move).validate_move()
+        self.assertEqual(self.ps.to_dict(), before)
+
+    # the house number must match one of the cards
+    def test_wrong_card(self):
+        with self.assertRaises(MoveException):
+            DeltaMoveValidator(self.gs, self.ps, Move({"house": [0, 2, 8]})).validate_move()
+
+    # a refusal is invalid when a house can be placed
+    def test_invalid_refusal(self):
+        with self.assertRaises(MoveException):
+            DeltaMoveValidator(self.gs, self.ps, Move.refusal_move()).validate_move()
+
+    # undo_move restores the original PlayerState
+    def test_undo_move(self):
+        before = self.ps.to_dict()
+        validator = DeltaMoveValidator(self.gs, self.ps, Move({"house": [1, 0, 10], "temp": True}))
+        validator.validate_move()
+        self.assertEqual(self.ps.temps, 1)
+        validator.undo_move()
+        self.assertEqual(self.ps.to_dict(), before)
+
+    # the Move extracted by MoveValidator rebuilds the same PlayerState
+    def test_agrees_with_move_validator(self):
+        ps2 = PlayerState(self.ps.to_dict())
+        ps2.streets[0].homes[2].num = 7
+        ps2.streets[0].homes[2].fence_right = True
+        ps2.streets[0].homes[3].fence_left = True
+        validator = MoveValidator(self.gs, self.ps, ps2)
+        validator.validate_move()
+        DeltaMoveValidator(self.gs, self.ps, validator.to_move()).validate_move()
+        self.assertEqual(self.ps, ps2)
+
+    # the score delta matches applying the move, which is then undone
+    def test_score_delta(self):
+        before = self.ps.to_dict()
+        move = Move({"house": [0, 2, 3], "pool": [0, 0]})
+        delta = DeltaMoveValidator(self.gs, self.ps, move).score_delta([])
+        self.assertEqual(self.ps.to_dict(), before)
+        new_ps = self.ps.clone()
+        DeltaMoveValidator(self.gs, new_ps, move).validate_move()
+        self.assertEqual(delta, new_ps.calculate_score([]) - self.ps.calculate_score([]))
+        self.assertEqual(delta, 3)
+
+    # the solver's city plan claims are accepted along with a house
+    def test_estate_plan_solver_claims(self):
+        ps_dict = deepcopy(EMPTY_PS)
+        # six estates of size 1
+        ps_dict["streets"][0]["homes"] = [0, False] + [[True, k, False] for k in range(1, 6)] + \
+            [[True, "blank", False]] + EMPTY_PS["streets"][0]["homes"][8:]
+        ps = PlayerState(ps_dict)
+        city_plans, in_plan = EstatePlanSolver(self.gs).solve(ps)
+        self.assertEqual(city_plans, [[0, 8]])
+        move = Move({"house": [1, 0, 3], "in-plan": in_plan, "city-plans": city_plans})
+        DeltaMoveValidator(self.gs, ps, move).validate_move()
+        self.assertEqual(ps.city_plan_score, [8, "blank", "blank"])
+
+class TestTranspositionTable(unittest.TestCase):
+    # the least recently used entry is dropped once the table is full
+    def test_lru(self):
+        table = TranspositionTable(max_size=2)
+        table.put(1, "a")
+        table.put(2, "b")
+        self.assertEqual(table.get(1), "a")
+        table.put(3, "c")
+        self.assertNotIn(2, table)
+        self.assertEqual(table.get(1), "a")
+        self.assertEqual(len(table), 2)
+        self.assertEqual((table.hits, table.misses), (2, 0))
+
+    # threads sharing a table don't lose lookups or overfill it
+    def test_threads(self):
+        table = TranspositionTable(max_size=50)
+        def search(offset):
+            for key in range(offset, offset + 2000):
+                if table.get(key % 100) is None:
+                    table.put(key % 100, key)
+        threads = [threading.Thread(target=search, args=(offset,)) for offset in range(0, 800, 100)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(table.hits + table.misses, 8 * 2000)
+        self.assertLessEqual(len(table), 50)
+
+class TestSearchMoveGenerator(unittest.TestCase):
+    def setUp(self):
+        self.gs = GameState(GS_DICT)
+        self.ps = PlayerState(deepcopy(EMPTY_PS))
+
+    # the move found is legal, and the state it came from is unchanged
+    def test_valid_move(self):
+        new_ps = SearchMoveGenerator(self.gs, self.ps, iterations=30, rng=random.Random(0)).generate_move()
+        MoveValidator(self.gs, self.ps, new_ps).validate_move()
+        self.assertEqual(self.ps, PlayerState(deepcopy(EMPTY_PS)))
+
+    # the search stops once its time budget is used up
+    def test_time_budget(self):
+        start = time.monotonic()
+        SearchMoveGenerator(self.gs, self.ps, iterations=10 ** 6, time_budget=0.2).generate_move()
+        self.assertLess(time.monotonic() - start, 2)
+
+    # rollouts draw from the remaining cards it's given
+    def test_remaining_cards(self):
+        remaining = [[3, "pool"]] * 6
+        generator = SearchMoveGenerator(self.gs, self.ps, iterations=5, rng=random.Random(0), remaining_cards=remaining)
+        self.assertEqual(generator._future_cards, remaining)
+        MoveValidator(self.gs, self.ps, generator.generate_move()).validate_move()
+
+    # effects that score points are used, not just plain houses
+    def test_uses_effects(self):
+        new_ps = SearchMoveGenerator(self.gs, self.ps, iterations=30, rng=random.Random(0)).generate_move()
+        validator = MoveValidator(self.gs, self.ps, new_ps)
+        validator.validate_move()
+        self.assertIsNotNone(validator.to_move().effect)
+
+class TestLegalMoveEnumerator(unittest.TestCase):
+    def setUp(self):
+        self.gs = GameState(GS_DICT)
+        self.ps = PlayerState(deepcopy(EMPTY_PS))
+
+    def _random_turns(self, rng: random.Random, num_turns: int):
+        '''
+        Plays num_turns random legal moves with random cards, yielding the
+        GameState and PlayerState before each one.
+        '''
+        city_plans = [rng.choice([cp for cp in CITY_PLAN_CARDS if cp["position"] == posn]) for posn in [1, 2, 3]]
+        ps = PlayerState(deepcopy(EMPTY_PS))
+        for _ in range(num_turns):
+            gs = GameState({
+                "city-plans": city_plans,
+                "city-plans-won": [rng.random() < 0.3 for _ in city_plans],
+                "construction-cards": [list(ccard) for ccard in rng.sample(CONSTRUCTION_CARDS, 3)],
+                "effects": [rng.choice(["surveyor", "bis", "landscaper", "pool", "agent", "temp"]) for _ in range(3)]})
+            yield gs, ps
+            moves = list(LegalMoveEnumerator(gs, ps))
+            if not moves:
+                return
+            ps = ps.clone()
+            DeltaMoveValidator(gs, ps, rng.choice(moves)).validate_move()
+
+    def _perturb(self, ps: PlayerState, rng: random.Random):
+        '''
+        Returns a copy of ps with one random field changed, or None if the
+        change makes an invalid PlayerState.
+        '''
+        ps_dict = deepcopy(ps.to_dict())
+        street = ps_dict["streets"][rng.randrange(3)]
+        homes = street["homes"]
+        k = rng.randrange(2, len(homes))
+        change = rng.randrange(6)
+        if change == 0:
+            homes[k][0] = not homes[k][0]
+        elif change == 1:
+            homes[k][1] = rng.choice([rng.randrange(18), [rng.randrange(18), "bis"], "roundabout"])
+        elif change == 2:
+            homes[k][2] = not homes[k][2]
+        elif change == 3:
+            pool_idx = rng.randrange(len(street["pools"]))
+            street["pools"][pool_idx] = not street["pools"][pool_idx]
+        elif change == 4:
+            ps_dict["agents"][rng.randrange(6)] += 1
+        else:
+            ps_dict["city-plan-score"][rng.randrange(3)] = rng.choice(["blank", 2, 4, 6, 8, 12])
+        return PlayerState(ps_dict) if PlayerState.check(ps_dict).ok else None
+
+    # every move listed is accepted by MoveValidator, and no two are the same
+    def test_moves_are_valid(self):
+        rng = random.Random(0)
+        for gs, ps in self._random_turns(rng, 12):
+            moves = list(LegalMoveEnumerator(gs, ps))
+            self.assertEqual(len(set(repr(move) for move in moves)), len(moves))
+            for move in rng.sample(moves, min(len(moves), 60)):
+                new_ps = ps.clone()
+                DeltaMoveValidator(gs, new_ps, move).validate_move()
+                MoveValidator(gs, ps, new_ps).validate_move()
+
+    # every move MoveValidator accepts is listed
+    def test_valid_moves_are_listed(self):
+        rng = random.Random(1)
+        for gs, ps in self._random_turns(rng, 12):
+            moves = list(LegalMoveEnumerator(gs, ps))
+            successors = []
+            for move in rng.sample(moves, min(len(moves), 20)):
+                successors.append(ps.clone())
+                DeltaMoveValidator(gs, successors[-1], move).validate_move()
+            moves = set(repr(move) for move in moves)
+            for _ in range(60):
+                new_ps = self._perturb(rng.choice(successors), rng)
+                if new_ps is None:
+                    continue
+                validator = MoveValidator(gs, ps, new_ps)
+                try:
+                    validator.validate_move()
+                except MoveException:
+                    continue
+                self.assertIn(repr(validator.to_move()), moves)
+
+    # a refusal is only listed when no card can be built
+    def test_refusal(self):
+        self.assertNotIn(Move.refusal_move(), list(LegalMoveEnumerator(self.gs, self.ps)))
+        ps_dict = deepcopy(EMPTY_PS)
+        for street in ps_dict["streets"]:
+            street["homes"] = [0, False] + [[False, k, False] for k in range(1, len(street["homes"]) - 1)]
+        moves = list(LegalMoveEnumerator(self.gs, PlayerState(ps_dict), roundabouts=False))
+        self.assertEqual(moves, [Move.refusal_move()])
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file
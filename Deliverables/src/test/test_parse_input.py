@@ -0,0 +1,36 @@
+import unittest
+import io
+from test_drivers import iter_json
+
+class TestIterJson(unittest.TestCase):
+    def parse(self, input_str: str, chunk_size: int):
+        return list(iter_json(io.StringIO(input_str), chunk_size=chunk_size))
+
+    # values cut by a chunk boundary, numbers and literals included, decode whole
+    def test_chunk_boundaries(self):
+        input_str = '{"a": [1, 2.5e-3, "x\\"y"]} 12345 -0.5e+10 true null [false]'
+        expected = [{"a": [1, 2.5e-3, 'x"y']}, 12345, -0.5e+10, True, None, [False]]
+        for chunk_size in [1, 2, 3, 7, 1024]:
+            self.assertEqual(self.parse(input_str, chunk_size), expected)
+
+    # junk is skipped a character at a time, so values inside it still decode
+    def test_junk(self):
+        input_str = 'junk {"b": x} [1, 2 tru 3'
+        for chunk_size in [1, 5, 1024]:
+            self.assertEqual(self.parse(input_str, chunk_size), ["b", 1, 2, 3])
+
+    # values are yielded before the rest of the stream is read
+    def test_streaming(self):
+        stream = io.StringIO("[1] " * 1000)
+        values = iter_json(stream, chunk_size=16)
+        self.assertEqual(next(values), [1])
+        self.assertLess(stream.tell(), 100)
+
+    # a value too big to buffer is treated as junk
+    def test_max_value_size(self):
+        input_str = '[' + '1, ' * 100 + '2]'
+        self.assertEqual(len(list(iter_json(io.StringIO(input_str), chunk_size=8, max_value_size=32))), 101)
+        self.assertEqual(len(list(iter_json(io.StringIO(input_str), chunk_size=8))), 1)
+
+if __name__ == "__main__":
+    unittest.main()
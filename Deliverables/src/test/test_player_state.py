@@ -1,6 +1,10 @@
+import random
 import unittest
+from copy import deepcopy
 from player_state import *
 from exception import *
+from constants import EMPTY_PS
+from helpers import mask_to_indices
 
 class TestHome(unittest.TestCase):
     # blank house state
@@ -394,5 +398,363 @@ class TestStreet(unittest.TestCase):
         with self.assertRaises(StreetException):
             Street(st_dict, 0)
 
+class TestCompactPlayerState(unittest.TestCase):
+    def setUp(self):
+        self.ps_dict = {
+            "agents": [1, 0, 0, 0, 0, 0],
+            "city-plan-score": [8, "blank", "blank"],
+            "refusals": 1,
+            "streets": [
+                {
+                    "homes": [1,False,[True,2,True],[False,[2, "bis"],True],[False,4,True],[True,5,False],[False,6,False],[False,7,False],[False,"blank",False],[False,9,False],[False,10,False]],
+                    "parks": 2,
+                    "pools": [False, True, False]
+                },
+                {
+                    "homes": ["blank",False,[False,2,False],[False,[2, "bis"],False],[True,"roundabout",False],[True,1,False],[False,"blank",False],[False,5,False],[False,"blank",False],[False,"blank",False],[False,"blank",False],[False,"blank",False]],
+                    "parks": 0,
+                    "pools": [False, False, False]
+                },
+                EMPTY_PS["streets"][2]
+            ],
+            "temps": 2
+        }
+
+    # the compact representation must round trip through the dictionary form
+    def test_round_trip(self):
+        compact_ps = CompactPlayerState(self.ps_dict)
+        self.assertEqual(compact_ps.to_dict(), self.ps_dict)
+        self.assertEqual(compact_ps.to_dict(), PlayerState(self.ps_dict).to_dict())
+        self.assertEqual(compact_ps.to_player_state(), PlayerState(self.ps_dict))
+
+    def test_same_score(self):
+        compact_ps = CompactPlayerState(self.ps_dict)
+        ps = PlayerState(self.ps_dict)
+        self.assertEqual(compact_ps.calculate_score([1, 4]), ps.calculate_score([1, 4]))
+
+    def test_possible_home_locations(self):
+        compact_ps = CompactPlayerState(self.ps_dict)
+        ps = PlayerState(self.ps_dict)
+        for st_idx in range(3):
+            for num in range(18):
+                self.assertEqual(compact_ps.get_possible_home_locations(st_idx, num),
+                    ps.streets[st_idx].get_possible_home_locations(num))
+
+    def test_place_home(self):
+        compact_ps = CompactPlayerState(self.ps_dict)
+        compact_ps.place_home(1, 5, 3)
+        self.assertEqual(compact_ps.house(1, 5), 3)
+        with self.assertRaises(StreetException):
+            compact_ps.place_home(1, 7, 2)
+
+    # the copy must not share buffers with the original
+    def test_copy(self):
+        compact_ps = CompactPlayerState(self.ps_dict)
+        compact_cpy = compact_ps.copy()
+        compact_cpy.place_home(1, 5, 3)
+        self.assertEqual(compact_ps.house(1, 5), "blank")
+        self.assertNotEqual(compact_ps, compact_cpy)
+
+    # the packed form round trips, and is checked like a dictionary
+    def test_bytes(self):
+        compact_ps = CompactPlayerState(self.ps_dict)
+        packed = compact_ps.to_bytes()
+        self.assertEqual(len(packed), PACKED_SIZE)
+        self.assertEqual(CompactPlayerState.from_bytes(packed), compact_ps)
+        self.assertEqual(CompactPlayerState.from_bytes(packed).to_dict(), self.ps_dict)
+        with self.assertRaises(PlayerStateException):
+            CompactPlayerState.from_bytes(packed[:-1])
+        # a used-in-plan flag of 2
+        with self.assertRaises(HomeException):
+            CompactPlayerState.from_bytes(packed[:NUM_HOMES * 2] + b"\x02" + packed[NUM_HOMES * 2 + 1:])
+        # houses 1 and 2 on street 1 swapped
+        with self.assertRaises(StreetException):
+            CompactPlayerState.from_bytes(b"\x02\x01" + packed[2:])
+
+    # not increasing
+    def test_invalid_street(self):
+        self.ps_dict["streets"][0]["homes"][4] = [False, 1, False]
+        with self.assertRaises(StreetException):
+            CompactPlayerState(self.ps_dict)
+
+    # bis with no matching neighbor
+    def test_invalid_bis(self):
+        self.ps_dict["streets"][1]["homes"][3] = [False, [3, "bis"], False]
+        with self.assertRaises(StreetException):
+            CompactPlayerState(self.ps_dict)
+
+class TestStreetPlacement(unittest.TestCase):
+    def setUp(self):
+        st_dict = {
+            "homes": ["blank",False,[False,2,False],[False,[2, "bis"],False],[True,"roundabout",False],[True,1,False],[False,"blank",False],[False,5,False],[False,"blank",False],[False,"blank",False],[False,"blank",False]],
+            "parks": 0,
+            "pools": [False, False, False]
+        }
+        self.street = Street(st_dict, 0)
+
+    def test_can_place_home(self):
+        self.assertTrue(self.street.can_place_home(0, 1))
+        self.assertFalse(self.street.can_place_home(0, 2))
+        # occupied home
+        self.assertFalse(self.street.can_place_home(1, 1))
+        # the roundabout restarts the numbering
+        self.assertTrue(self.street.can_place_home(5, 3))
+        self.assertFalse(self.street.can_place_home(5, 5))
+        self.assertTrue(self.street.can_place_home(9, 17))
+
+    # placing a house must update the bounds of its neighbors
+    def test_bounds_after_placement(self):
+        self.street.homes[8].num = 10
+        self.assertFalse(self.street.can_place_home(7, 11))
+        self.assertTrue(self.street.can_place_home(7, 9))
+        self.assertFalse(self.street.can_place_home(9, 9))
+        self.assertEqual(self.street.get_possible_home_locations(12), [9])
+        self.street.homes[8].num = "blank"
+        self.assertEqual(self.street.get_possible_home_locations(12), [7, 8, 9])
+
+    def test_placement_masks(self):
+        masks = self.street.placement_masks()
+        for num in range(18):
+            self.assertEqual(mask_to_indices(masks[num]),
+                [i for i in range(len(self.street.homes)) if self.street.can_place_home(i, num)])
+        self.assertEqual(self.street.placement_mask(0), 0b1)
+        self.assertEqual(self.street.placement_mask(17), 0b1110000000)
+
+    # a temp lets 15 be played as 13-17
+    def test_placement_mask_temp(self):
+        self.street.homes[8].num = 14
+        self.assertEqual(mask_to_indices(self.street.placement_mask(15)), [9])
+        self.assertEqual(mask_to_indices(self.street.placement_mask(15, temp=True)), [7, 9])
+
+    def test_can_place_bis(self):
+        self.assertTrue(self.street.can_place_bis(0, 2))
+        self.assertFalse(self.street.can_place_bis(0, 1))
+        self.assertTrue(self.street.can_place_bis(5, 1))
+        self.assertTrue(self.street.can_place_bis(5, 5))
+        # bis cannot be separated from its house by a fence
+        self.street.homes[5].fence_right = True
+        self.street.homes[6].fence_left = True
+        self.assertFalse(self.street.can_place_bis(5, 5))
+
+class TestValidationResults(unittest.TestCase):
+    def test_home_check(self):
+        self.assertTrue(Home.check([False, [6, "bis"], False, False]).ok)
+        self.assertEqual(Home.check("hi").code, Violation.HOME_FORMAT)
+        self.assertEqual(Home.check([False, 18, False, False]).code, Violation.HOUSE)
+        self.assertEqual(Home.check([False, "blank", True, False]).code, Violation.IN_PLAN)
+
+    def test_street_check(self):
+        st_dict = {
+            "homes": [1,False,[True,2,True],[False,3,True],[False,4,True],[True,5,False],[False,6,False],[False,7,False],[False,8,False],[False,9,False],[False,10,False]],
+            "parks": 3,
+            "pools": [False,True,True]
+        }
+        self.assertTrue(Street.check(st_dict, 0).ok)
+        self.assertEqual(Street.check(st_dict, 1).code, Violation.STREET_HOMES)
+        st_dict["homes"][4] = [False, 1, True]
+        self.assertEqual(Street.check(st_dict, 0).code, Violation.NOT_INCREASING)
+
+    # the raising API throws the exception matching the code
+    def test_raise_if_invalid(self):
+        result = Street.check({"homes": [], "parks": 0, "pools": []}, 0)
+        with self.assertRaises(StreetException):
+            result.raise_if_invalid()
+
+    def test_player_state_check(self):
+        self.assertTrue(PlayerState.check(EMPTY_PS).ok)
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["temps"] = 12
+        self.assertEqual(PlayerState.check(ps_dict).code, Violation.TEMPS)
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["streets"][0]["homes"][3] = [False, [2, "bis"], False]
+        self.assertEqual(PlayerState.check(ps_dict).code, Violation.BIS_NO_MATCH)
+
+    # probing a placement must not change the street
+    def test_check_place_new_home(self):
+        ps = PlayerState(EMPTY_PS)
+        ps.streets[0].homes[3].num = 5
+        self.assertTrue(ps.check_place_new_home(0, 2, 4).ok)
+        self.assertEqual(ps.check_place_new_home(0, 4, 4).code, Violation.NOT_INCREASING)
+        self.assertEqual(ps.check_place_new_home(0, 3, 7).code, Violation.HOME_OCCUPIED)
+        self.assertTrue(ps.check_place_new_home(0, 4, [5, "bis"]).ok)
+        self.assertEqual(ps.check_place_new_home(0, 5, [5, "bis"]).code, Violation.BIS_NO_MATCH)
+        self.assertEqual(ps.check_place_new_home(0, 5, "roundabout").code, Violation.HOUSE)
+        self.assertEqual(ps, PlayerState(ps.to_dict()))
+        self.assertEqual(ps.streets[0].homes[4].num, "blank")
+
+class TestClone(unittest.TestCase):
+    def setUp(self):
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["streets"][0]["homes"][2] = [False, 4, False]
+        ps_dict["agents"] = [1, 0, 0, 0, 0, 0]
+        self.ps = PlayerState(ps_dict)
+
+    # a clone is equal, and its streets share homes until they're changed
+    def test_clone_shares_homes(self):
+        clone = self.ps.clone()
+        self.assertEqual(clone, self.ps)
+        self.assertIs(clone.streets[1]._homes, self.ps.streets[1]._homes)
+        clone.streets[0].homes[5].num = 8
+        self.assertIsNot(clone.streets[0]._homes, self.ps.streets[0]._homes)
+        self.assertIs(clone.streets[1]._homes, self.ps.streets[1]._homes)
+
+    # reading homes_view, or checking the rules, doesn't copy shared homes
+    def test_homes_view_shares_homes(self):
+        clone = self.ps.clone()
+        self.assertEqual(clone.streets[0].homes_view[1].num, 4)
+        self.assertTrue(clone.streets[0].find_rule_violation().ok)
+        self.assertIs(clone.streets[0]._homes, self.ps.streets[0]._homes)
+
+    # changes to either copy don't show up in the other
+    def test_clone_independent(self):
+        clone = self.ps.clone()
+        clone.streets[0].homes[5].num = 8
+        clone.agents[0] += 1
+        clone.streets[1].pools[0] = True
+        self.assertEqual(self.ps.streets[0].homes[5].num, "blank")
+        self.assertEqual(self.ps.agents[0], 1)
+        self.assertFalse(self.ps.streets[1].pools[0])
+        self.ps.streets[0].homes[6].num = 9
+        self.assertEqual(clone.streets[0].homes[6].num, "blank")
+
+    # the placement caches of a clone follow its own homes
+    def test_clone_caches(self):
+        street = self.ps.streets[0]
+        self.assertTrue(street.can_place_home(5, 8))
+        clone = street.clone()
+        clone.homes[6].num = 7
+        self.assertFalse(clone.can_place_home(5, 8))
+        self.assertTrue(street.can_place_home(5, 8))
+        self.assertEqual(Home([False, 3, False, True]).clone().to_list(), [False, 3, False])
+
+class TestScoreParts(unittest.TestCase):
+    def setUp(self):
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["streets"][0]["homes"] = [1, False, [True, 2, False], [False, [2, "bis"], False],
+            [False, 4, False]] + EMPTY_PS["streets"][0]["homes"][5:]
+        self.ps = PlayerState(ps_dict)
+
+    # the cached counts are updated after a house or fence changes
+    def test_updated_on_change(self):
+        street = self.ps.streets[0]
+        self.assertEqual(street.score_parts(), (1, 0, (0, 1, 0, 0, 0, 0, 0)))
+        street.homes[3].fence_right = True
+        street.homes[4].fence_left = True
+        self.assertEqual(street.score_parts(), (1, 0, (0, 1, 0, 1, 0, 0, 0)))
+        street.homes[5].num = "roundabout"
+        self.assertEqual(street.roundabout_count(), 1)
+        self.assertEqual(street.estates_dict(), {1: 1, 3: 1})
+
+    # the score matches a PlayerState built from scratch
+    def test_score_matches_rebuilt(self):
+        self.assertEqual(self.ps.calculate_score([]), PlayerState(self.ps.to_dict()).calculate_score([]))
+        street = self.ps.streets[0]
+        street.homes[3].fence_right = True
+        street.homes[4].fence_left = True
+        self.assertEqual(self.ps.calculate_score([]), PlayerState(self.ps.to_dict()).calculate_score([]))
+
+    # the counts updated change by change match a sweep over the whole street
+    def test_matches_full_sweep(self):
+        rng = random.Random(0)
+        street = self.ps.streets[0]
+        street.score_parts()
+        for _ in range(300):
+            home = street.homes[rng.randrange(len(street.homes))]
+            field = rng.choice(["num", "is_bis", "fence_left", "fence_right"])
+            if field == "num":
+                home.num = rng.choice(["blank", "roundabout", rng.randrange(18)])
+            else:
+                setattr(home, field, rng.random() < 0.5)
+            parts = street.score_parts()
+            bis_ct, roundabout_ct, estate_cts = street._sweep_score_parts(0, len(street.homes))
+            self.assertEqual(parts, (bis_ct, roundabout_ct, tuple(estate_cts)))
+
+    # a clone keeps its own counts once its homes change
+    def test_clone(self):
+        clone = self.ps.clone()
+        clone.streets[0].homes[4].house = [4, "bis"]
+        self.assertEqual(clone.streets[0].bis_count(), 2)
+        self.assertEqual(self.ps.streets[0].bis_count(), 1)
+
+class TestZobristHash(unittest.TestCase):
+    def setUp(self):
+        ps_dict = deepcopy(EMPTY_PS)
+        ps_dict["streets"][0]["homes"][2] = [False, 4, False]
+        self.ps = PlayerState(ps_dict)
+
+    # the hash kept up to date matches the hash of the same state built fresh
+    def test_incremental(self):
+        self.ps.zobrist_hash()
+        street = self.ps.streets[0]
+        street.homes[5].num = 8
+        street.homes[5].fence_left = True
+        street.homes[4].fence_right = True
+        street.homes[1].in_plan = True
+        self.ps.temps = 1
+        self.assertEqual(self.ps.zobrist_hash(), PlayerState(deepcopy(self.ps.to_dict())).zobrist_hash())
+
+    # a changed clone hashes differently, and changing it back restores the hash
+    def test_clone(self):
+        clone = self.ps.clone()
+        self.assertEqual(hash(clone), hash(self.ps))
+        clone.streets[1].homes[3].num = 0
+        self.assertNotEqual(hash(clone), hash(self.ps))
+        self.assertNotEqual(clone, self.ps)
+        clone.streets[1].homes[3].num = "blank"
+        self.assertEqual(hash(clone), hash(self.ps))
+        self.assertEqual(clone, self.ps)
+
+    # equal states collapse in a set
+    def test_set(self):
+        states = set([self.ps, self.ps.clone(), PlayerState(deepcopy(EMPTY_PS))])
+        self.assertEqual(len(states), 2)
+
+class TestFromTrusted(unittest.TestCase):
+    def setUp(self):
+        self.ps_dict = deepcopy(EMPTY_PS)
+        self.ps_dict["streets"][0]["homes"][2] = [True, [4, "bis"], False]
+        self.ps_dict["streets"][0]["homes"][3] = [False, 4, True]
+        self.ps_dict["streets"][1]["homes"][4] = [True, "roundabout", False]
+        self.ps_dict["streets"][1]["homes"][5] = [True, 7, False]
+        self.ps_dict["agents"][2] = 1
+
+    # a trusted build matches the checked one, fences, caches and all
+    def test_matches_constructor(self):
+        ps = PlayerState(self.ps_dict)
+        trusted = PlayerState.from_trusted(deepcopy(self.ps_dict))
+        self.assertEqual(trusted.to_dict(), ps.to_dict())
+        self.assertEqual(trusted, ps)
+        self.assertEqual(trusted.calculate_score([0]), ps.calculate_score([0]))
+        self.assertTrue(trusted.streets[0].homes[0].fence_right)
+        self.assertTrue(trusted.streets[0].homes[-1].fence_right)
+        self.assertTrue(trusted.validate().ok)
+
+    # a trusted build can be changed like any other
+    def test_mutable(self):
+        ps = PlayerState.from_trusted(deepcopy(self.ps_dict))
+        ps.zobrist_hash()
+        ps.streets[0].homes[5].num = 9
+        self.assertEqual(ps, PlayerState(ps.to_dict()))
+        self.assertEqual(ps.check_place_new_home(0, 6, 8).code, Violation.NOT_INCREASING)
+
+    # a state built from another's to_dict() doesn't share its lists
+    def test_no_shared_lists(self):
+        ps = PlayerState(self.ps_dict)
+        before = deepcopy(ps.to_dict())
+        trusted = PlayerState.from_trusted(ps.to_dict())
+        trusted.agents[0] += 1
+        trusted.city_plan_score[0] = 8
+        trusted.streets[0].pools[0] = True
+        self.assertEqual(ps.to_dict(), before)
+
+    # nothing is checked until validate() is called
+    def test_deferred_validation(self):
+        self.ps_dict["temps"] = 12
+        self.ps_dict["streets"][0]["homes"][4] = [False, 3, False]
+        ps = PlayerState.from_trusted(deepcopy(self.ps_dict))
+        self.assertFalse(ps.validate().ok)
+        with self.assertRaises(PlayerStateException):
+            PlayerState(self.ps_dict)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
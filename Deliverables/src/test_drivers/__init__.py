@@ -1 +1 @@
-from .parse_input import parse_stdin
\ No newline at end of file
+from .parse_input import parse_stdin, iter_json
\ No newline at end of file
@@ -1,15 +1,15 @@
 import json
-from . import parse_stdin
+import sys
+from . import iter_json
 from asst2 import my_sort
 
 def main():
-    input_lst = parse_stdin()
     # set of valid integers in the special object
     valid_range = set(range(1,25))
     special_objs = []
     result_lst = []
 
-    for curr in input_lst:
+    for curr in iter_json(sys.stdin):
         # check if curr is valid
         if not (isinstance(curr, dict) and len(curr) == 1 
                 and type(curr.get("content", None)) == int
@@ -1,25 +1,67 @@
 import json
+import re
 import sys
+from typing import *
 
+CHUNK_SIZE = 1 << 13
+# a value still incomplete after this many characters is treated as junk
+MAX_VALUE_SIZE = 1 << 26
+# a number or literal cut off by the end of a chunk ends, or fails, this close
+# to the end of the buffer, e.g. "1." or "tr"
+_TRUNCATION_MARGIN = 8
+# characters that can start a JSON value
+_VALUE_START = re.compile(r'[\[{"\-0-9tfn]')
 
-def parse_stdin():
+
+def iter_json(stream: TextIO, chunk_size: int=CHUNK_SIZE, max_value_size: int=MAX_VALUE_SIZE) -> Iterator[Any]:
     '''
-    Return a list of parsed JSON objects read from STDIN.
+    Yields each JSON value read from stream as soon as it is complete. Stream
+    is read in chunks, and only the value being decoded is kept in memory.
+    Anything that doesn't decode is skipped a character at a time, as
+    parse_stdin() always has, but jumping straight to the next character that
+    could start a value.
     '''
-    input_str = sys.stdin.read().strip()
     decoder = json.JSONDecoder()
-    input_lst = []
-    i = 0
-
-    while i < len(input_str):
-        try:   
-            _json, consumed = decoder.raw_decode(input_str[i:])
-            input_lst.append(_json)
-            i += consumed
-        except:
-            i += 1
+    buf, i, eof = "", 0, False
+
+    while True:
+        match = _VALUE_START.search(buf, i)
+        if match is None:
+            if eof:
+                return
+            # nothing left can start a value, so drop it all
+            buf, i = stream.read(chunk_size), 0
+            eof = len(buf) == 0
+            continue
+        i = match.start()
 
-    return input_lst
+        # scan_once is what raw_decode wraps; it fails at the top level with a
+        # cheap StopIteration, where a JSONDecodeError counts lines up to pos
+        try:
+            value, end = decoder.scan_once(buf, i)
+            truncated = end > len(buf) - _TRUNCATION_MARGIN
+        except StopIteration as err:
+            value, end = None, None
+            truncated = err.value > len(buf) - _TRUNCATION_MARGIN
+        except (ValueError, RecursionError) as err:
+            value, end = None, None
+            truncated = isinstance(err, json.JSONDecodeError) and (
+                err.pos > len(buf) - _TRUNCATION_MARGIN or err.msg.startswith("Unterminated string"))
 
+        if truncated and not eof and len(buf) - i < max_value_size:
+            # read at least as much as is pending, so the decoding redone on a
+            # long value adds up to linear time
+            more = stream.read(max(chunk_size, len(buf) - i))
+            buf, i, eof = buf[i:] + more, 0, len(more) == 0
+        elif end is not None:
+            yield value
+            i = end
+        else:
+            i += 1
 
 
+def parse_stdin() -> List[Any]:
+    '''
+    Return a list of parsed JSON objects read from STDIN.
+    '''
+    return list(iter_json(sys.stdin))
@@ -3,7 +3,7 @@ import sys
 from exception import PlayerStateException, GameStateException
 from player_state import PlayerState
 from game_state import GameState
-from . import parse_stdin
+from . import iter_json
 
 def main():
     if sys.argv[1] == "player":
@@ -13,7 +13,7 @@ def main():
     else:
         raise Exception("please provide either 'player' or 'game' as a command line argument.")
 
-    input_json = parse_stdin()[0]
+    input_json = next(iter_json(sys.stdin))
     try:
         state = ClassName(input_json).to_dict()
     except (PlayerStateException, GameStateException):